@@ -0,0 +1,219 @@
+# core/autoadvance.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Auto-advance: encadena el siguiente track al llegar al END TRACK del actual
+El cambio se programa en el scheduler de transporte para el beat final del track
+
+Modos:
+    off    - desactivado
+    segue  - salto directo al inicio del siguiente track sin parar
+    gap    - para en el final, se sitúa en el siguiente y rearranca tras AUTO_ADVANCE_GAP s
+    stop   - para en el final y deja el siguiente track preparado para Play
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+from core.state import state, Track
+from core.transport import clock, scheduler, ScheduledCommand
+from core.vamp import vamp
+from core.prearm import prearm
+from osc.handlers import handlers
+from core.constants import (
+    AUTO_ADVANCE_MODE, AUTO_ADVANCE_GAP, AUTO_ADVANCE_POLL, AUTO_ADVANCE_SETTLE
+)
+from core.logger import log_info, log_error, log_warning, log_debug
+
+MODE_OFF = "off"
+MODE_SEGUE = "segue"
+MODE_GAP = "gap"
+MODE_STOP = "stop"
+MODES = [MODE_OFF, MODE_SEGUE, MODE_GAP, MODE_STOP]
+
+
+class AutoAdvance:
+    """Vigila el track en curso y programa el cambio en su límite - Thread-safe"""
+
+    def __init__(self, mode: str = AUTO_ADVANCE_MODE, gap: float = AUTO_ADVANCE_GAP):
+        self._lock = threading.Lock()
+        self._mode = mode if mode in MODES else MODE_OFF
+        self.gap = gap
+        self._armed: Optional[ScheduledCommand] = None
+        self._armed_key: Optional[Tuple] = None
+        self._restart: Optional[ScheduledCommand] = None
+        self._hold_until = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        log_debug(f"AutoAdvance inicializado (modo {self._mode})", module="Playback")
+
+    # ===== CONFIGURACIÓN =====
+
+    @property
+    def mode(self) -> str:
+        with self._lock:
+            return self._mode
+
+    def set_mode(self, mode: str) -> bool:
+        """Cambia el modo; el siguiente ciclo vuelve a armar con el modo nuevo"""
+        if mode not in MODES:
+            log_warning(f"Modo de auto-advance desconocido: {mode}", module="Playback")
+            return False
+
+        with self._lock:
+            self._mode = mode
+        self._disarm()
+        if mode == MODE_OFF:
+            self.cancel_pending()
+        else:
+            self.start()
+        log_info(f"⏭ Auto-advance: {mode}", module="Playback")
+        return True
+
+    def cycle_mode(self) -> str:
+        """Pasa al siguiente modo (botón de la UI)"""
+        next_mode = MODES[(MODES.index(self.mode) + 1) % len(MODES)]
+        self.set_mode(next_mode)
+        return next_mode
+
+    # ===== CICLO DE VIDA =====
+
+    def start(self):
+        """Arranca la vigilancia en background"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="AutoAdvance", daemon=True)
+        self._thread.start()
+        log_debug("Vigilancia de auto-advance activa", module="Playback")
+
+    def stop(self):
+        """Detiene la vigilancia y cancela lo programado"""
+        self._stop_event.set()
+        self._disarm()
+        self.cancel_pending()
+
+    def cancel_pending(self):
+        """Cancela el rearranque pendiente del modo gap (Stop o lanzamiento manual)"""
+        with self._lock:
+            restart, self._restart = self._restart, None
+        scheduler.cancel(restart)
+
+    def _loop(self):
+        while not self._stop_event.wait(AUTO_ADVANCE_POLL):
+            try:
+                self._tick()
+            except Exception as e:
+                log_error("Error en auto-advance", module="Playback", exc=e)
+
+    # ===== ARMADO =====
+
+    def _tick(self):
+        if self.mode == MODE_OFF or not clock.is_running:
+            self._disarm()
+            return
+        if time.time() < self._hold_until:
+            return
+
+        tracks = state.tracks
+        beat = clock.beat_at()
+        index = self._current_track_index(tracks, beat)
+        if index is None:
+            self._disarm()
+            return
+
+        track = tracks[index]
+        if vamp.holds_boundary(track.end):
+            # La última sección está retenida: el vamp manda sobre el final del track
+            self._disarm()
+            return
+
+        key = (index, track.end, self.mode)
+        with self._lock:
+            if key == self._armed_key and self._armed is not None and self._armed.pending:
+                return
+
+        self._disarm()
+        self._arm(index, track, tracks[index + 1] if index + 1 < len(tracks) else None, key)
+
+    @staticmethod
+    def _current_track_index(tracks, beat: float) -> Optional[int]:
+        """Track en reproducción: el seleccionado si contiene la posición, si no el que la contenga"""
+        index = state.current_index
+        if 0 <= index < len(tracks) and tracks[index].contains_beat(beat):
+            return index
+        for i, track in enumerate(tracks):
+            if track.contains_beat(beat):
+                return i
+        return None
+
+    def _arm(self, index: int, track: Track, next_track: Optional[Track], key: Tuple):
+        mode = key[2]
+        if next_track is None:
+            messages = [("/live/song/stop_playing", [])]
+            label = f"fin del set tras '{track.title}'"
+        elif mode == MODE_SEGUE:
+            messages = [("/live/song/set/current_song_time", [next_track.start])]
+            label = f"segue '{track.title}' → '{next_track.title}'"
+        else:
+            messages = [("/live/song/stop_playing", []),
+                        ("/live/song/set/current_song_time", [next_track.start])]
+            label = f"{mode} '{track.title}' → '{next_track.title}'"
+
+        next_index = index + 1 if next_track is not None else None
+        command = scheduler.schedule(
+            track.end, messages, label=label,
+            on_fired=lambda cmd: self._on_boundary(cmd, mode, next_index)
+        )
+        with self._lock:
+            self._armed, self._armed_key = command, key
+
+    def _disarm(self):
+        with self._lock:
+            armed, self._armed, self._armed_key = self._armed, None, None
+        scheduler.cancel(armed)
+
+    # ===== LÍMITE DE TRACK =====
+
+    def _on_boundary(self, command: ScheduledCommand, mode: str, next_index: Optional[int]):
+        """Bundle enviado: actualizar selección y, en modo gap, programar el rearranque"""
+        target = command.target_time or time.time()
+        self._hold_until = target + AUTO_ADVANCE_SETTLE
+
+        with self._lock:
+            self._armed, self._armed_key = None, None
+
+        if next_index is None:
+            log_info("⏹ Auto-advance: fin del set", module="Playback")
+            return
+
+        state.current_index = next_index
+        prearm.arm_around(next_index)
+        track = state.tracks[next_index]
+        log_info(f"⏭ Auto-advance ({mode}): {track.title}", module="Playback")
+
+        if mode == MODE_GAP:
+            restart = scheduler.schedule_at(
+                target + self.gap, [("/live/song/start_playing", [])],
+                label=f"rearranque tras {self.gap:.1f}s"
+            )
+            with self._lock:
+                self._restart = restart
+
+        handlers._safe_ui_update('update_listbox')
+
+    def snapshot(self) -> dict:
+        """Estado serializable para UI y web"""
+        with self._lock:
+            armed = self._armed
+            return {
+                "mode": self._mode,
+                "gap_s": self.gap,
+                "armed_beat": armed.beat if armed is not None else None,
+                "armed_label": armed.label if armed is not None else None,
+            }
+
+# Instancia global
+autoadvance = AutoAdvance()
+log_info("✓ Instancia global de AutoAdvance creada", module="Playback")
@@ -0,0 +1,224 @@
+# core/calibration.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Calibración de tiempos OSC
+Mide la distribución real de round-trip con Ableton, deriva timeouts seguros y
+los guarda por equipo (hostname → destino OSC) en APP_DATA_DIR/calibration.json.
+Los módulos leen los valores vigentes de `timing` en lugar de las constantes fijas.
+"""
+
+import asyncio
+import json
+import math
+import socket
+import threading
+import time
+from typing import List, Optional
+from osc.client import send_message
+from osc.replies import replies
+from core.constants import (
+    APP_DATA_DIR, LIVE_IP, LIVE_SEND_PORT, OSC_TIMEOUT, ACK_TIMEOUT,
+    CALIBRATION_PROBE_ADDRESS, CALIBRATION_SAMPLES, CALIBRATION_INTERVAL, CALIBRATION_MAX_AGE,
+    CALIBRATION_TIMEOUT_FACTOR, CALIBRATION_ACK_FACTOR, CALIBRATION_MARGIN,
+    CALIBRATION_MIN_TIMEOUT, CALIBRATION_MAX_TIMEOUT, CALIBRATION_MIN_ACK, CALIBRATION_MAX_ACK
+)
+from core.utils import atomic_write
+from core.logger import log_info, log_error, log_warning, log_debug
+
+CALIBRATION_FILE = APP_DATA_DIR / "calibration.json"
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano (lista ya ordenada)"""
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class TimingProfile:
+    """Timeouts vigentes (calibrados o por defecto) - Thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._osc_timeout = OSC_TIMEOUT
+        self._ack_timeout = ACK_TIMEOUT
+        self._source = "defaults"
+        self._measured_at: Optional[float] = None
+        self._stats: dict = {}
+
+    @property
+    def osc_timeout(self) -> float:
+        """Espera máxima de una respuesta OSC (getters, bloques de cue points, sondas)"""
+        with self._lock:
+            return self._osc_timeout
+
+    @property
+    def ack_timeout(self) -> float:
+        """Espera máxima de confirmación de transporte (stop/jump) antes de continuar"""
+        with self._lock:
+            return self._ack_timeout
+
+    def apply(self, entry: dict, source: str):
+        """Aplica un perfil calibrado (entrada del fichero o medición recién hecha)"""
+        with self._lock:
+            self._osc_timeout = float(entry["osc_timeout"])
+            self._ack_timeout = float(entry["ack_timeout"])
+            self._source = source
+            self._measured_at = entry.get("measured_at")
+            self._stats = {k: entry[k] for k in ("samples", "loss", "p50_ms", "p95_ms", "p99_ms", "max_ms") if k in entry}
+        log_info(f"⏱ Tiempos OSC ({source}): timeout {self.osc_timeout * 1000:.0f} ms, "
+                 f"ack {self.ack_timeout * 1000:.0f} ms", module="OSC")
+
+    def reset(self):
+        """Vuelve a los valores por defecto de constants.py"""
+        with self._lock:
+            self._osc_timeout, self._ack_timeout = OSC_TIMEOUT, ACK_TIMEOUT
+            self._source, self._measured_at, self._stats = "defaults", None, {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "source": self._source,
+                "measured_at": self._measured_at,
+                "osc_timeout_ms": round(self._osc_timeout * 1000, 1),
+                "ack_timeout_ms": round(self._ack_timeout * 1000, 1),
+                **self._stats,
+            }
+
+
+class Calibrator:
+    """Mide el round-trip con Ableton y deriva el perfil de tiempos de este equipo"""
+
+    def __init__(self, profile: TimingProfile, path=CALIBRATION_FILE):
+        self.profile = profile
+        self.path = path
+        self.key = f"{socket.gethostname()} → {LIVE_IP}:{LIVE_SEND_PORT}"
+        self._running = False
+        log_debug(f"Calibrator inicializado ({self.key})", module="OSC")
+
+    # ===== PERSISTENCIA =====
+
+    def _read_all(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log_warning(f"Calibración ilegible, se ignora: {e}", module="OSC")
+            return {}
+
+    def _write_entry(self, entry: dict):
+        data = self._read_all()
+        data[self.key] = entry
+        atomic_write(self.path, json.dumps(data, indent=2, ensure_ascii=False))
+
+    def stored(self) -> Optional[dict]:
+        """Perfil guardado para este equipo, o None"""
+        entry = self._read_all().get(self.key)
+        if not isinstance(entry, dict) or "osc_timeout" not in entry or "ack_timeout" not in entry:
+            return None
+        return entry
+
+    def load(self) -> bool:
+        """Aplica el perfil guardado para este equipo (si existe)"""
+        entry = self.stored()
+        if entry is None:
+            log_debug("Sin calibración guardada para este equipo", module="OSC")
+            return False
+        self.profile.apply(entry, "stored")
+        return True
+
+    def is_stale(self) -> bool:
+        """True si no hay perfil guardado o es más antiguo que CALIBRATION_MAX_AGE"""
+        entry = self.stored()
+        return entry is None or time.time() - entry.get("measured_at", 0) > CALIBRATION_MAX_AGE
+
+    # ===== MEDICIÓN =====
+
+    async def measure(self, samples: int = CALIBRATION_SAMPLES) -> List[Optional[float]]:
+        """RTT (s) de `samples` sondas secuenciales; None para las perdidas
+
+        Debe ejecutarse en el loop de reproducción (usa el registro de respuestas).
+        """
+        rtts = []
+        for _ in range(samples):
+            probe = replies.expect(CALIBRATION_PROBE_ADDRESS)
+            sent = time.perf_counter()
+            send_message(CALIBRATION_PROBE_ADDRESS, [])
+            reply = await probe.wait(CALIBRATION_MAX_TIMEOUT)
+            if reply is not None and probe.received_at < sent:
+                # Llegó antes del envío: respuesta tardía de una sonda anterior, no mide esta
+                reply = None
+            rtts.append(time.perf_counter() - sent if reply is not None else None)
+            await asyncio.sleep(CALIBRATION_INTERVAL)
+        return rtts
+
+    @staticmethod
+    def derive(rtts: List[Optional[float]]) -> Optional[dict]:
+        """Estadísticas y timeouts mínimos seguros a partir de las muestras"""
+        received = sorted(r for r in rtts if r is not None)
+        if len(received) < max(3, len(rtts) // 2):
+            return None
+
+        loss = 1 - len(received) / len(rtts)
+        p50, p95, p99 = (_percentile(received, p) for p in (50, 95, 99))
+        osc_timeout = _clamp(p99 * CALIBRATION_TIMEOUT_FACTOR + CALIBRATION_MARGIN,
+                             CALIBRATION_MIN_TIMEOUT, CALIBRATION_MAX_TIMEOUT)
+        ack_timeout = _clamp(p99 * CALIBRATION_ACK_FACTOR + CALIBRATION_MARGIN,
+                             CALIBRATION_MIN_ACK, CALIBRATION_MAX_ACK)
+        return {
+            "measured_at": time.time(),
+            "samples": len(rtts),
+            "loss": round(loss, 3),
+            "p50_ms": round(p50 * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round(received[-1] * 1000, 2),
+            "osc_timeout": round(osc_timeout, 3),
+            "ack_timeout": round(ack_timeout, 3),
+        }
+
+    async def run(self, samples: int = CALIBRATION_SAMPLES, persist: bool = True) -> Optional[dict]:
+        """Mide, aplica y guarda. None si Ableton no respondió lo suficiente"""
+        if self._running:
+            log_warning("⊘ Calibración ya en curso", module="OSC")
+            return None
+
+        self._running = True
+        try:
+            log_info(f"⏱ Calibrando tiempos OSC ({samples} sondas)...", module="OSC")
+            entry = self.derive(await self.measure(samples))
+            if entry is None:
+                log_warning("⏱ Calibración sin respuestas suficientes, se mantienen los tiempos actuales", module="OSC")
+                return None
+
+            log_info(f"⏱ RTT p50 {entry['p50_ms']} ms · p95 {entry['p95_ms']} ms · "
+                     f"p99 {entry['p99_ms']} ms · pérdidas {entry['loss'] * 100:.0f}%", module="OSC")
+            self.profile.apply(entry, "measured")
+            if persist:
+                try:
+                    self._write_entry(entry)
+                except OSError as e:
+                    log_error("No se pudo guardar la calibración", module="OSC", exc=e)
+            return entry
+        finally:
+            self._running = False
+
+    async def ensure(self) -> Optional[dict]:
+        """Calibra solo si no hay perfil para este equipo o ha caducado"""
+        if not self.is_stale():
+            return self.stored()
+        return await self.run()
+
+# Instancias globales
+timing = TimingProfile()
+calibrator = Calibrator(timing)
+calibrator.load()
+log_info("✓ Instancia global de Calibrator creada", module="OSC")
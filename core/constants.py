@@ -42,6 +42,46 @@ APP_DATA_DIR = get_app_data_dir()
 SETLISTS_DIR = APP_DATA_DIR / "setlist" / "data"
 SETLISTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Formato por defecto al guardar: "json" (legible) o "lcs" (binario compacto, carga vía mmap)
+SETLIST_DEFAULT_FORMAT = "json"
+
+# Almacén de setlists: "directory" (archivos .json/.lcs en SETLISTS_DIR) o "sqlite" (una base de datos)
+SETLIST_STORAGE = "directory"
+SETLIST_DB_PATH = APP_DATA_DIR / "setlist" / "setlists.db"
+
+# Shows compilados (.lcshow): setlist + bundles OSC pre-codificados para el directo
+SHOWS_DIR = APP_DATA_DIR / "setlist" / "shows"
+
+# Vigilancia de SETLISTS_DIR (inotify en Linux, sondeo en el resto)
+SETLIST_WATCH_ENABLED = True
+SETLIST_WATCH_POLL_INTERVAL = 2.0   # segundos entre sondeos sin inotify
+SETLIST_WATCH_SETTLE = 0.3          # silencio tras el último evento antes de aplicar
+
+# Carga por streaming de setlists .json grandes: cabecera y primeros tracks al momento, el resto en segundo plano
+SETLIST_STREAM_MIN_BYTES = 512 * 1024   # por debajo se cargan de una vez
+SETLIST_STREAM_FIRST_TRACKS = 50        # tracks decodificados antes de devolver el control
+SETLIST_STREAM_BATCH_INTERVAL = 0.25    # segundos entre lotes entregados a la UI
+SETLIST_STREAM_CHUNK = 64 * 1024        # caracteres por lectura
+
+# Historial de versiones por setlist (deltas + fotograma completo cada N versiones)
+SETLIST_HISTORY_ENABLED = True
+SETLIST_HISTORY_KEYFRAME_EVERY = 50
+
+# Búsqueda en setlists guardados
+SEARCH_MAX_RESULTS = 50           # tracks devueltos por consulta
+SEARCH_PREFIX_LIMIT = 200         # tokens del vocabulario que puede expandir un prefijo
+
+# Autoguardado del setlist en memoria (debounce + generaciones rotativas)
+AUTOSAVE_ENABLED = True
+AUTOSAVE_DIR = APP_DATA_DIR / "autosave"
+AUTOSAVE_DEBOUNCE = 2.0           # segundos sin cambios antes de guardar
+AUTOSAVE_MAX_DELAY = 15.0         # guardar como mucho esto tras el primer cambio pendiente
+AUTOSAVE_GENERATIONS = 5          # autoguardados que se conservan
+
+# Caché LRU de setlists deserializados
+SETLIST_CACHE_BUDGET_MB = 32      # memoria estimada máxima de los setlists cacheados
+SETLIST_CACHE_MAX_ENTRIES = 8     # setlists distintos en caché
+
 # Configuración de red
 LIVE_IP = "127.0.0.1"          # IP de Ableton Live (localhost)
 LIVE_SEND_PORT = 11000         # Puerto al que enviamos (Ableton)
@@ -53,10 +93,96 @@ CLIENT_LISTEN_PORT = 11001     # Puerto en el que escuchamos
 # Puerto Flask para control remoto
 FLASK_PORT = 5000
 
+# Servidor HTTP del controlador web (ver osc/web_backend.py)
+WEB_SERVER_BACKEND = "threaded"       # threaded (keep-alive con pool acotado) | werkzeug (desarrollo, sin límite)
+WEB_SERVER_THREADS = 8                # workers para peticiones normales (los streams van aparte)
+WEB_SERVER_ACTIVE_REQUESTS = 1        # peticiones ejecutándose a la vez (< WEB_SERVER_THREADS): protege el loop de reproducción
+WEB_SERVER_ADMISSION_TIMEOUT = 0.5    # espera máxima por turno antes de responder 503
+WEB_SERVER_BACKLOG = 64               # peticiones esperando worker antes de responder 503
+WEB_SERVER_KEEPALIVE_TIMEOUT = 30.0   # segundos que una conexión keep-alive puede estar inactiva
+WEB_SERVER_MAX_CONNECTIONS = 256      # conexiones abiertas (inactivas incluidas) antes de responder 503
+WEB_SERVER_SHUTDOWN_TIMEOUT = 3.0     # espera máxima a las peticiones en curso al apagar
+
+# Canal de eventos (SSE /events) del controlador web
+WEB_EVENTS_KEEPALIVE = 15.0       # segundos sin eventos antes de un comentario keep-alive
+WEB_EVENTS_MAX_CLIENTS = 32       # conexiones /events simultáneas
+WEB_EVENTS_RETRY_MS = 3000        # espera del navegador antes de reconectar
+
+# Canal de comandos por WebSocket (/ws, requiere flask-sock)
+WEB_SOCKET_MAX_CLIENTS = 32       # conexiones /ws simultáneas
+WEB_SOCKET_PING_INTERVAL = 20     # segundos entre pings del servidor (detecta móviles dormidos)
+
+# Streams del servidor web: un thread cada uno, fuera del pool de workers
+WEB_SERVER_STREAMS = WEB_EVENTS_MAX_CLIENTS + WEB_SOCKET_MAX_CLIENTS + 4  # + long-polls de /setlists
+
 # Configuración de UI
 DEFAULT_WINDOW_WIDTH = 1280
 DEFAULT_WINDOW_HEIGHT = 800
 
-# Timeouts y delays
+# Timeouts y delays (valores por defecto: la calibración los ajusta por equipo)
 OSC_TIMEOUT = 2.0  # segundos
-SCAN_DELAY = 0.1   # delay entre solicitudes OSC durante scan
\ No newline at end of file
+SCAN_CONNECT_ATTEMPTS = 3  # sondas de conexión antes de abortar el scan
+SCAN_CONNECT_ADDRESS = "/live/song/get/tempo"  # sonda de conexión del scan (la respuesta actualiza el tempo)
+SCAN_STARTUP_DELAY = 0.2   # espera tras el primer frame antes del scan inicial
+SCAN_TIMEOUT = 60.0        # espera máxima de quien lanza un scan bloqueante (sets enormes incluidos)
+ACK_TIMEOUT = 0.25  # espera máxima de confirmación de transporte (stop/jump) antes de continuar
+
+# Calibración de tiempos OSC (round-trip medido con Ableton)
+CALIBRATION_PROBE_ADDRESS = "/live/song/get/song_length"  # getter propio: ni heartbeat ni listeners lo responden
+CALIBRATION_SAMPLES = 30          # sondas por calibración
+CALIBRATION_INTERVAL = 0.02       # segundos entre sondas
+CALIBRATION_MAX_AGE = 7 * 86400   # segundos tras los que se vuelve a calibrar al arrancar
+CALIBRATION_TIMEOUT_FACTOR = 4.0  # timeout OSC = p99 · factor + margen
+CALIBRATION_ACK_FACTOR = 2.0      # timeout de confirmación = p99 · factor + margen
+CALIBRATION_MARGIN = 0.05         # segundos de margen fijo (jitter del scheduler del SO)
+CALIBRATION_MIN_TIMEOUT = 0.5     # AbletonOSC atiende OSC en el tick de Live: nunca por debajo
+CALIBRATION_MAX_TIMEOUT = 5.0
+CALIBRATION_MIN_ACK = 0.15        # las confirmaciones llegan por listeners, no por getters
+CALIBRATION_MAX_ACK = 1.0
+
+# Paginación de cue points (sets muy grandes)
+CUE_POINTS_PAGINATED = True   # Solicitar cue points por bloques vía /range
+CUE_POINTS_PAGE_SIZE = 32     # Locators por bloque (mantiene el datagrama muy por debajo del límite UDP)
+CUE_POINTS_PAGE_RETRIES = 2   # Reintentos por bloque antes de volver al fetch completo
+
+# Monitor de conexión (heartbeat)
+HEALTH_PROBE_ADDRESS = "/live/application/get/version"  # Getter barato que solo usa el heartbeat (sin listeners)
+HEALTH_MIN_INTERVAL = 0.5     # segundos entre sondas (sin conexión / degradada)
+HEALTH_MAX_INTERVAL = 3.0     # segundos entre sondas (conexión estable)
+HEALTH_MIN_TIMEOUT = 0.25     # timeout mínimo de sonda
+HEALTH_DEGRADED_RTT = 0.15    # RTT suavizado a partir del cual la conexión es "degraded"
+HEALTH_LOST_AFTER = 3         # sondas perdidas consecutivas para considerar "lost"
+
+# Trazas de latencia de lanzamiento (click → confirmación de Ableton)
+TRACE_ENABLED = True
+TRACE_TIMEOUT = 5.0              # segundos antes de descartar un lanzamiento sin confirmar
+TRACE_HISTORY = 500              # muestras por etapa conservadas para percentiles
+TRACE_POSITION_TOLERANCE = 0.05  # beats de tolerancia para "posición alcanzada"
+TRACE_CONFIRM_WINDOW = 2.0       # beats tras el inicio esperado aceptados como confirmación
+TRACE_BUCKETS_MS = [5, 10, 20, 50, 100, 200, 500, 1000, 2000]
+
+# Reloj de transporte y scheduler de comandos
+CLOCK_SMOOTHING = 0.2         # peso de cada muestra de current_song_time en la fase del reloj
+CLOCK_RESYNC_BEATS = 0.5      # error (beats) a partir del cual se asume un salto y se reancla
+CLOCK_STALE_AFTER = 2.0       # segundos sin muestras tras los que el reloj deja de predecir
+SCHED_LOOKAHEAD = 0.12        # segundos de antelación con que se envía un bundle con timetag
+SCHED_USE_TIMETAGS = False    # AbletonOSC ejecuta los bundles al llegar: True solo si el receptor respeta el timetag
+SCHED_LATE_TOLERANCE = 0.03   # segundos de retraso tolerados antes de descartar un comando
+SCHED_TICK = 0.02             # re-predicción máxima entre comprobaciones del scheduler
+
+# Auto-advance al final de cada track (END TRACK)
+AUTO_ADVANCE_MODE = "off"     # off | segue | gap | stop
+AUTO_ADVANCE_GAP = 2.0        # segundos de silencio entre tracks en modo gap
+AUTO_ADVANCE_POLL = 0.1       # segundos entre revisiones del track en curso
+AUTO_ADVANCE_SETTLE = 0.3     # segundos tras un cambio antes de volver a armar
+
+# Cuantización de lanzamientos y saltos de sección con el transporte en marcha
+LAUNCH_QUANTIZE = "immediate"  # immediate | beat | bar | section
+
+# Lanzamientos pre-armados (stop + jump + start en un único datagrama)
+PREARM_ENABLED = True         # False: secuencia paso a paso con confirmación en cada paso
+PREARM_CONFIRM_BEATS = 2.0    # beats tras el inicio del track aceptados como arranque confirmado
+
+# Vamp: repetir una sección mientras esté retenida
+VAMP_POLL = 0.05              # segundos entre revisiones de la posición
+VAMP_SETTLE = 0.1             # segundos tras cada vuelta antes de volver a armar
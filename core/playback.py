@@ -2,191 +2,634 @@
 # Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
 # NO uso comercial sin autorización - mcolladorguez@gmail.com
 
-"""Lógica de reproducción thread-safe"""
+"""Lógica de reproducción thread-safe
+
+AsyncPlaybackController es la API nativa: espera confirmaciones OSC con `await`
+en su propio event loop. PlaybackController es un wrapper síncrono fino para
+threads que no tienen loop (servidor web).
+"""
 import time
+import asyncio
 import threading
-from osc.client import send_message
+import concurrent.futures
+from typing import List, Optional
+from osc.client import send_message, send_prebuilt
+from osc.handlers import handlers
+from osc.replies import replies
 from core.state import state
+from core.constants import (
+    LAUNCH_QUANTIZE, SCHED_TICK, CALIBRATION_SAMPLES, CALIBRATION_MAX_TIMEOUT,
+    PREARM_ENABLED, PREARM_CONFIRM_BEATS, SCAN_TIMEOUT
+)
+from core.calibration import timing, calibrator
 from core.logger import log_info, log_error, log_warning, log_debug
+from core.tracing import tracer, OUTCOME_FAILED, OUTCOME_SUPERSEDED
+from core.autoadvance import autoadvance
+from core.vamp import vamp
+from core.prearm import prearm, ArmedLaunch
+from core.scan import ScanPipeline, IS_PLAYING_REPLIES
+from core.transport import clock, scheduler, next_boundary, QUANTIZE_IMMEDIATE, QUANTIZE_MODES
+
+# Direcciones por las que Ableton informa del transporte
+SONG_TIME_REPLIES = ("/live/song/get/current_song_time", "/live/song/current_song_time")
+
+# Tolerancia (beats) para considerar confirmado un salto
+JUMP_TOLERANCE = 0.05
+
+# Envíos de un salto sin confirmar antes de abandonar el lanzamiento
+JUMP_ATTEMPTS = 2
+
+
+class NavigationRequest:
+    """Petición de navegación encolada
+
+    `done` se resuelve con True/False al terminar el lanzamiento, o con None si
+    una petición posterior la reemplazó antes de ejecutarse.
+    """
+
+    def __init__(self, target: int, trace_id: Optional[str] = None):
+        self.target = target
+        self.trace_id = trace_id
+        self.done = concurrent.futures.Future()
+
+
+class AsyncPlaybackController:
+    """Controlador de reproducción asíncrono - todas las corrutinas corren en su loop"""
 
-class PlaybackController:
-    """Controlador de reproducción de Ableton con sincronización"""
-    
     def __init__(self):
-        self._scan_lock = threading.Lock()
-        self._playback_lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._scan_lock = asyncio.Lock()
+        self._playback_lock = asyncio.Lock()
         self._last_scan_time = 0
         self._scan_cooldown = 1.0  # Segundos entre scans
-        log_debug("PlaybackController inicializado", module="Playback")
-    
-    def scan_all(self) -> bool:
+        self.scan_pipeline = ScanPipeline()
+        
+        # Cola de navegación con un único consumidor (colapsa pulsaciones rápidas)
+        self._nav_lock = threading.Lock()
+        self._nav_target: Optional[int] = None
+        self._nav_requests: List[NavigationRequest] = []
+        self._nav_event = asyncio.Event()
+        self._nav_consumer = None
+        self._launch = None  # (target, task) del lanzamiento en curso
+        
+        # Cuantización de lanzamientos con el transporte en marcha
+        self._quantize = LAUNCH_QUANTIZE if LAUNCH_QUANTIZE in QUANTIZE_MODES else QUANTIZE_IMMEDIATE
+        log_debug("AsyncPlaybackController inicializado", module="Playback")
+
+    # ===== EVENT LOOP PROPIO =====
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop de reproducción (se arranca bajo demanda)"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="PlaybackLoop", daemon=True
+                )
+                self._loop_thread.start()
+                log_debug("Event loop de reproducción iniciado", module="Playback")
+            return self._loop
+
+    def submit(self, coro):
+        """Programa una corrutina en el loop de reproducción (concurrent.futures.Future)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def _on_loop(self, coro):
+        """Ejecuta la corrutina en el loop de reproducción desde cualquier loop (p.ej. Flet)"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def shutdown(self, timeout: float = 2.0):
+        """Cancela las tareas pendientes (consumidor de navegación, lanzamiento en curso) y detiene el loop"""
+        with self._loop_lock:
+            loop = self._loop
+        if loop is None:
+            return
+        if loop.is_running() and threading.current_thread() is not self._loop_thread:
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_tasks(), loop).result(timeout)
+            except Exception as e:
+                log_warning(f"Tareas de reproducción sin cancelar al apagar: {e}", module="Playback")
+        loop.call_soon_threadsafe(loop.stop)
+        log_debug("Event loop de reproducción detenido", module="Playback")
+
+    async def _cancel_tasks(self):
+        """Cancela y espera todas las tareas del loop; las navegaciones pendientes se resuelven con None"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._nav_consumer = None
+        self._launch = None
+
+        with self._nav_lock:
+            pending, self._nav_requests = self._nav_requests, []
+            self._nav_target = None
+        for request in pending:
+            tracer.abandon(request.trace_id, OUTCOME_FAILED)
+            if not request.done.done():
+                request.done.set_result(None)
+
+    # ===== CUANTIZACIÓN =====
+
+    @property
+    def quantize(self) -> str:
+        return self._quantize
+
+    def set_quantize(self, mode: str) -> bool:
+        """Modo de cuantización: immediate | beat | bar | section"""
+        if mode not in QUANTIZE_MODES:
+            log_warning(f"Modo de cuantización desconocido: {mode}", module="Playback")
+            return False
+        self._quantize = mode
+        log_info(f"⏱ Cuantización de lanzamientos: {mode}", module="Playback")
+        return True
+
+    def cycle_quantize(self) -> str:
+        """Pasa al siguiente modo de cuantización (botón de la UI)"""
+        mode = QUANTIZE_MODES[(QUANTIZE_MODES.index(self._quantize) + 1) % len(QUANTIZE_MODES)]
+        self.set_quantize(mode)
+        return mode
+
+    def _is_quantized(self) -> bool:
+        """Cuantizar solo tiene sentido con el transporte avanzando"""
+        return self._quantize != QUANTIZE_IMMEDIATE and clock.is_running
+
+    # ===== API PÚBLICA (awaitable desde cualquier loop) =====
+
+    def cancel_scan(self) -> bool:
+        """Cancela el scan en curso - Thread-safe"""
+        return self.scan_pipeline.cancel()
+
+    async def scan(self) -> bool:
+        return await self._on_loop(self._scan())
+
+    async def calibrate(self, force: bool = False) -> Optional[dict]:
+        """Calibra los tiempos OSC (force=False: solo si no hay perfil vigente para este equipo)"""
+        return await self._on_loop(calibrator.run() if force else calibrator.ensure())
+
+    async def play_track(self, track_index: int, trace_id: Optional[str] = None) -> bool:
+        return await self._on_loop(self._play_track(track_index, trace_id))
+
+    async def jump_to_section(self, track_index: int, section_index: int,
+                              trace_id: Optional[str] = None) -> bool:
+        return await self._on_loop(self._jump_to_section(track_index, section_index, trace_id))
+
+    async def stop(self):
+        return await self._on_loop(self._stop())
+
+    async def toggle_metronome(self) -> bool:
+        return await self._on_loop(self._toggle_metronome())
+
+    async def set_metronome(self, on: bool) -> bool:
+        return await self._on_loop(self._set_metronome(on))
+
+    async def next_track(self) -> bool:
+        """Avanza al siguiente track (vía cola de navegación)"""
+        request = self.request_navigation(delta=1)
+        if request is None:
+            log_warning("⊘ Ya en el último track", module="Playback")
+            return False
+        return bool(await asyncio.wrap_future(request.done))
+
+    async def prev_track(self) -> bool:
+        """Retrocede al track anterior (vía cola de navegación)"""
+        request = self.request_navigation(delta=-1)
+        if request is None:
+            log_warning("⊘ Ya en el primer track", module="Playback")
+            return False
+        return bool(await asyncio.wrap_future(request.done))
+
+    # ===== COLA DE NAVEGACIÓN =====
+
+    def request_navigation(self, index: Optional[int] = None, delta: int = 0,
+                           trace_id: Optional[str] = None) -> Optional[NavigationRequest]:
+        """Encola una navegación - Thread-safe, no bloquea
+
+        Con `delta` el objetivo se calcula sobre el objetivo pendiente, así que
+        cuatro Next rápidos acaban en current + 4 con un único lanzamiento.
+        Devuelve None si el objetivo queda fuera del setlist.
+        """
+        with self._nav_lock:
+            base = self._nav_target if self._nav_target is not None else state.current_index
+            target = index if index is not None else base + delta
+
+            if not (0 <= target < state.get_track_count()):
+                tracer.abandon(trace_id, OUTCOME_FAILED)
+                return None
+
+            superseded = [r for r in self._nav_requests if r.target != target]
+            self._nav_requests = [r for r in self._nav_requests if r.target == target]
+            request = NavigationRequest(target, trace_id)
+            self._nav_requests.append(request)
+            self._nav_target = target
+
+        tracer.mark(trace_id, "queued")
+        for old in superseded:
+            tracer.abandon(old.trace_id, OUTCOME_SUPERSEDED)
+            old.done.set_result(None)
+        if superseded:
+            log_debug(f"Navegación colapsada: {len(superseded)} petición(es) reemplazada(s) → {target}", module="Playback")
+
+        self.loop.call_soon_threadsafe(self._wake_navigation, target)
+        return request
+
+    def _wake_navigation(self, target: int):
+        """Despierta al consumidor y cancela el lanzamiento obsoleto (en el loop)"""
+        if self._nav_consumer is None or self._nav_consumer.done():
+            self._nav_consumer = self.loop.create_task(self._navigation_consumer())
+
+        if self._launch is not None:
+            launch_target, task = self._launch
+            if launch_target != target and not task.done():
+                log_debug(f"Cancelando lanzamiento reemplazado ({launch_target} → {target})", module="Playback")
+                task.cancel()
+
+        self._nav_event.set()
+
+    async def _navigation_consumer(self):
+        """Consumidor único: ejecuta solo el último objetivo pendiente"""
+        while True:
+            await self._nav_event.wait()
+            self._nav_event.clear()
+
+            with self._nav_lock:
+                target = self._nav_target
+                # La traza de la última pulsación representa la latencia percibida
+                trace_ids = [r.trace_id for r in self._nav_requests if r.target == target]
+            if target is None:
+                continue
+            trace_id = trace_ids[-1] if trace_ids else None
+
+            task = asyncio.ensure_future(self._play_track(target, trace_id))
+            self._launch = (target, task)
+            await asyncio.wait({task})
+            self._launch = None
+
+            if task.cancelled():
+                # Sus peticiones ya se resolvieron como reemplazadas
+                continue
+
+            ok = task.result()
+            with self._nav_lock:
+                finished = [r for r in self._nav_requests if r.target == target]
+                self._nav_requests = [r for r in self._nav_requests if r.target != target]
+                if self._nav_target == target:
+                    self._nav_target = None
+
+            for request in finished:
+                if request.trace_id != trace_id:
+                    tracer.abandon(request.trace_id, OUTCOME_SUPERSEDED)
+                if not request.done.done():
+                    request.done.set_result(ok)
+
+            handlers._safe_ui_update('update_listbox')
+
+    # ===== IMPLEMENTACIÓN (solo en el loop de reproducción) =====
+
+    async def _await_stopped(self, trace_id: Optional[str] = None):
+        """Para el transporte y espera la confirmación is_playing=0"""
+        stopped = replies.expect(IS_PLAYING_REPLIES, lambda args: args and not int(args[0]))
+        send_message("/live/song/stop_playing", [], trace_id=trace_id)
+        send_message("/live/song/get/is_playing", [])
+        await stopped.wait(timing.ack_timeout)
+
+    async def _await_position(self, beat: float):
+        """Espera a que Ableton confirme la nueva posición"""
+        moved = replies.expect(SONG_TIME_REPLIES, lambda args: args and abs(float(args[0]) - beat) < JUMP_TOLERANCE)
+        # Parado no hay listener de tiempo: pedir la posición explícitamente
+        send_message("/live/song/get/current_song_time", [])
+        return await moved.wait(timing.ack_timeout)
+
+    async def _jump_confirmed(self, address: str, args: list, beat: float,
+                              trace_id: Optional[str] = None) -> bool:
+        """Envía el salto y espera la posición; lo repite si Ableton no lo confirma"""
+        for attempt in range(1, JUMP_ATTEMPTS + 1):
+            send_message(address, args, trace_id=trace_id)
+            if await self._await_position(beat) is not None:
+                return True
+            log_warning(f"Salto a beat {beat:g} sin confirmar ({attempt}/{JUMP_ATTEMPTS})", module="Playback")
+        return False
+
+    async def _launch_prearmed(self, launch: ArmedLaunch, trace_id: Optional[str] = None) -> bool:
+        """Stop + jump + start en un único datagrama; True si Ableton confirma el arranque"""
+        started = replies.expect(SONG_TIME_REPLIES, lambda args: args and
+                                 launch.start - JUMP_TOLERANCE <= float(args[0]) < launch.start + PREARM_CONFIRM_BEATS)
+        send_prebuilt(launch.bundle, trace_id)
+        if await started.wait(timing.ack_timeout) is not None:
+            return True
+        log_warning(f"Lanzamiento pre-armado de '{launch.title}' sin confirmar, repitiendo paso a paso", module="Playback")
+        return False
+
+    async def _quantized_jump(self, beat: float, label: str, trace_id: Optional[str] = None) -> bool:
+        """Salta a `beat` en el siguiente límite de cuantización sin parar el transporte
+
+        El salto se envía como bundle a través del scheduler; si el
+        transporte se detiene antes del límite, el salto se cancela.
+        """
+        earliest = scheduler.earliest_beat()
+        if earliest is None:
+            return False
+
+        playing_track = state.find_track_by_beat(earliest)
+        section_beats = None
+        if playing_track is not None:
+            section_beats = [s.beat for s in playing_track.sections] + [playing_track.end]
+
+        boundary = next_boundary(earliest, self._quantize, state.time_signature_num, section_beats)
+        command = scheduler.schedule(
+            boundary, [("/live/song/set/current_song_time", [beat])],
+            label=f"{label} @ beat {boundary:g}", trace_id=trace_id
+        )
+        tracer.mark(trace_id, "scheduled")
+        log_debug(f"Salto cuantizado ({self._quantize}): beat {boundary:g} → {beat:g}", module="Playback")
+
+        try:
+            while command.pending:
+                if not clock.is_running:
+                    scheduler.cancel(command)
+                    log_warning("Transporte detenido antes del límite: salto cancelado", module="Playback")
+                    break
+                await asyncio.sleep(SCHED_TICK)
+            if command.outcome == "sent":
+                # Volver cuando el salto ya ha ocurrido: el siguiente comando cuantiza
+                # sobre la posición nueva y no sobre la anterior
+                await asyncio.sleep(max(0.0, command.target_time - time.time()))
+        except asyncio.CancelledError:
+            scheduler.cancel(command)
+            raise
+
+        return command.outcome == "sent"
+
+    async def _scan(self) -> bool:
         """Escanea datos de Ableton - Previene múltiples scans simultáneos"""
         current_time = time.time()
-        
+
         # Prevenir scans muy frecuentes
         if current_time - self._last_scan_time < self._scan_cooldown:
             log_warning(f"⊘ Scan en cooldown ({self._scan_cooldown}s)", module="Playback")
             return False
-        
-        with self._scan_lock:
-            log_info("⟳ Iniciando scan completo...", module="Playback")
-            
-            try:
-                # 1. Obtener cue points (estructura principal)
-                log_debug("Solicitando cue points", module="Playback")
-                send_message("/live/song/get/cue_points", [])
-                time.sleep(0.3)  # Esperar respuesta
-                
-                # 2. Obtener clips del arrangement (TRACK 0 solamente)
-                # IMPORTANTE: Solo el track 0 existe en Ableton por defecto
-                log_debug("Solicitando clips del track 0", module="Playback")
-                send_message("/live/track/get/arrangement_clips/name", [0])
-                time.sleep(0.15)
-                
-                send_message("/live/track/get/arrangement_clips/start_time", [0])
-                time.sleep(0.15)
-                
-                # 3. Obtener estado de reproducción (sin índices)
-                log_debug("Solicitando estado de reproducción", module="Playback")
-                send_message("/live/song/get/metronome", [])
-                time.sleep(0.05)
-                
-                send_message("/live/song/get/tempo", [])
-                time.sleep(0.05)
-                
-                send_message("/live/song/get/is_playing", [])
-                time.sleep(0.05)
-                
-                # 4. Iniciar listeners (sin parámetros de track)
-                log_debug("Iniciando listeners OSC", module="Playback")
-                send_message("/live/song/start_listen/current_song_time", [])
-                time.sleep(0.05)
-                
-                send_message("/live/song/start_listen/is_playing", [])
-                time.sleep(0.05)
-                
-                self._last_scan_time = current_time
-                log_info("✓ Scan completado correctamente", module="Playback")
-                return True
-                
-            except Exception as e:
-                log_error(f"Error en scan", module="Playback", exc=e)
+
+        if self._scan_lock.locked():
+            log_warning("⊘ Scan ya en curso", module="Playback")
+            return False
+
+        async with self._scan_lock:
+            # Etapas, tiempos, progreso y cancelación en ScanPipeline
+            if not await self.scan_pipeline.run():
                 return False
-    
-    def play_track(self, track_index: int) -> bool:
-        """Reproduce un track específico - Thread-safe"""
-        with self._playback_lock:
+            self._last_scan_time = current_time
+            prearm.arm_around(max(state.current_index, 0))
+            return True
+
+    async def _play_track(self, track_index: int, trace_id: Optional[str] = None) -> bool:
+        """Reproduce un track específico"""
+        async with self._playback_lock:
             if not (0 <= track_index < len(state.tracks)):
                 log_error(f"Índice inválido: {track_index}", module="Playback")
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-            
+
             track = state.tracks[track_index]
             locator_id = track.start_locator_id
-            
+
             if locator_id is None:
                 log_error(f"Track '{track.title}' sin locator ID", module="Playback")
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-            
+
+            quantized = self._is_quantized()
+            tracer.dispatch(trace_id, track_index, track.start, running=quantized)
+            autoadvance.cancel_pending()
+            vamp.on_manual_launch(track_index)
+
             try:
                 log_info(f"▶ Reproduciendo: {track.title}", module="Playback")
                 log_debug(f"Track index: {track_index}, Locator ID: {locator_id}", module="Playback")
-                
-                # Secuencia de reproducción
-                send_message("/live/song/stop_playing", [])
-                time.sleep(0.08)
-                
-                send_message("/live/song/cue_point/jump", [locator_id])
-                time.sleep(0.08)
-                
-                send_message("/live/song/start_playing", [])
-                
+
+                if quantized:
+                    if not await self._quantized_jump(track.start, track.title, trace_id):
+                        tracer.abandon(trace_id, OUTCOME_FAILED)
+                        return False
+                    state.current_index = track_index
+                    prearm.arm_around(track_index)
+                    return True
+
+                # Camino rápido: datagrama pre-armado, confirmado por la posición reportada
+                launch = prearm.take(track_index) if PREARM_ENABLED else None
+                if launch is not None and await self._launch_prearmed(launch, trace_id):
+                    state.is_playing = True
+                    state.current_index = track_index
+                    prearm.arm_around(track_index)
+                    return True
+
+                # Secuencia de reproducción: cada paso espera la confirmación de Ableton
+                await self._await_stopped(trace_id)
+
+                # Sin salto confirmado no se arranca: sonaría la posición anterior
+                if not await self._jump_confirmed("/live/song/cue_point/jump", [locator_id], track.start, trace_id):
+                    log_error(f"Ableton no confirmó el salto a '{track.title}'", module="Playback")
+                    tracer.abandon(trace_id, OUTCOME_FAILED)
+                    return False
+
+                send_message("/live/song/start_playing", [], trace_id=trace_id)
+
                 # Actualizar estado
                 state.is_playing = True
                 state.current_index = track_index
-                
+                prearm.arm_around(track_index)
+
                 log_debug(f"Estado actualizado: is_playing=True, current_index={track_index}", module="Playback")
                 return True
-                
+
             except Exception as e:
                 log_error(f"Error reproduciendo track '{track.title}'", module="Playback", exc=e)
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-    
-    def stop(self):
-        """Detiene la reproducción - Thread-safe"""
-        with self._playback_lock:
+
+    async def _stop(self):
+        """Detiene la reproducción"""
+        async with self._playback_lock:
             try:
+                autoadvance.cancel_pending()
                 send_message("/live/song/stop_playing", [])
                 state.is_playing = False
                 log_info("■ Stop", module="Playback")
-                                            
+
             except Exception as e:
                 log_error("Error deteniendo reproducción", module="Playback", exc=e)
-    
-    def jump_to_section(self, track_index: int, section_index: int) -> bool:
-        """Salta a una sección específica - Thread-safe"""
-        with self._playback_lock:
+
+    async def _jump_to_section(self, track_index: int, section_index: int,
+                               trace_id: Optional[str] = None) -> bool:
+        """Salta a una sección específica"""
+        async with self._playback_lock:
             if not (0 <= track_index < len(state.tracks)):
                 log_error(f"Índice de track inválido: {track_index}", module="Playback")
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-            
+
             track = state.tracks[track_index]
             if not (0 <= section_index < len(track.sections)):
                 log_error(f"Índice de sección inválido: {section_index}", module="Playback")
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-            
+
             section = track.sections[section_index]
-            
+            quantized = self._is_quantized()
+            tracer.dispatch(trace_id, track_index, section.beat, running=quantized)
+            autoadvance.cancel_pending()
+            vamp.on_manual_launch(track_index, section_index)
+
             try:
                 log_info(f"⇒ Saltando a: {section.name} (beat {section.beat})", module="Playback")
                 log_debug(f"Track: {track.title}, Section: {section.name}", module="Playback")
-                
-                send_message("/live/song/stop_playing", [])
-                time.sleep(0.05)
-                
-                send_message("/live/song/set/current_song_time", [section.beat])
-                time.sleep(0.05)
-                
-                send_message("/live/song/start_playing", [])
-                
+
+                if quantized:
+                    if not await self._quantized_jump(section.beat, section.name, trace_id):
+                        tracer.abandon(trace_id, OUTCOME_FAILED)
+                        return False
+                    state.current_index = track_index
+                    return True
+
+                # Show compilado: el salto ya está codificado
+                launch = prearm.take_section(track_index, section_index) if PREARM_ENABLED else None
+                if launch is not None and await self._launch_prearmed(launch, trace_id):
+                    state.is_playing = True
+                    state.current_index = track_index
+                    return True
+
+                await self._await_stopped(trace_id)
+
+                if not await self._jump_confirmed("/live/song/set/current_song_time", [section.beat],
+                                                  section.beat, trace_id):
+                    log_error(f"Ableton no confirmó el salto a '{section.name}'", module="Playback")
+                    tracer.abandon(trace_id, OUTCOME_FAILED)
+                    return False
+
+                send_message("/live/song/start_playing", [], trace_id=trace_id)
+
                 state.is_playing = True
                 state.current_index = track_index
-                
+
                 log_debug(f"Salto completado: current_index={track_index}", module="Playback")
                 return True
-                
+
             except Exception as e:
                 log_error(f"Error saltando a sección '{section.name}'", module="Playback", exc=e)
+                tracer.abandon(trace_id, OUTCOME_FAILED)
                 return False
-    
+
+    async def _toggle_metronome(self) -> bool:
+        """Alterna el metrónomo"""
+        async with self._playback_lock:
+            return self._send_metronome(not state.metronome_on)
+
+    async def _set_metronome(self, on: bool) -> bool:
+        """Fija el metrónomo (idempotente: repetirlo no alterna)"""
+        async with self._playback_lock:
+            if state.metronome_on == on:
+                return on
+            return self._send_metronome(on)
+
+    def _send_metronome(self, on: bool) -> bool:
+        try:
+            state.metronome_on = on
+            send_message("/live/song/set/metronome", [1 if state.metronome_on else 0])
+            log_info(f"🎵 Metrónomo: {'ON' if state.metronome_on else 'OFF'}", module="Playback")
+            return state.metronome_on
+
+        except Exception as e:
+            log_error("Error toggling metrónomo", module="Playback", exc=e)
+            return state.metronome_on
+
+
+class PlaybackController:
+    """Wrapper síncrono sobre AsyncPlaybackController (para threads sin event loop)
+
+    Bloquea solo al thread que llama mientras la corrutina corre en el loop de
+    reproducción. No usar desde el propio loop de reproducción.
+    """
+
+    def __init__(self, controller: AsyncPlaybackController):
+        self.aio = controller
+        log_debug("PlaybackController inicializado", module="Playback")
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        return self.aio.submit(coro).result(timeout if timeout is not None else timing.osc_timeout * 4)
+
+    def scan_all(self) -> bool:
+        """Escanea datos de Ableton; False si no termina en SCAN_TIMEOUT (el scan se cancela)"""
+        # Cada etapa tiene su propio timeout; este tope solo protege al thread que llama
+        future = self.aio.submit(self.aio.scan())
+        try:
+            return future.result(SCAN_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            log_error(f"Scan sin terminar tras {SCAN_TIMEOUT:.0f}s, cancelando", module="Playback")
+            self.aio.cancel_scan()
+            future.cancel()
+            return False
+
+    def cancel_scan(self) -> bool:
+        """Cancela el scan en curso - Thread-safe"""
+        return self.aio.cancel_scan()
+
+    def calibrate(self, force: bool = False) -> Optional[dict]:
+        """Calibra los tiempos OSC - Thread-safe"""
+        return self._run(self.aio.calibrate(force), timeout=CALIBRATION_SAMPLES * CALIBRATION_MAX_TIMEOUT)
+
+    @property
+    def scan_pipeline(self) -> ScanPipeline:
+        return self.aio.scan_pipeline
+
+    def play_track(self, track_index: int, trace_id: Optional[str] = None) -> bool:
+        """Reproduce un track específico - Thread-safe"""
+        return self._run(self.aio.play_track(track_index, trace_id))
+
+    def stop(self):
+        """Detiene la reproducción - Thread-safe"""
+        return self._run(self.aio.stop())
+
+    def jump_to_section(self, track_index: int, section_index: int,
+                        trace_id: Optional[str] = None) -> bool:
+        """Salta a una sección específica - Thread-safe"""
+        return self._run(self.aio.jump_to_section(track_index, section_index, trace_id))
+
     def toggle_metronome(self) -> bool:
         """Alterna el metrónomo - Thread-safe"""
-        with self._playback_lock:
-            try:
-                state.metronome_on = not state.metronome_on
-                send_message("/live/song/set/metronome", [1 if state.metronome_on else 0])
-                log_info(f"🎵 Metrónomo: {'ON' if state.metronome_on else 'OFF'}", module="Playback")
-                return state.metronome_on
-                
-            except Exception as e:
-                log_error("Error toggling metrónomo", module="Playback", exc=e)
-                return state.metronome_on
-    
+        return self._run(self.aio.toggle_metronome())
+
+    @property
+    def quantize(self) -> str:
+        return self.aio.quantize
+
+    def set_quantize(self, mode: str) -> bool:
+        """Modo de cuantización de lanzamientos - Thread-safe"""
+        return self.aio.set_quantize(mode)
+
+    def request_navigation(self, index: Optional[int] = None, delta: int = 0,
+                           trace_id: Optional[str] = None) -> Optional[NavigationRequest]:
+        """Encola una navegación sin bloquear - Thread-safe"""
+        return self.aio.request_navigation(index=index, delta=delta, trace_id=trace_id)
+
     def next_track(self) -> bool:
         """Avanza al siguiente track"""
-        if state.current_index < len(state.tracks) - 1:
-            log_debug(f"Next track: {state.current_index} → {state.current_index + 1}", module="Playback")
-            return self.play_track(state.current_index + 1)
-        log_warning("⊘ Ya en el último track", module="Playback")
-        return False
-    
+        return self._run(self.aio.next_track())
+
     def prev_track(self) -> bool:
         """Retrocede al track anterior"""
-        if state.current_index > 0:
-            log_debug(f"Previous track: {state.current_index} → {state.current_index - 1}", module="Playback")
-            return self.play_track(state.current_index - 1)
-        log_warning("⊘ Ya en el primer track", module="Playback")
-        return False
-    
-# Instancia global
-playback = PlaybackController()
-log_info("✓ Instancia global de PlaybackController creada", module="Playback")
\ No newline at end of file
+        return self._run(self.aio.prev_track())
+
+# Instancias globales
+playback_async = AsyncPlaybackController()
+playback = PlaybackController(playback_async)
+log_info("✓ Instancia global de PlaybackController creada", module="Playback")
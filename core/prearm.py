@@ -0,0 +1,187 @@
+# core/prearm.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Lanzamientos pre-armados
+En cuanto arranca un track se codifican los bundles stop + jump + start del
+anterior y del siguiente. Next/Prev envían ese datagrama tal cual, sin leer el
+setlist ni serializar OSC en el camino crítico.
+
+Un show compilado (setlist.show) instala además una tabla con los bundles de
+todos los tracks y secciones; vale mientras la huella de locators + tracks
+sea la misma con la que se compiló.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from osc.client import build_bundle
+from core.state import state
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+def structure_fingerprint(locators, tracks) -> str:
+    """Huella de todo lo que determina los bundles (ids, beats, orden de tracks)"""
+    h = hashlib.sha1()
+    for loc in locators:
+        h.update(f"L{loc.original_id}:{loc.beat:.6f};".encode("utf-8"))
+    for track in tracks:
+        h.update(f"T{track.start_locator_id}:{track.start:.6f}:{track.end:.6f}".encode("utf-8"))
+        for section in track.sections:
+            h.update(f",{section.beat:.6f}".encode("utf-8"))
+        h.update(b";")
+    return h.hexdigest()
+
+
+class ArmedLaunch:
+    """Bundle de lanzamiento ya codificado para un track (o sección, con `bundle` propio)"""
+
+    def __init__(self, index: int, title: str, locator_id: Optional[int], start: float, version: int,
+                 bundle=None):
+        self.index = index
+        self.title = title
+        self.locator_id = locator_id
+        self.start = start
+        self.version = version  # state.structure_version con la que se validó
+        self.bundle = bundle if bundle is not None else build_bundle([
+            ("/live/song/stop_playing", []),
+            ("/live/song/cue_point/jump", [locator_id]),
+            ("/live/song/start_playing", []),
+        ])
+        self.armed_at = time.time()
+
+
+class LaunchPrearm:
+    """Buffer de lanzamientos pre-armados alrededor del track actual - Thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._armed: Dict[int, ArmedLaunch] = {}
+        # Tabla de un show compilado: tracks, secciones, huella y versión con la que se validó
+        self._compiled: Dict[int, ArmedLaunch] = {}
+        self._compiled_sections: Dict[Tuple[int, int], ArmedLaunch] = {}
+        self._compiled_fingerprint: Optional[str] = None
+        self._compiled_version: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        log_debug("LaunchPrearm inicializado", module="Playback")
+
+    def _compiled_valid(self, version: int) -> bool:
+        """¿Sigue vigente la tabla compilada? Se revalida una vez por cada structure_version"""
+        with self._lock:
+            if self._compiled_fingerprint is None:
+                return False
+            if self._compiled_version == version:
+                return True
+        current = structure_fingerprint(state.locators, state.tracks)
+        with self._lock:
+            if self._compiled_fingerprint is None:
+                return False
+            if current != self._compiled_fingerprint:
+                log_info("Show compilado descartado: locators/tracks ya no coinciden", module="Playback")
+                self._clear_compiled()
+                return False
+            # Misma estructura (p.ej. re-scan idéntico): la tabla sigue valiendo
+            self._compiled_version = version
+            for launch in list(self._compiled.values()) + list(self._compiled_sections.values()):
+                launch.version = version
+            return True
+
+    def _clear_compiled(self):
+        self._compiled, self._compiled_sections = {}, {}
+        self._compiled_fingerprint = self._compiled_version = None
+
+    def _build(self, index: int) -> Optional[ArmedLaunch]:
+        """Codifica el lanzamiento de `index` validando su locator contra los cue points actuales"""
+        version = state.structure_version
+        if self._compiled_valid(version):
+            launch = self._compiled.get(index)
+            if launch is not None:
+                return launch
+        tracks = state.tracks
+        if not (0 <= index < len(tracks)):
+            return None
+
+        track = tracks[index]
+        if track.start_locator_id is None:
+            return None
+        locator = next((loc for loc in state.locators if loc.original_id == track.start_locator_id), None)
+        if locator is None or abs(locator.beat - track.start) > 1e-6:
+            log_warning(f"Locator {track.start_locator_id} de '{track.title}' ya no coincide, sin pre-armar", module="Playback")
+            return None
+
+        return ArmedLaunch(index, track.title, track.start_locator_id, track.start, version)
+
+    def arm_around(self, index: int):
+        """Pre-arma anterior y siguiente de `index` y descarta el resto"""
+        armed = {}
+        for neighbour in (index - 1, index + 1):
+            launch = self._build(neighbour)
+            if launch is not None:
+                armed[neighbour] = launch
+        with self._lock:
+            self._armed = armed
+        log_debug(f"Pre-armados: {sorted(armed)} (alrededor de {index})", module="Playback")
+
+    def take(self, index: int) -> Optional[ArmedLaunch]:
+        """Lanzamiento para `index`: el pre-armado si sigue vigente, si no uno recién codificado"""
+        version = state.structure_version
+        with self._lock:
+            launch = self._armed.get(index)
+            if launch is not None and launch.version == version:
+                self._hits += 1
+                return launch
+            self._misses += 1
+            if launch is not None:
+                self._stale += 1
+
+        launch = self._build(index)
+        if launch is not None:
+            with self._lock:
+                self._armed[index] = launch
+        return launch
+
+    def take_section(self, track_index: int, section_index: int) -> Optional[ArmedLaunch]:
+        """Salto a sección pre-codificado; solo existe con un show compilado vigente"""
+        if not self._compiled_valid(state.structure_version):
+            return None
+        with self._lock:
+            return self._compiled_sections.get((track_index, section_index))
+
+    def install(self, launches: Dict[int, ArmedLaunch], sections: Dict[Tuple[int, int], ArmedLaunch],
+                fingerprint: str):
+        """Instala la tabla de un show compilado (validada con la structure_version actual)"""
+        version = state.structure_version
+        with self._lock:
+            self._compiled = dict(launches)
+            self._compiled_sections = dict(sections)
+            self._compiled_fingerprint = fingerprint
+            self._compiled_version = None
+            self._armed.clear()
+        if not self._compiled_valid(version):
+            log_warning("El show compilado no coincide con el setlist cargado, sin tabla pre-codificada", module="Playback")
+            return
+        self.arm_around(max(state.current_index, 0))
+
+    def invalidate(self):
+        """Vacía el buffer (p.ej. al cargar otro setlist)"""
+        with self._lock:
+            self._armed.clear()
+
+    def snapshot(self) -> dict:
+        version = state.structure_version
+        with self._lock:
+            return {
+                "armed": sorted(i for i, launch in self._armed.items() if launch.version == version),
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "compiled": len(self._compiled) if self._compiled_version == version else 0,
+            }
+
+# Instancia global
+prearm = LaunchPrearm()
+log_info("✓ Instancia global de LaunchPrearm creada", module="Playback")
@@ -0,0 +1,344 @@
+# core/scan.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Pipeline de scan por etapas: connect → cue_points → clips → transport → listeners
+Cada etapa guarda su estado y duración; el progreso se publica como eventos
+(snapshot serializable) para que la UI y el controlador web lo pinten al vuelo.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, List, Optional
+from osc.client import send_message
+from osc.handlers import handlers
+from osc.replies import replies
+from core.state import state
+from core.constants import SCAN_CONNECT_ADDRESS, SCAN_CONNECT_ATTEMPTS
+from core.calibration import timing
+from core.logger import log_info, log_error, log_warning, log_debug
+
+STAGE_CONNECT = "connect"
+STAGE_CUE_POINTS = "cue_points"
+STAGE_CLIPS = "clips"
+STAGE_TRANSPORT = "transport"
+STAGE_LISTENERS = "listeners"
+
+STAGE_LABELS = {
+    STAGE_CONNECT: "Conexión",
+    STAGE_CUE_POINTS: "Cue points",
+    STAGE_CLIPS: "Clips",
+    STAGE_TRANSPORT: "Transporte",
+    STAGE_LISTENERS: "Listeners",
+}
+STAGES = list(STAGE_LABELS)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_TIMEOUT = "timeout"      # Sin respuesta completa: el scan continúa
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+STATUS_SKIPPED = "skipped"
+
+# Direcciones por las que Ableton responde (duplicadas según versión de AbletonOSC)
+IS_PLAYING_REPLIES = ("/live/song/get/is_playing", "/live/song/is_playing")
+CUE_POINTS_REPLIES = ("/live/song/get/cue_points", "/live/song/get/cue_points/range")
+
+
+def _is_last_cue_page(args) -> bool:
+    """True para la respuesta completa o el último bloque paginado"""
+    if not args or isinstance(args[0], str):
+        return True  # Respuesta completa: [name, beat, ...]
+    start, total = int(args[0]), int(args[1])
+    return start + (len(args) - 2) // 2 >= total
+
+
+class ScanAborted(Exception):
+    """Una etapa imprescindible falló: el resto no tiene sentido"""
+
+
+class ScanStage:
+    """Estado y duración de una etapa del scan"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = STATUS_PENDING
+        self.started_at: Optional[float] = None
+        self.elapsed_ms: Optional[float] = None
+        self.detail = ""
+        self.progress: Optional[float] = None  # 0..1 si la etapa informa de avance parcial
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in (STATUS_PENDING, STATUS_RUNNING)
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed_ms
+        if elapsed is None and self.started_at is not None:
+            elapsed = (time.time() - self.started_at) * 1000
+        return {
+            "name": self.name,
+            "label": STAGE_LABELS[self.name],
+            "status": self.status,
+            "elapsed_ms": round(elapsed, 1) if elapsed is not None else None,
+            "detail": self.detail,
+            "progress": self.progress,
+        }
+
+
+class ScanPipeline:
+    """Scan completo de Ableton por etapas, cancelable - corre en el loop de reproducción
+
+    `add_listener(fn)` recibe un snapshot en cada cambio de etapa o de progreso.
+    Los listeners se llaman desde el loop de reproducción o desde el thread del
+    servidor OSC, así que deben ser thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[dict], None]] = []
+        self._stages = [ScanStage(name) for name in STAGES]
+        self._scan_id = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._result: Optional[str] = None  # done | failed | cancelled
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cancel_requested = False
+        log_debug("ScanPipeline inicializado", module="Playback")
+
+    # ===== EVENTOS =====
+
+    def add_listener(self, callback: Callable[[dict], None]):
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[dict], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _emit(self):
+        snapshot = self.snapshot()
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                log_error("Error en listener de scan", module="Playback", exc=e)
+        handlers._safe_ui_update('update_scan_progress', snapshot)
+
+    # ===== ESTADO =====
+
+    @property
+    def running(self) -> bool:
+        with self._lock:
+            return self._task is not None
+
+    def snapshot(self) -> dict:
+        """Estado serializable del scan en curso (o del último)"""
+        with self._lock:
+            stages = [stage.to_dict() for stage in self._stages]
+            running = self._task is not None
+            end = self._finished_at if self._finished_at is not None else time.time()
+            elapsed = (end - self._started_at) * 1000 if self._started_at is not None else None
+            current = next((s.name for s in self._stages if s.status == STATUS_RUNNING), None)
+
+            done = 0.0
+            for stage in self._stages:
+                if stage.finished:
+                    done += 1
+                elif stage.status == STATUS_RUNNING and stage.progress is not None:
+                    done += stage.progress
+            return {
+                "id": self._scan_id,
+                "running": running,
+                "result": self._result,
+                "current": current,
+                "progress": round(done / len(self._stages), 3),
+                "elapsed_ms": round(elapsed, 1) if elapsed is not None else None,
+                "stages": stages,
+            }
+
+    # ===== CANCELACIÓN =====
+
+    def cancel(self) -> bool:
+        """Cancela el scan en curso - Thread-safe. False si no hay ninguno"""
+        with self._lock:
+            task, loop = self._task, self._loop
+            if task is None:
+                return False
+            self._cancel_requested = True
+        loop.call_soon_threadsafe(task.cancel)
+        log_info("⊘ Cancelando scan...", module="Playback")
+        return True
+
+    # ===== EJECUCIÓN =====
+
+    async def run(self) -> bool:
+        """Ejecuta todas las etapas en orden. True si el scan terminó correctamente"""
+        with self._lock:
+            self._scan_id += 1
+            self._stages = [ScanStage(name) for name in STAGES]
+            self._started_at, self._finished_at, self._result = time.time(), None, None
+            self._task = asyncio.current_task()
+            self._loop = asyncio.get_running_loop()
+            self._cancel_requested = False
+
+        log_info("⟳ Iniciando scan completo...", module="Playback")
+        self._emit()
+
+        result = "failed"
+        try:
+            await self._stage(STAGE_CONNECT, self._connect)
+            await self._stage(STAGE_CUE_POINTS, self._cue_points)
+            await self._stage(STAGE_CLIPS, self._clips)
+            await self._stage(STAGE_TRANSPORT, self._transport)
+            await self._stage(STAGE_LISTENERS, self._listeners_stage)
+            result = "done"
+        except asyncio.CancelledError:
+            if not self._cancel_requested:
+                raise  # Cancelación externa (cierre del loop): propagar
+            result = "cancelled"
+        except ScanAborted as e:
+            log_warning(f"⊘ Scan abortado: {e}", module="Playback")
+        except Exception as e:
+            log_error("Error en scan", module="Playback", exc=e)
+        finally:
+            self._finish(result)
+
+        if result == "done":
+            timings = " · ".join(f"{s['name']} {s['elapsed_ms']:.0f}" for s in self.snapshot()["stages"])
+            log_info(f"✓ Scan completado correctamente ({timings} ms)", module="Playback")
+        elif result == "cancelled":
+            log_info("⊘ Scan cancelado", module="Playback")
+        return result == "done"
+
+    def _finish(self, result: str):
+        handlers.cue_progress_callback = None
+        if result != "done":
+            handlers.cancel_cue_points_fetch()
+        with self._lock:
+            for stage in self._stages:
+                if stage.status == STATUS_RUNNING:
+                    stage.status = STATUS_CANCELLED if result == "cancelled" else STATUS_FAILED
+                    stage.elapsed_ms = (time.time() - stage.started_at) * 1000
+                elif stage.status == STATUS_PENDING:
+                    stage.status = STATUS_SKIPPED
+            self._result = result
+            self._finished_at = time.time()
+            self._task = None
+            self._loop = None
+        self._emit()
+
+    async def _stage(self, name: str, step):
+        """Ejecuta una etapa cronometrada; `step` devuelve (estado, detalle)"""
+        stage = self._stages[STAGES.index(name)]
+        with self._lock:
+            stage.status = STATUS_RUNNING
+            stage.started_at = time.time()
+        log_debug(f"Scan: {STAGE_LABELS[name]}...", module="Playback")
+        self._emit()
+
+        status, detail = await step(stage)
+
+        with self._lock:
+            stage.status = status
+            stage.detail = detail
+            stage.elapsed_ms = (time.time() - stage.started_at) * 1000
+            if stage.progress is not None:
+                stage.progress = 1.0
+        log_debug(f"Scan: {STAGE_LABELS[name]} {status} en {stage.elapsed_ms:.0f} ms {detail}", module="Playback")
+        self._emit()
+
+        if status == STATUS_FAILED:
+            raise ScanAborted(f"{STAGE_LABELS[name]}: {detail}")
+
+    # ===== ETAPAS =====
+
+    async def _connect(self, stage: ScanStage):
+        """Sonda barata: sin respuesta de Ableton no merece la pena seguir"""
+        for attempt in range(1, SCAN_CONNECT_ATTEMPTS + 1):
+            probe = replies.expect(SCAN_CONNECT_ADDRESS)
+            sent = time.time()
+            send_message(SCAN_CONNECT_ADDRESS, [])
+            if await probe.wait(timing.osc_timeout) is not None:
+                return STATUS_DONE, f"RTT {(time.time() - sent) * 1000:.0f} ms"
+            log_warning(f"Ableton no responde (intento {attempt}/{SCAN_CONNECT_ATTEMPTS})", module="Playback")
+            with self._lock:
+                stage.detail = f"reintento {attempt}/{SCAN_CONNECT_ATTEMPTS}"
+            self._emit()
+        return STATUS_FAILED, "Ableton no responde"
+
+    async def _cue_points(self, stage: ScanStage):
+        """Estructura principal (por bloques si AbletonOSC lo soporta)
+
+        El timeout es de inactividad: en sets grandes la descarga puede durar más
+        que el timeout OSC mientras sigan llegando bloques.
+        """
+        received = [0]
+
+        def on_progress(count: int, total: int):
+            received[0] = count
+            with self._lock:
+                stage.progress = count / total if total else 1.0
+                stage.detail = f"{count}/{total}"
+            self._emit()
+
+        cue_points = replies.expect(CUE_POINTS_REPLIES, _is_last_cue_page)
+        handlers.cue_progress_callback = on_progress
+        try:
+            handlers.start_cue_points_fetch()
+            seen = -1
+            while not cue_points.future.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(cue_points.future), timing.osc_timeout)
+                except asyncio.TimeoutError:
+                    if received[0] == seen:
+                        log_warning("Cue points sin respuesta completa, continuando scan", module="Playback")
+                        return STATUS_TIMEOUT, stage.detail or "sin respuesta"
+                    seen = received[0]
+        finally:
+            handlers.cue_progress_callback = None
+            replies.discard(cue_points)
+        return STATUS_DONE, f"{len(state.locators)} locators"
+
+    async def _clips(self, stage: ScanStage):
+        """Clips del arrangement (solo el track 0 existe en Ableton por defecto)"""
+        clip_names = replies.expect("/live/track/get/arrangement_clips/name")
+        clip_times = replies.expect("/live/track/get/arrangement_clips/start_time")
+        send_message("/live/track/get/arrangement_clips/name", [0])
+        send_message("/live/track/get/arrangement_clips/start_time", [0])
+        names, times = await asyncio.gather(clip_names.wait(timing.osc_timeout), clip_times.wait(timing.osc_timeout))
+        if names is None or times is None:
+            return STATUS_TIMEOUT, "sin respuesta"
+        return STATUS_DONE, f"{max(0, len(names) - 1)} clips"
+
+    async def _transport(self, stage: ScanStage):
+        """Metrónomo, tempo y estado de reproducción"""
+        pending = [
+            replies.expect("/live/song/get/metronome"),
+            replies.expect("/live/song/get/tempo"),
+            replies.expect(IS_PLAYING_REPLIES),
+        ]
+        send_message("/live/song/get/metronome", [])
+        send_message("/live/song/get/tempo", [])
+        send_message("/live/song/get/is_playing", [])
+        # Compás para la cuantización (sin esperar: no todas las versiones lo exponen)
+        send_message("/live/song/get/time_signature", [])
+        results = await asyncio.gather(*(p.wait(timing.osc_timeout) for p in pending))
+        missing = sum(1 for r in results if r is None)
+        if missing:
+            return STATUS_TIMEOUT, f"{missing}/{len(pending)} sin respuesta"
+        return STATUS_DONE, ""
+
+    async def _listeners_stage(self, stage: ScanStage):
+        """Listeners de posición y transporte (sin parámetros de track)"""
+        send_message("/live/song/start_listen/current_song_time", [])
+        send_message("/live/song/start_listen/is_playing", [])
+        return STATUS_DONE, ""
@@ -3,10 +3,13 @@
 # NO uso comercial sin autorización - mcolladorguez@gmail.com
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import threading
 from core.logger import log_info, log_error, log_warning, log_debug
 
+# Campos notificados que cambian la estructura del setlist (el resto es transporte/conexión)
+STRUCTURE_FIELDS = ("locators", "tracks", "reset")
+
 @dataclass
 class Locator:
     """Representa un locator de Ableton"""
@@ -70,6 +73,7 @@ class AppState:
         # Datos de Ableton
         self._locators: List[Locator] = []
         self._tracks: List[Track] = []
+        self._structure_version: int = 0  # Se incrementa con cada cambio de locators/tracks
         
         # Estado de reproducción
         self._current_index: int = -1
@@ -82,6 +86,9 @@ class AppState:
         self._time_signature_num: int = 4
         self._current_song_time: float = 0.0
         
+        # Conexión con Ableton (unknown / connected / degraded / lost)
+        self._connection_status: str = "unknown"
+        
         # Referencias UI (no requieren lock)
         self.page_ref = None
         
@@ -90,10 +97,42 @@ class AppState:
 
         # Señal para que la UI (Flet) sepa que debe refrescar
         self._needs_ui_refresh = False
+
+        # Observadores de cambios (autosave...): callback(field)
+        self._listeners: List[Callable[[str], None]] = []
         
         log_debug("AppState inicializado", module="Main")
 
             
+    # ===== OBSERVADORES =====
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """Registra un callback(field) que se llama tras cada cambio
+
+        Estructura: "locators", "tracks", "reset" (STRUCTURE_FIELDS). Transporte:
+        "current_index", "is_playing", "metronome_on", "current_tempo",
+        "current_beat", "time_signature_num", "connection_status" (solo si el
+        valor cambia; current_beat llega en cada beat, así que el callback no debe bloquear).
+        """
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self, field: str):
+        """Avisa a los observadores fuera del lock (no deben bloquear)"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(field)
+            except Exception as e:
+                log_error(f"Error en observador de estado ({field})", module="Main", exc=e)
+
     # ===== PROPERTIES CON GETTERS/SETTERS THREAD-SAFE =====
     
     @property
@@ -106,10 +145,18 @@ class AppState:
         with self._lock:
             old_count = len(self._locators)
             self._locators = value
+            self._structure_version += 1
             new_count = len(self._locators)
             
             if new_count != old_count:
                 log_debug(f"Locators actualizados: {old_count} → {new_count}", module="Main")
+        self._notify("locators")
+    
+    @property
+    def structure_version(self) -> int:
+        """Versión de la estructura: cambia cada vez que se reemplazan locators o tracks"""
+        with self._lock:
+            return self._structure_version
     
     @property
     def tracks(self) -> List[Track]:
@@ -121,6 +168,7 @@ class AppState:
         with self._lock:
             old_count = len(self._tracks)
             self._tracks = value.copy() if value else []
+            self._structure_version += 1
             new_count = len(self._tracks)
             
             # Ajustar current_index si es necesario
@@ -131,6 +179,7 @@ class AppState:
             
             if new_count != old_count:
                 log_debug(f"Tracks actualizados: {old_count} → {new_count}", module="Main")
+        self._notify("tracks")
     
     @property
     def current_index(self) -> int:
@@ -140,10 +189,12 @@ class AppState:
     @current_index.setter
     def current_index(self, value: int):
         with self._lock:
-            if value != self._current_index:
-                old_value = self._current_index
-                self._current_index = value
-                log_debug(f"current_index cambiado: {old_value} → {value}", module="Main")
+            if value == self._current_index:
+                return
+            old_value = self._current_index
+            self._current_index = value
+            log_debug(f"current_index cambiado: {old_value} → {value}", module="Main")
+        self._notify("current_index")
     
     @property
     def is_playing(self) -> bool:
@@ -153,9 +204,11 @@ class AppState:
     @is_playing.setter
     def is_playing(self, value: bool):
         with self._lock:
-            if value != self._is_playing:
-                self._is_playing = value
-                log_debug(f"is_playing: {value}", module="Main")
+            if value == self._is_playing:
+                return
+            self._is_playing = value
+            log_debug(f"is_playing: {value}", module="Main")
+        self._notify("is_playing")
     
     @property
     def metronome_on(self) -> bool:
@@ -165,9 +218,11 @@ class AppState:
     @metronome_on.setter
     def metronome_on(self, value: bool):
         with self._lock:
-            if value != self._metronome_on:
-                self._metronome_on = value
-                log_debug(f"metronome_on: {value}", module="Main")
+            if value == self._metronome_on:
+                return
+            self._metronome_on = value
+            log_debug(f"metronome_on: {value}", module="Main")
+        self._notify("metronome_on")
     
     @property
     def current_beat(self) -> int:
@@ -178,7 +233,10 @@ class AppState:
     def current_beat(self, value: int):
         with self._lock:
             # No loguear cada beat (demasiado verbose)
+            if value == self._current_beat:
+                return
             self._current_beat = value
+        self._notify("current_beat")
     
     @property
     def current_tempo(self) -> float:
@@ -191,7 +249,10 @@ class AppState:
             # Log solo si cambió significativamente
             if abs(value - self._current_tempo) > 0.5:
                 log_debug(f"current_tempo: {self._current_tempo:.1f} → {value:.1f}", module="Main")
+            if value == self._current_tempo:
+                return
             self._current_tempo = value
+        self._notify("current_tempo")
     
     @property
     def time_signature_num(self) -> int:
@@ -201,9 +262,11 @@ class AppState:
     @time_signature_num.setter
     def time_signature_num(self, value: int):
         with self._lock:
-            if value != self._time_signature_num:
-                log_debug(f"time_signature: {self._time_signature_num}/4 → {value}/4", module="Main")
+            if value == self._time_signature_num:
+                return
+            log_debug(f"time_signature: {self._time_signature_num}/4 → {value}/4", module="Main")
             self._time_signature_num = value
+        self._notify("time_signature_num")
     
     @property
     def current_song_time(self) -> float:
@@ -216,6 +279,20 @@ class AppState:
             # No loguear (demasiado frecuente)
             self._current_song_time = value
     
+    @property
+    def connection_status(self) -> str:
+        with self._lock:
+            return self._connection_status
+    
+    @connection_status.setter
+    def connection_status(self, value: str):
+        with self._lock:
+            if value == self._connection_status:
+                return
+            log_debug(f"connection_status: {self._connection_status} → {value}", module="Main")
+            self._connection_status = value
+        self._notify("connection_status")
+    
     @property
     def last_triggered_beat(self) -> Optional[int]:
         with self._lock:
@@ -267,11 +344,13 @@ class AppState:
             
             self._locators.clear()
             self._tracks.clear()
+            self._structure_version += 1
             self._current_index = -1
             self._last_triggered_beat = None
             self._is_playing = False
             
             log_info(f"🔄 Estado reiniciado (limpiados {old_locators} locators, {old_tracks} tracks)", module="Main")
+        self._notify("reset")
 
     # ===== CONTROL DE REFRESCO UI =====
 
@@ -299,6 +378,7 @@ class AppState:
                 f"  Current Index: {self._current_index}\n"
                 f"  Is Playing: {self._is_playing}\n"
                 f"  Metronome: {self._metronome_on}\n"
+                f"  Conexión: {self._connection_status}\n"
                 f"  Tempo: {self._current_tempo:.1f} BPM\n"
                 f"  Time Signature: {self._time_signature_num}/4\n"
                 f"  Current Beat: {self._current_beat}"
@@ -0,0 +1,359 @@
+# core/tracing.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Trazas de latencia de lanzamiento
+Sigue cada Play/Next/Prev desde el click (UI o web) hasta que Ableton confirma
+is_playing=1 en la posición esperada, con un ID de correlación por lanzamiento
+"""
+
+import itertools
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from core.constants import (
+    TRACE_ENABLED, TRACE_TIMEOUT, TRACE_HISTORY,
+    TRACE_POSITION_TOLERANCE, TRACE_CONFIRM_WINDOW, TRACE_BUCKETS_MS
+)
+from core.logger import log_info, log_error, log_warning, log_debug, get_logger
+
+# Mensajes salientes que marcan una etapa del lanzamiento
+SENT_STAGES = {
+    "/live/song/stop_playing": "stop_sent",
+    "/live/song/cue_point/jump": "jump_sent",
+    "/live/song/set/current_song_time": "jump_sent",
+    "/live/song/start_playing": "start_sent",
+}
+
+# Orden canónico de etapas (para informes)
+STAGES = ["queued", "dispatched", "scheduled", "stop_sent", "stopped", "jump_sent",
+          "positioned", "start_sent", "playing", "confirmed"]
+
+OUTCOME_CONFIRMED = "confirmed"
+OUTCOME_MISMATCH = "mismatch"
+OUTCOME_FAILED = "failed"
+OUTCOME_SUPERSEDED = "superseded"
+OUTCOME_TIMEOUT = "timeout"
+
+
+class LaunchTrace:
+    """Marcas temporales de un lanzamiento"""
+
+    __slots__ = ("trace_id", "source", "track_index", "expected_beat", "running",
+                 "started", "marks", "outcome", "offset_beats")
+
+    def __init__(self, trace_id: str, source: str, track_index: Optional[int] = None):
+        self.trace_id = trace_id
+        self.source = source
+        self.track_index = track_index
+        self.expected_beat: Optional[float] = None
+        self.running = False  # Lanzamiento cuantizado sin parar el transporte
+        self.started = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.outcome: Optional[str] = None
+        self.offset_beats: Optional[float] = None
+
+    def has(self, stage: str) -> bool:
+        return any(name == stage for name, _ in self.marks)
+
+    def mark(self, stage: str) -> bool:
+        """Registra la primera aparición de una etapa"""
+        if self.has(stage):
+            return False
+        self.marks.append((stage, time.perf_counter()))
+        return True
+
+    def stage_latencies(self) -> List[Tuple[str, float]]:
+        """Latencia de cada etapa respecto a la anterior (ms)"""
+        result = []
+        previous = self.started
+        for stage, t in self.marks:
+            result.append((stage, (t - previous) * 1000))
+            previous = t
+        return result
+
+    @property
+    def total_ms(self) -> float:
+        end = self.marks[-1][1] if self.marks else self.started
+        return (end - self.started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.trace_id,
+            "source": self.source,
+            "track": self.track_index,
+            "outcome": self.outcome,
+            "total_ms": round(self.total_ms, 2),
+            "offset_beats": round(self.offset_beats, 3) if self.offset_beats is not None else None,
+            "stages": [{"stage": s, "ms": round(ms, 2)} for s, ms in self.stage_latencies()],
+        }
+
+
+class LaunchTracer:
+    """Registro de trazas de lanzamiento - Thread-safe
+
+    Los mensajes entrantes de Ableton no llevan ID, así que se atribuyen al
+    lanzamiento activo (el último despachado al transporte).
+    """
+
+    def __init__(self, enabled: bool = TRACE_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._open: Dict[str, LaunchTrace] = {}
+        self._active: Optional[LaunchTrace] = None
+
+        self._recent = deque(maxlen=20)
+        self._stage_samples: Dict[str, deque] = {}
+        self._total_samples = deque(maxlen=TRACE_HISTORY)
+        self._histogram = [0] * (len(TRACE_BUCKETS_MS) + 1)
+        self._outcomes = Counter()
+        log_debug("LaunchTracer inicializado", module="Playback")
+
+    # ===== CICLO DE UNA TRAZA =====
+
+    def begin(self, source: str, track_index: Optional[int] = None) -> Optional[str]:
+        """Abre una traza en el punto de entrada (click UI / petición web)"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._expire_locked()
+            trace_id = f"{source}-{next(self._ids):04d}"
+            self._open[trace_id] = LaunchTrace(trace_id, source, track_index)
+        return trace_id
+
+    def mark(self, trace_id: Optional[str], stage: str):
+        """Marca una etapa de una traza concreta"""
+        if trace_id is None:
+            return
+        with self._lock:
+            trace = self._open.get(trace_id)
+            if trace is not None:
+                trace.mark(stage)
+
+    def dispatch(self, trace_id: Optional[str], track_index: int, expected_beat: float,
+                 running: bool = False):
+        """El controlador empieza a ejecutar el lanzamiento: pasa a ser la traza activa
+
+        `running` indica un salto cuantizado con el transporte en marcha: no hay
+        stop/start y se confirma con la primera posición tras el salto.
+        """
+        if trace_id is None:
+            return
+        with self._lock:
+            trace = self._open.get(trace_id)
+            if trace is None:
+                return
+            previous = self._active
+            if previous is not None and previous is not trace and previous.outcome is None:
+                self._finish_locked(previous, OUTCOME_SUPERSEDED)
+
+            trace.track_index = track_index
+            trace.expected_beat = float(expected_beat)
+            trace.running = running
+            trace.mark("dispatched")
+            self._active = trace
+
+    def on_sent(self, trace_id: Optional[str], address: str):
+        """Hook de send_message"""
+        if trace_id is None:
+            return
+        stage = SENT_STAGES.get(address)
+        if stage is not None:
+            self.mark(trace_id, stage)
+
+    def abandon(self, trace_id: Optional[str], outcome: str = OUTCOME_SUPERSEDED):
+        """Cierra una traza que no llegará a confirmarse (reemplazada o fallida)"""
+        if trace_id is None:
+            return
+        with self._lock:
+            trace = self._open.get(trace_id)
+            if trace is not None:
+                self._finish_locked(trace, outcome)
+
+    # ===== MENSAJES ENTRANTES =====
+
+    def on_playing_status(self, playing: bool):
+        """Hook de handle_playing_status"""
+        if self._active is None:
+            return
+        with self._lock:
+            trace = self._active
+            if trace is None:
+                return
+            if not playing and trace.has("stop_sent") and not trace.has("start_sent"):
+                trace.mark("stopped")
+            elif playing and trace.has("start_sent"):
+                trace.mark("playing")
+
+    def on_song_time(self, beat: float):
+        """Hook de handle_song_time (se llama a ~40 Hz: salida rápida sin traza activa)"""
+        if self._active is None:
+            return
+        with self._lock:
+            trace = self._active
+            if trace is None or trace.expected_beat is None:
+                return
+
+            offset = beat - trace.expected_beat
+            if trace.running:
+                # Hasta el límite de compás llegan posiciones antiguas: se ignoran
+                if trace.has("jump_sent") and -TRACE_POSITION_TOLERANCE <= offset <= TRACE_CONFIRM_WINDOW:
+                    trace.mark("confirmed")
+                    trace.offset_beats = offset
+                    self._finish_locked(trace, OUTCOME_CONFIRMED)
+                return
+
+            if not trace.has("start_sent"):
+                if trace.has("jump_sent") and abs(offset) <= TRACE_POSITION_TOLERANCE:
+                    trace.mark("positioned")
+                return
+
+            if not trace.has("playing"):
+                return
+
+            trace.mark("confirmed")
+            trace.offset_beats = offset
+            in_window = -TRACE_POSITION_TOLERANCE <= offset <= TRACE_CONFIRM_WINDOW
+            self._finish_locked(trace, OUTCOME_CONFIRMED if in_window else OUTCOME_MISMATCH)
+
+    # ===== REGISTRO =====
+
+    def _finish_locked(self, trace: LaunchTrace, outcome: str):
+        trace.outcome = outcome
+        self._open.pop(trace.trace_id, None)
+        if self._active is trace:
+            self._active = None
+
+        self._outcomes[outcome] += 1
+        self._recent.append(trace)
+
+        if outcome == OUTCOME_CONFIRMED:
+            for stage, ms in trace.stage_latencies():
+                samples = self._stage_samples.get(stage)
+                if samples is None:
+                    samples = self._stage_samples[stage] = deque(maxlen=TRACE_HISTORY)
+                samples.append(ms)
+
+            total = trace.total_ms
+            self._total_samples.append(total)
+            self._histogram[self._bucket(total)] += 1
+            log_debug(f"⏱ {trace.trace_id}: lanzamiento confirmado en {total:.1f} ms", module="Playback")
+        elif outcome == OUTCOME_MISMATCH:
+            log_warning(f"⏱ {trace.trace_id}: Ableton arrancó en beat {trace.expected_beat + trace.offset_beats:.2f} "
+                        f"(esperado {trace.expected_beat:.2f})", module="Playback")
+        else:
+            log_debug(f"⏱ {trace.trace_id}: {outcome}", module="Playback")
+
+    def _expire_locked(self):
+        """Descarta trazas abiertas demasiado tiempo"""
+        now = time.perf_counter()
+        for trace in [t for t in self._open.values() if now - t.started > TRACE_TIMEOUT]:
+            self._finish_locked(trace, OUTCOME_TIMEOUT)
+
+    @staticmethod
+    def _bucket(ms: float) -> int:
+        for i, limit in enumerate(TRACE_BUCKETS_MS):
+            if ms < limit:
+                return i
+        return len(TRACE_BUCKETS_MS)
+
+    @staticmethod
+    def _percentile(samples: List[float], pct: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[index], 2)
+
+    # ===== CONSULTA =====
+
+    def snapshot(self) -> dict:
+        """Resumen serializable (endpoint /latency e informe de sesión)"""
+        with self._lock:
+            self._expire_locked()
+            stages = {}
+            for stage in STAGES:
+                samples = list(self._stage_samples.get(stage, ()))
+                if samples:
+                    stages[stage] = {
+                        "n": len(samples),
+                        "p50_ms": self._percentile(samples, 50),
+                        "p95_ms": self._percentile(samples, 95),
+                        "max_ms": round(max(samples), 2),
+                    }
+
+            totals = list(self._total_samples)
+            labels = [f"<{limit}" for limit in TRACE_BUCKETS_MS] + [f">={TRACE_BUCKETS_MS[-1]}"]
+            return {
+                "outcomes": dict(self._outcomes),
+                "total": {
+                    "n": len(totals),
+                    "p50_ms": self._percentile(totals, 50),
+                    "p95_ms": self._percentile(totals, 95),
+                    "p99_ms": self._percentile(totals, 99),
+                },
+                "stages": stages,
+                "histogram": [{"bucket_ms": label, "count": count}
+                              for label, count in zip(labels, self._histogram)],
+                "recent": [trace.to_dict() for trace in reversed(self._recent)],
+            }
+
+    def format_report(self) -> str:
+        """Informe legible de la sesión"""
+        data = self.snapshot()
+        lines = [
+            "=" * 70,
+            "LiveCue - Latencia de lanzamiento (click → confirmación de Ableton)",
+            "=" * 70,
+            f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "Resultados: " + (", ".join(f"{k}={v}" for k, v in sorted(data["outcomes"].items())) or "sin lanzamientos"),
+            "",
+        ]
+
+        total = data["total"]
+        if total["n"]:
+            lines.append(f"Total: n={total['n']}  p50={total['p50_ms']} ms  "
+                         f"p95={total['p95_ms']} ms  p99={total['p99_ms']} ms")
+            lines.append("")
+            lines.append(f"{'Etapa':<12}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+            for stage, stats in data["stages"].items():
+                lines.append(f"{stage:<12}{stats['n']:>6}{stats['p50_ms']:>10}"
+                             f"{stats['p95_ms']:>10}{stats['max_ms']:>10}")
+            lines.append("")
+            lines.append("Histograma (total):")
+            peak = max(bucket["count"] for bucket in data["histogram"]) or 1
+            for bucket in data["histogram"]:
+                bar = "#" * int(round(40 * bucket["count"] / peak))
+                lines.append(f"  {bucket['bucket_ms']:>7} ms | {bar} {bucket['count']}")
+            lines.append("")
+
+        if data["recent"]:
+            lines.append("Últimos lanzamientos:")
+            for trace in data["recent"]:
+                stages = " ".join(f"{s['stage']}+{s['ms']:.1f}" for s in trace["stages"])
+                lines.append(f"  {trace['id']:<10} track={trace['track']} {trace['outcome']:<10} "
+                             f"{trace['total_ms']:>8.1f} ms  {stages}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: Optional[Path] = None) -> Optional[Path]:
+        """Guarda el informe en la carpeta de la sesión de logs"""
+        try:
+            if path is None:
+                path = get_logger().session_dir / "latency_report.txt"
+            path = Path(path)
+            path.write_text(self.format_report(), encoding="utf-8")
+            log_info(f"⏱ Informe de latencia guardado: {path}", module="Playback")
+            return path
+        except Exception as e:
+            log_error("Error guardando informe de latencia", module="Playback", exc=e)
+            return None
+
+# Instancia global
+tracer = LaunchTracer()
+log_info("✓ Instancia global de LaunchTracer creada", module="Playback")
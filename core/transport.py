@@ -0,0 +1,341 @@
+# core/transport.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Reloj de transporte y scheduler de comandos OSC
+El reloj predice la posición de Ableton entre mensajes current_song_time y el
+scheduler envía cada bundle para que el comando caiga en un beat exacto: justo a
+tiempo (AbletonOSC ignora los timetags) o con antelación y timetag si
+SCHED_USE_TIMETAGS está activo
+"""
+
+import math
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from osc.client import send_bundle
+from core.constants import (
+    CLOCK_SMOOTHING, CLOCK_RESYNC_BEATS, CLOCK_STALE_AFTER,
+    SCHED_LOOKAHEAD, SCHED_USE_TIMETAGS, SCHED_LATE_TOLERANCE, SCHED_TICK
+)
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+class TransportClock:
+    """Conversión beat ↔ tiempo de pared (time.time()) - Thread-safe
+
+    Cada muestra de current_song_time corrige la fase del reloj; un error grande
+    se interpreta como salto (locate, cue point) y reancla directamente.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._anchor_beat = 0.0
+        self._anchor_time: Optional[float] = None
+        self._tempo = 120.0
+        self._playing = False
+        self._last_sample: Optional[float] = None
+        self._resyncs = 0
+        self.link_latency = 0.0  # Latencia de ida estimada (la actualiza el monitor de conexión)
+        log_debug("TransportClock inicializado", module="Playback")
+
+    # ===== ENTRADAS (handlers OSC) =====
+
+    def on_song_time(self, beat: float, received: Optional[float] = None):
+        """Muestra de posición recibida de Ableton"""
+        sampled = (received if received is not None else time.time()) - self.link_latency
+        with self._lock:
+            self._last_sample = sampled
+            if not self._playing or self._anchor_time is None:
+                if abs(beat - self._anchor_beat) > CLOCK_RESYNC_BEATS:
+                    self._resyncs += 1
+                self._anchor_beat, self._anchor_time = beat, sampled
+                return
+
+            predicted = self._beat_at_locked(sampled)
+            error = beat - predicted
+            if abs(error) > CLOCK_RESYNC_BEATS:
+                self._resyncs += 1
+                self._anchor_beat = beat
+            else:
+                self._anchor_beat = predicted + CLOCK_SMOOTHING * error
+            self._anchor_time = sampled
+
+    def on_tempo(self, tempo: float):
+        """Cambio de tempo: reancla en la posición actual antes de cambiar la pendiente"""
+        if tempo <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            if self._anchor_time is not None:
+                self._anchor_beat = self._beat_at_locked(now)
+                self._anchor_time = now
+            self._tempo = float(tempo)
+
+    def on_playing(self, playing: bool):
+        """Arranque/parada del transporte"""
+        with self._lock:
+            if playing == self._playing:
+                return
+            now = time.time() - self.link_latency
+            if self._anchor_time is not None:
+                self._anchor_beat = self._beat_at_locked(now)
+            self._anchor_time = now
+            self._playing = playing
+
+    # ===== PREDICCIÓN =====
+
+    def _beat_at_locked(self, t: float) -> float:
+        if not self._playing or self._anchor_time is None:
+            return self._anchor_beat
+        return self._anchor_beat + (t - self._anchor_time) * self._tempo / 60.0
+
+    def beat_at(self, t: Optional[float] = None) -> float:
+        """Posición prevista (beats) en el instante `t` (por defecto ahora)"""
+        with self._lock:
+            return self._beat_at_locked(time.time() if t is None else t)
+
+    def time_at(self, beat: float) -> Optional[float]:
+        """Instante previsto en que el transporte alcanza `beat`, o None si no avanza"""
+        with self._lock:
+            if not self._is_running_locked():
+                return None
+            return self._anchor_time + (beat - self._anchor_beat) * 60.0 / self._tempo
+
+    def _is_running_locked(self) -> bool:
+        return (self._playing and self._anchor_time is not None and self._last_sample is not None
+                and time.time() - self._last_sample < CLOCK_STALE_AFTER)
+
+    @property
+    def is_running(self) -> bool:
+        """True si el transporte avanza y hay muestras recientes"""
+        with self._lock:
+            return self._is_running_locked()
+
+    @property
+    def tempo(self) -> float:
+        with self._lock:
+            return self._tempo
+
+    @property
+    def epoch(self) -> int:
+        """Contador de discontinuidades (saltos) de la línea de tiempo"""
+        with self._lock:
+            return self._resyncs
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._is_running_locked(),
+                "beat": round(self._beat_at_locked(time.time()), 3),
+                "tempo": self._tempo,
+                "link_latency_ms": round(self.link_latency * 1000, 2),
+                "resyncs": self._resyncs,
+            }
+
+
+QUANTIZE_IMMEDIATE = "immediate"
+QUANTIZE_BEAT = "beat"
+QUANTIZE_BAR = "bar"
+QUANTIZE_SECTION = "section"
+QUANTIZE_MODES = [QUANTIZE_IMMEDIATE, QUANTIZE_BEAT, QUANTIZE_BAR, QUANTIZE_SECTION]
+
+
+def next_boundary(beat: float, mode: str, beats_per_bar: int = 4,
+                  section_beats: Optional[List[float]] = None) -> Optional[float]:
+    """Primer límite de cuantización estrictamente posterior a `beat`
+
+    Los compases se cuentan desde el beat 0 del arrangement, como en Live.
+    En modo sección se usan `section_beats` (inicios de sección y fin del track);
+    sin ninguno posterior se cae al siguiente compás.
+    """
+    eps = 1e-6
+    if mode == QUANTIZE_BEAT:
+        return float(math.floor(beat + eps) + 1)
+    if mode == QUANTIZE_SECTION and section_beats:
+        later = [b for b in section_beats if b > beat + eps]
+        if later:
+            return float(min(later))
+        mode = QUANTIZE_BAR
+    if mode == QUANTIZE_BAR:
+        bar = max(1, int(beats_per_bar))
+        return float((math.floor((beat + eps) / bar) + 1) * bar)
+    return None
+
+
+class ScheduledCommand:
+    """Bundle OSC pendiente de enviar en un beat (o en un instante) concreto"""
+
+    def __init__(self, messages: List[Tuple[str, list]], beat: Optional[float] = None,
+                 at_time: Optional[float] = None, label: str = "",
+                 on_fired: Optional[Callable[["ScheduledCommand"], None]] = None,
+                 trace_id: Optional[str] = None):
+        self.messages = messages
+        self.beat = beat
+        self.at_time = at_time
+        self.label = label
+        self.on_fired = on_fired
+        self.trace_id = trace_id
+        self.target_time: Optional[float] = None
+        self.sent_at: Optional[float] = None
+        self.outcome: Optional[str] = None  # sent | cancelled | missed | stale
+        self.epoch: Optional[int] = None     # Línea de tiempo en la que se programó (solo por beat)
+        self.done = threading.Event()
+
+    @property
+    def pending(self) -> bool:
+        return not self.done.is_set()
+
+    def _close(self, outcome: str):
+        self.outcome = outcome
+        self.done.set()
+
+
+class TransportScheduler:
+    """Envía bundles anclados al reloj de transporte - Thread-safe
+
+    El instante objetivo se vuelve a predecir en cada vuelta, así que un cambio
+    de tempo o una corrección del reloj antes del envío se tienen en cuenta.
+    """
+
+    def __init__(self, clock: TransportClock):
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._pending: List[ScheduledCommand] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        log_debug("TransportScheduler inicializado", module="Playback")
+
+    # ===== API =====
+
+    def schedule(self, beat: float, messages: List[Tuple[str, list]], label: str = "",
+                 on_fired: Optional[Callable[[ScheduledCommand], None]] = None,
+                 trace_id: Optional[str] = None) -> ScheduledCommand:
+        """Programa `messages` para que Ableton los ejecute al llegar a `beat`"""
+        return self._add(ScheduledCommand(messages, beat=beat, label=label,
+                                          on_fired=on_fired, trace_id=trace_id))
+
+    def schedule_at(self, when: float, messages: List[Tuple[str, list]], label: str = "",
+                    on_fired: Optional[Callable[[ScheduledCommand], None]] = None) -> ScheduledCommand:
+        """Programa `messages` para un instante de pared (p.ej. con el transporte parado)"""
+        return self._add(ScheduledCommand(messages, at_time=when, label=label, on_fired=on_fired))
+
+    def cancel(self, command: Optional[ScheduledCommand]):
+        """Cancela un comando aún no enviado"""
+        if command is None:
+            return
+        with self._cond:
+            if command in self._pending:
+                self._pending.remove(command)
+                command._close("cancelled")
+                log_debug(f"⏲ Cancelado: {command.label}", module="Playback")
+
+    def stop(self):
+        """Detiene el scheduler y cancela lo pendiente"""
+        with self._cond:
+            self._stopped = True
+            for command in self._pending:
+                command._close("cancelled")
+            self._pending.clear()
+            self._cond.notify_all()
+
+    # ===== BUCLE =====
+
+    def _add(self, command: ScheduledCommand) -> ScheduledCommand:
+        if command.beat is not None:
+            command.epoch = self.clock.epoch
+        with self._cond:
+            self._pending.append(command)
+            self._ensure_thread()
+            self._cond.notify_all()
+        log_debug(f"⏲ Programado: {command.label} "
+                  f"({f'beat {command.beat:.2f}' if command.beat is not None else 'hora fija'})", module="Playback")
+        return command
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="TransportScheduler", daemon=True)
+            self._thread.start()
+
+    def earliest_beat(self) -> Optional[float]:
+        """Primer beat en el que un comando programado ahora puede caer a tiempo"""
+        if not self.clock.is_running:
+            return None
+        return self.clock.beat_at(time.time() + self._lead_time())
+
+    def _lead_time(self) -> float:
+        """Antelación del envío respecto al instante objetivo"""
+        if SCHED_USE_TIMETAGS:
+            return SCHED_LOOKAHEAD + self.clock.link_latency
+        return self.clock.link_latency
+
+    def _run(self):
+        while True:
+            due = []
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                wait = SCHED_TICK
+                epoch = self.clock.epoch
+                for command in list(self._pending):
+                    if command.epoch is not None and command.epoch != epoch:
+                        # La posición saltó: el beat programado ya no significa lo mismo
+                        self._pending.remove(command)
+                        command._close("stale")
+                        log_debug(f"⏲ Descartado tras un salto de posición: {command.label}", module="Playback")
+                        continue
+
+                    target = command.at_time if command.at_time is not None else self.clock.time_at(command.beat)
+                    if target is None:
+                        continue  # Transporte parado: esperar a que vuelva a avanzar
+                    command.target_time = target
+
+                    if target < now - SCHED_LATE_TOLERANCE:
+                        self._pending.remove(command)
+                        command._close("missed")
+                        log_warning(f"⏲ Comando perdido ({(now - target) * 1000:.0f} ms tarde): {command.label}", module="Playback")
+                        continue
+
+                    send_at = target - self._lead_time()
+                    if send_at <= now:
+                        self._pending.remove(command)
+                        due.append(command)
+                    else:
+                        wait = min(wait, send_at - now)
+
+                if not due:
+                    self._cond.wait(wait)
+                    continue
+
+            for command in due:
+                self._fire(command)
+
+    def _fire(self, command: ScheduledCommand):
+        try:
+            timetag = command.target_time if SCHED_USE_TIMETAGS else None
+            if not send_bundle(command.messages, timetag=timetag, trace_id=command.trace_id):
+                command._close("missed")
+                log_warning(f"⏲ Comando no enviado: {command.label}", module="Playback")
+                return
+            command.sent_at = time.time()
+            command._close("sent")
+            log_debug(f"⏲ Enviado {command.label} "
+                      f"({(command.target_time - command.sent_at) * 1000:.0f} ms antes del objetivo)", module="Playback")
+        except Exception as e:
+            command._close("missed")
+            log_error(f"Error enviando comando programado: {command.label}", module="Playback", exc=e)
+            return
+
+        if command.on_fired:
+            try:
+                command.on_fired(command)
+            except Exception as e:
+                log_error(f"Error en callback de {command.label}", module="Playback", exc=e)
+
+# Instancias globales
+clock = TransportClock()
+scheduler = TransportScheduler(clock)
+log_info("✓ Instancia global de TransportClock creada", module="Playback")
@@ -2,9 +2,13 @@
 # Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
 # NO uso comercial sin autorización - mcolladorguez@gmail.com
 
+import os
 import time
 import json
+import stat
+import tempfile
 import traceback
+from pathlib import Path
 
 def sanitize_filename(name: str) -> str:
     """Sanitiza un nombre para usar como filename (alfa-numérico, espacio, -, _)."""
@@ -16,6 +20,45 @@ def sanitize_filename(name: str) -> str:
 def pretty_json(data) -> str:
     return json.dumps(data, indent=2, ensure_ascii=False)
 
+def atomic_write(path, data, encoding: str = "utf-8"):
+    """Escribe `data` (str o bytes) de forma atómica: temporal + fsync + rename.
+
+    Tras un corte de luz el archivo es el anterior o el nuevo, nunca uno a medias.
+    Cada escritura usa su propio temporal: dos escritores simultáneos (autosave,
+    guardado explícito, catálogo) no se pisan; gana el último rename.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp = Path(tmp)
+    mode = "wb" if isinstance(data, (bytes, bytearray, memoryview)) else "w"
+    try:
+        with open(fd, mode, **({} if mode == "wb" else {"encoding": encoding})) as f:
+            # mkstemp crea el temporal con 0600: conservar los permisos del archivo actual
+            try:
+                os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+            except FileNotFoundError:
+                os.chmod(tmp, 0o644)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    # El rename es duradero solo cuando el directorio llega a disco (POSIX)
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
 def log_exc(prefix="ERROR"):
     import traceback
     traceback.print_exc()
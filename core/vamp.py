@@ -0,0 +1,196 @@
+# core/vamp.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Vamp de sección: mientras una sección está retenida, al llegar a su final se
+vuelve a su inicio. El salto se programa con antelación en el scheduler de
+transporte (bundle en el beat final), no al recibir current_song_time
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+from core.state import state, Track
+from core.transport import clock, scheduler, ScheduledCommand
+from osc.handlers import handlers
+from core.constants import VAMP_POLL, VAMP_SETTLE
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+def section_bounds(track: Track, section_index: int) -> Tuple[float, float]:
+    """Inicio y final (beats) de una sección: hasta la siguiente o hasta el END TRACK"""
+    start = track.sections[section_index].beat
+    if section_index + 1 < len(track.sections):
+        return start, track.sections[section_index + 1].beat
+    return start, track.end
+
+
+class SectionVamp:
+    """Retención de una sección con vueltas programadas - Thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._held: Optional[Tuple[int, int]] = None
+        self._bounds: Optional[Tuple[float, float]] = None
+        self._armed: Optional[ScheduledCommand] = None
+        self._hold_until = 0.0
+        self._loops = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        log_debug("SectionVamp inicializado", module="Playback")
+
+    # ===== API =====
+
+    @property
+    def held(self) -> Optional[Tuple[int, int]]:
+        """(track_index, section_index) retenida o None"""
+        with self._lock:
+            return self._held
+
+    def hold(self, track_index: int, section_index: int) -> bool:
+        """Retiene una sección: se repetirá cada vez que la reproducción llegue a su final"""
+        tracks = state.tracks
+        if not (0 <= track_index < len(tracks)):
+            log_error(f"Índice de track inválido: {track_index}", module="Playback")
+            return False
+        track = tracks[track_index]
+        if not (0 <= section_index < len(track.sections)):
+            log_error(f"Índice de sección inválido: {section_index}", module="Playback")
+            return False
+
+        start, end = section_bounds(track, section_index)
+        if end <= start:
+            log_warning(f"Sección '{track.sections[section_index].name}' sin duración", module="Playback")
+            return False
+
+        self._disarm()
+        with self._lock:
+            self._held = (track_index, section_index)
+            self._bounds = (start, end)
+            self._loops = 0
+        self._start()
+        log_info(f"🔁 Vamp: {track.sections[section_index].name} ({start:g} → {end:g})", module="Playback")
+        handlers._safe_ui_update('update_listbox')
+        return True
+
+    def hold_current(self) -> Optional[Tuple[int, int]]:
+        """Retiene la sección que está sonando"""
+        beat = clock.beat_at()
+        tracks = state.tracks
+        for track_index, track in enumerate(tracks):
+            if not track.contains_beat(beat):
+                continue
+            for section_index in range(len(track.sections)):
+                start, end = section_bounds(track, section_index)
+                if start <= beat < end:
+                    return (track_index, section_index) if self.hold(track_index, section_index) else None
+        log_warning("⊘ No hay sección sonando para retener", module="Playback")
+        return None
+
+    def release(self):
+        """Suelta la sección: la reproducción continúa más allá de su final"""
+        with self._lock:
+            held, self._held, self._bounds = self._held, None, None
+            loops = self._loops
+        self._disarm()
+        if held is not None:
+            log_info(f"🔁 Vamp liberado tras {loops} vuelta(s)", module="Playback")
+            handlers._safe_ui_update('update_listbox')
+
+    def toggle_current(self) -> Optional[Tuple[int, int]]:
+        """Retiene la sección actual o suelta la retenida (botón VAMP)"""
+        if self.held is not None:
+            self.release()
+            return None
+        return self.hold_current()
+
+    def on_manual_launch(self, track_index: int, section_index: Optional[int] = None):
+        """Un lanzamiento manual a otro track u otra sección suelta la retención"""
+        held = self.held
+        if held is None:
+            return
+        if held[0] != track_index or (section_index is not None and held[1] != section_index):
+            self.release()
+
+    def holds_boundary(self, beat: float) -> bool:
+        """True si el vamp ya gestiona el límite `beat` (evita choques con auto-advance)"""
+        with self._lock:
+            return self._bounds is not None and abs(self._bounds[1] - beat) < 1e-6
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "held": list(self._held) if self._held is not None else None,
+                "start": self._bounds[0] if self._bounds else None,
+                "end": self._bounds[1] if self._bounds else None,
+                "loops": self._loops,
+                "armed": self._armed is not None and self._armed.pending,
+            }
+
+    # ===== PROGRAMACIÓN =====
+
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="SectionVamp", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene la vigilancia (cierre de la app)"""
+        self._stop_event.set()
+        self._disarm()
+
+    def _loop(self):
+        while not self._stop_event.wait(VAMP_POLL):
+            try:
+                self._tick()
+            except Exception as e:
+                log_error("Error en vamp", module="Playback", exc=e)
+
+    def _tick(self):
+        with self._lock:
+            bounds = self._bounds
+            armed = self._armed
+
+        if bounds is None or not clock.is_running:
+            self._disarm()
+            return
+        if armed is not None and armed.pending:
+            return
+        if time.time() < self._hold_until:
+            return
+
+        start, end = bounds
+        beat = clock.beat_at()
+        if not (start <= beat < end):
+            return  # Fuera de la sección: se arma al entrar
+
+        command = scheduler.schedule(
+            end, [("/live/song/set/current_song_time", [start])],
+            label=f"vamp {start:g} ← {end:g}", on_fired=self._on_loop
+        )
+        with self._lock:
+            if self._bounds == bounds:
+                self._armed = command
+                return
+        scheduler.cancel(command)  # Liberado mientras se armaba
+
+    def _on_loop(self, command: ScheduledCommand):
+        self._hold_until = (command.target_time or time.time()) + VAMP_SETTLE
+        with self._lock:
+            self._loops += 1
+            loops = self._loops
+            if self._armed is command:
+                self._armed = None
+        log_debug(f"🔁 Vuelta {loops}", module="Playback")
+
+    def _disarm(self):
+        with self._lock:
+            armed, self._armed = self._armed, None
+        scheduler.cancel(armed)
+
+# Instancia global
+vamp = SectionVamp()
+log_info("✓ Instancia global de SectionVamp creada", module="Playback")
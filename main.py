@@ -40,6 +40,7 @@ import atexit
 # Variable global para el servidor
 osc_server = None
 server_thread = None
+web_server = None
 shutdown_complete = False
 
 # Inicializar logger al inicio
@@ -90,6 +91,16 @@ def shutdown_server():
     
     if osc_server:
         try:
+            from osc.health import monitor
+            monitor.stop()
+            
+            from core.autoadvance import autoadvance
+            from core.transport import scheduler
+            from core.vamp import vamp
+            autoadvance.stop()
+            vamp.stop()
+            scheduler.stop()
+            
             log_info("🔌 Cerrando servidor OSC...")
             osc_server.shutdown()
             shutdown_complete = True
@@ -100,8 +111,42 @@ def shutdown_server():
 def cleanup_and_exit():
     """Función de limpieza al cerrar la aplicación"""
     log_info("👋 Cerrando LiveCue...")
+    
+    # Servidor web: deja de aceptar y termina las peticiones en curso (antes de cerrar OSC)
+    try:
+        if web_server is not None:
+            web_server.stop()
+    except Exception as e:
+        log_warning(f"No se pudo detener el servidor web: {e}")
+    
     shutdown_server()
     
+    # Último autoguardado pendiente antes de salir
+    try:
+        from setlist.autosave import autosave
+        autosave.stop(flush=True)
+    except Exception as e:
+        log_warning(f"No se pudo completar el autoguardado: {e}")
+    
+    try:
+        from setlist.watcher import watcher
+        watcher.stop()
+    except Exception as e:
+        log_warning(f"No se pudo detener la vigilancia de setlists: {e}")
+    
+    try:
+        from core.playback import playback_async
+        playback_async.shutdown()
+    except Exception as e:
+        log_warning(f"No se pudo detener el loop de reproducción: {e}")
+    
+    # Informe de latencia de lanzamiento
+    try:
+        from core.tracing import tracer
+        tracer.write_report(logger.session_dir / "latency_report.txt")
+    except Exception as e:
+        log_warning(f"No se pudo guardar el informe de latencia: {e}")
+    
     # Crear resumen de sesión
     try:
         logger.create_session_summary()
@@ -202,7 +247,7 @@ def check_required_folders():
 
 def main():
     """Función principal de la aplicación"""
-    global osc_server, server_thread
+    global osc_server, server_thread, web_server
     
     # Banner de inicio
     log_info("=" * 80)
@@ -320,6 +365,26 @@ def main():
         
         log_info("✓ Servidor OSC activo y escuchando")
         log_debug(f"Thread OSC: {server_thread.name} (daemon={server_thread.daemon})")
+        
+        # ===== MONITOR DE CONEXIÓN =====
+        from osc.health import monitor
+        monitor.start()
+        
+        # ===== AUTO-ADVANCE =====
+        from core.autoadvance import autoadvance
+        autoadvance.start()
+
+        # ===== AUTOGUARDADO =====
+        from core.constants import AUTOSAVE_ENABLED
+        if AUTOSAVE_ENABLED:
+            from setlist.autosave import autosave
+            autosave.start()
+
+        # ===== VIGILANCIA DE SETLISTS =====
+        from core.constants import SETLIST_WATCH_ENABLED
+        if SETLIST_WATCH_ENABLED:
+            from setlist.watcher import watcher
+            watcher.start()
     
         # ===== INICIAR SERVIDOR WEB =====
         log_info("🌐 Iniciando servidor web Flask...")
@@ -5,8 +5,11 @@
 """Cliente OSC para enviar mensajes a Ableton Live"""
 
 from pythonosc import udp_client
-from core.constants import LIVE_IP, LIVE_SEND_PORT
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from pythonosc.osc_message_builder import OscMessageBuilder
+from core.constants import LIVE_IP, LIVE_SEND_PORT, CUE_POINTS_PAGE_SIZE
 from core.logger import log_info, log_error, log_debug
+from core.tracing import tracer
 
 # Crear cliente OSC
 try:
@@ -16,12 +19,17 @@ except Exception as e:
     log_error(f"Error creando cliente OSC", module="OSC", exc=e)
     raise
 
-def send_message(address, args=None):
-    """Envía un mensaje OSC a Ableton Live"""
+def send_message(address, args=None, trace_id=None):
+    """Envía un mensaje OSC a Ableton Live
+
+    `trace_id` correlaciona el envío con un lanzamiento trazado (core.tracing)
+    """
     if args is None:
         args = []
     
     try:
+        # Marcar antes de enviar: la respuesta puede llegar antes de que send() retorne
+        tracer.on_sent(trace_id, address)
         client.send_message(address, args)
         
         # Log solo mensajes importantes (no beats/time para evitar spam)
@@ -32,4 +40,51 @@ def send_message(address, args=None):
                 log_debug(f"→ {address}", module="OSC")
                 
     except Exception as e:
-        log_error(f"Error enviando OSC: {address}", module="OSC", exc=e)
\ No newline at end of file
+        log_error(f"Error enviando OSC: {address}", module="OSC", exc=e)
+
+def build_bundle(messages, timetag=None):
+    """Construye un bundle OSC con [(address, args), ...]
+
+    `timetag` en segundos desde epoch (time.time()); None = ejecución inmediata
+    """
+    builder = OscBundleBuilder(IMMEDIATELY if timetag is None else timetag)
+    for address, args in messages:
+        message = OscMessageBuilder(address=address)
+        for arg in args or []:
+            message.add_arg(arg)
+        builder.add_content(message.build())
+    return builder.build()
+
+def send_bundle(messages, timetag=None, trace_id=None) -> bool:
+    """Envía varios mensajes en un único datagrama (se ejecutan juntos en el receptor)
+
+    Devuelve False si el envío falló (el error ya queda registrado).
+    """
+    try:
+        bundle = build_bundle(messages, timetag)
+        for address, _ in messages:
+            tracer.on_sent(trace_id, address)
+        client.send(bundle)
+        log_debug(f"→ bundle [{', '.join(address for address, _ in messages)}]"
+                  + (f" @ {timetag:.3f}" if timetag is not None else ""), module="OSC")
+        return True
+    except Exception as e:
+        log_error("Error enviando bundle OSC", module="OSC", exc=e)
+        return False
+
+def send_prebuilt(bundle, trace_id=None):
+    """Envía un bundle ya codificado (build_bundle) sin volver a serializarlo"""
+    try:
+        for message in bundle:
+            tracer.on_sent(trace_id, message.address)
+        client.send(bundle)
+        log_debug(f"→ bundle pre-armado [{', '.join(message.address for message in bundle)}]", module="OSC")
+    except Exception as e:
+        log_error("Error enviando bundle pre-armado", module="OSC", exc=e)
+
+def request_cue_points_page(start: int, count: int = CUE_POINTS_PAGE_SIZE):
+    """Solicita un bloque de cue points [start, start + count)
+
+    Respuesta esperada en /live/song/get/cue_points/range: [start, total, name, beat, ...]
+    """
+    send_message("/live/song/get/cue_points/range", [int(start), int(count)])
@@ -3,10 +3,16 @@
 # NO uso comercial sin autorización - mcolladorguez@gmail.com
 
 from core.state import state, Locator, Track, Section
-from osc.client import send_message
+from osc.client import send_message, request_cue_points_page
+from core.constants import (
+    CUE_POINTS_PAGINATED, CUE_POINTS_PAGE_SIZE, CUE_POINTS_PAGE_RETRIES
+)
 from core.logger import log_info, log_error, log_warning, log_debug
+from core.tracing import tracer
+from core.transport import clock
+from core.calibration import timing
 import threading
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 class OSCHandlers:
     """Manejadores OSC con sincronización thread-safe"""
@@ -16,8 +22,191 @@ class OSCHandlers:
         self._lock = threading.RLock()  # Lock para sincronización
         self._processing_cue_points = False
         self._processing_clips = False
+        
+        # Ensamblado paginado de cue points
+        self._range_supported = CUE_POINTS_PAGINATED
+        self._cue_pages: Dict[int, tuple] = {}
+        self._cue_total: Optional[int] = None
+        self._cue_assembling = False
+        self._page_timer: Optional[threading.Timer] = None
+        self._page_retries = 0
+        self._deferred_clip_tracks = set()
+        self.cue_progress_callback: Optional[Callable[[int, int], None]] = None  # (recibidos, total) para el scan
         log_debug("OSCHandlers inicializado", module="OSC")
     
+    # ===== CUE POINTS =====
+    
+    def start_cue_points_fetch(self):
+        """Inicia la descarga de cue points (paginada si AbletonOSC la soporta)"""
+        # Cada fetch vuelve a intentar paginar: un bloque perdido solo degrada el anterior
+        with self._lock:
+            self._range_supported = CUE_POINTS_PAGINATED
+            self._page_retries = 0
+        if not self._range_supported:
+            log_debug("Solicitando cue points completos", module="OSC")
+            send_message("/live/song/get/cue_points", [])
+            return
+        
+        with self._lock:
+            self._cue_pages = {}
+            self._cue_total = None
+            self._cue_assembling = True
+        
+        log_debug(f"Solicitando cue points paginados ({CUE_POINTS_PAGE_SIZE} por bloque)", module="OSC")
+        self._request_page(0)
+    
+    def cancel_cue_points_fetch(self):
+        """Abandona la descarga paginada en curso (scan cancelado o abortado)"""
+        self._cancel_page_timer()
+        with self._lock:
+            if not self._cue_assembling:
+                return
+            self._cue_assembling = False
+        log_debug("Descarga de cue points cancelada", module="OSC")
+    
+    def _notify_cue_progress(self, received: int, total: int):
+        callback = self.cue_progress_callback
+        if callback:
+            try:
+                callback(received, total)
+            except Exception as e:
+                log_warning(f"Callback de progreso de cue points falló: {e}", module="OSC")
+    
+    def _request_page(self, start: int):
+        """Pide un bloque y arma el reintento por timeout"""
+        self._cancel_page_timer()
+        request_cue_points_page(start, CUE_POINTS_PAGE_SIZE)
+        
+        timer = threading.Timer(timing.osc_timeout, self._on_page_timeout, args=(start,))
+        timer.daemon = True
+        with self._lock:
+            self._page_timer = timer
+        timer.start()
+    
+    def _cancel_page_timer(self):
+        with self._lock:
+            if self._page_timer:
+                self._page_timer.cancel()
+                self._page_timer = None
+    
+    def _on_page_timeout(self, start: int):
+        """Bloque perdido: reintenta o vuelve al fetch completo"""
+        with self._lock:
+            if not self._cue_assembling:
+                return
+            self._page_retries += 1
+            retries = self._page_retries
+        
+        if retries <= CUE_POINTS_PAGE_RETRIES:
+            log_warning(f"Timeout en bloque de cue points @ {start}, reintentando ({retries}/{CUE_POINTS_PAGE_RETRIES})", module="OSC")
+            self._request_page(start)
+        else:
+            log_warning("Paginación sin respuesta, usando fetch completo de cue points", module="OSC")
+            self._fallback_to_full_fetch()
+    
+    def _fallback_to_full_fetch(self):
+        """Pide la lista completa para este fetch (el siguiente vuelve a paginar)"""
+        self._cancel_page_timer()
+        with self._lock:
+            self._range_supported = False
+            self._cue_assembling = False
+            self._page_retries = 0
+        send_message("/live/song/get/cue_points", [])
+    
+    @staticmethod
+    def _parse_locators(values, first_index: int = 0) -> List[Locator]:
+        """Convierte pares (name, beat) planos en Locators con su índice original"""
+        locators = []
+        for i in range(0, len(values) - 1, 2):
+            index = first_index + i // 2
+            try:
+                locators.append(Locator(
+                    id=index,
+                    original_id=index,
+                    name=values[i].strip(),
+                    beat=values[i + 1]
+                ))
+            except Exception as e:
+                log_error(f"Error procesando locator {index}", module="OSC", exc=e)
+        return locators
+    
+    @staticmethod
+    def _sort_locators(locators: List[Locator]) -> List[Locator]:
+        """Ordena por beat y reasigna IDs"""
+        locators.sort(key=lambda x: x.beat)
+        for i, loc in enumerate(locators):
+            loc.id = i
+        return locators
+    
+    def handle_cue_points_range(self, address, *args):
+        """Procesa un bloque paginado de cue points - Thread-safe
+        
+        Formato: [start, total, name, beat, name, beat, ...]
+        """
+        if len(args) < 2:
+            log_warning("handle_cue_points_range: datos insuficientes", module="OSC")
+            return
+        
+        try:
+            start, total = int(args[0]), int(args[1])
+        except (TypeError, ValueError) as e:
+            log_error(f"Cabecera de bloque inválida: {args[:2]}", module="OSC", exc=e)
+            return
+        
+        page = self._parse_locators(args[2:], first_index=start)
+        
+        with self._lock:
+            if not self._cue_assembling:
+                log_debug(f"Bloque @ {start} fuera de una descarga activa, ignorando", module="OSC")
+                return
+            
+            if self._cue_total is not None and total != self._cue_total:
+                log_warning(f"El set cambió durante la descarga ({self._cue_total} → {total}), reiniciando", module="OSC")
+                restart = True
+            else:
+                restart = False
+                self._cue_total = total
+                self._page_retries = 0
+                for loc in page:
+                    self._cue_pages[loc.original_id] = loc
+                received = len(self._cue_pages)
+                complete = received >= total or not page
+        
+        if restart:
+            self.start_cue_points_fetch()
+            return
+        
+        self._cancel_page_timer()
+        log_debug(f"📥 Bloque de cue points @ {start}: {len(page)} ({received}/{total})", module="OSC")
+        self._notify_cue_progress(received, total)
+        
+        if not complete:
+            # Pedir el siguiente bloque antes de procesar: solapa red y parseo
+            self._request_page(start + len(page))
+        
+        with self._lock:
+            # Copias nuevas: los IDs se reasignan en cada reconstrucción parcial
+            locators = self._sort_locators([
+                Locator(loc.id, loc.original_id, loc.name, loc.beat)
+                for loc in self._cue_pages.values()
+            ])
+            if complete:
+                self._cue_assembling = False
+            state.locators = locators
+            self._build_track_structure(locators, partial=not complete)
+            deferred = list(self._deferred_clip_tracks) if complete else []
+            if complete:
+                self._deferred_clip_tracks.clear()
+        
+        if complete:
+            log_info(f"📥 Cue points recibidos: {len(locators)} locators (paginado)", module="OSC")
+            for track_index in deferred:
+                self._try_assign_clips(track_index)
+        
+        # Mostrar las primeras canciones sin esperar al set completo
+        self._safe_ui_update('update_listbox')
+    
+    
     def handle_cue_points(self, address, *args):
         """Procesa cue points - Thread-safe"""
         with self._lock:
@@ -31,27 +220,14 @@ class OSCHandlers:
             log_info(f"📥 Cue points recibidos: {len(args)//2} locators", module="OSC")
             
             # Parsear locators
-            raw_locators = []
-            for i in range(0, len(args), 2):
-                try:
-                    raw_locators.append(Locator(
-                        id=i // 2,
-                        original_id=i // 2,
-                        name=args[i].strip(),
-                        beat=args[i + 1]
-                    ))
-                except Exception as e:
-                    log_error(f"Error procesando locator {i//2}", module="OSC", exc=e)
-                    continue
+            raw_locators = self._parse_locators(args)
             
             if not raw_locators:
                 log_warning("No se procesaron locators válidos", module="OSC")
                 return
             
             # Ordenar y reasignar IDs
-            raw_locators.sort(key=lambda x: x.beat)
-            for i, loc in enumerate(raw_locators):
-                loc.id = i
+            self._sort_locators(raw_locators)
             
             log_debug(f"Locators ordenados y reasignados: {len(raw_locators)}", module="OSC")
             
@@ -68,8 +244,11 @@ class OSCHandlers:
             with self._lock:
                 self._processing_cue_points = False
     
-    def _build_track_structure(self, locators: List[Locator]):
-        """Construye estructura de tracks - Debe llamarse con lock"""
+    def _build_track_structure(self, locators: List[Locator], partial: bool = False):
+        """Construye estructura de tracks - Debe llamarse con lock
+        
+        Con partial=True solo se publican los tracks ya cerrados con END TRACK
+        """
         log_debug("Construyendo estructura de tracks...", module="OSC")
         
         new_tracks = []
@@ -116,8 +295,8 @@ class OSCHandlers:
                 current_track.add_section(section)
                 log_debug(f"Sección agregada: '{section.name}' a '{current_track.title}'", module="OSC")
         
-        # Cerrar último track
-        if current_track:
+        # Cerrar último track (en una carga parcial aún puede llegar su END TRACK)
+        if current_track and not partial:
             last_beat = locators[-1].beat if locators else 0
             current_track.end = last_beat
             new_tracks.append(current_track)
@@ -125,10 +304,14 @@ class OSCHandlers:
         
         # Actualizar state de forma atómica
         state.tracks = new_tracks
-        log_info(f"✓ Estructura construida: {len(new_tracks)} tracks detectados", module="OSC")
+        if partial:
+            log_debug(f"Estructura parcial: {len(new_tracks)} tracks", module="OSC")
+        else:
+            log_info(f"✓ Estructura construida: {len(new_tracks)} tracks detectados", module="OSC")
         
-        # Ajustar current_index si es necesario
-        if state.current_index >= len(new_tracks):
+        # Ajustar current_index si es necesario (solo con la estructura completa:
+        # una página parcial aún no tiene todos los tracks)
+        if not partial and state.current_index >= len(new_tracks):
             old_index = state.current_index
             state.current_index = len(new_tracks) - 1 if new_tracks else -1
             log_debug(f"current_index ajustado: {old_index} → {state.current_index}", module="OSC")
@@ -146,6 +329,8 @@ class OSCHandlers:
         if not args:
             return
         
+        clock.on_song_time(float(args[0]))
+        tracer.on_song_time(float(args[0]))
         current_beat = int(args[0])
         
         with self._lock:
@@ -166,6 +351,8 @@ class OSCHandlers:
         """Maneja el estado de reproducción"""
         if args:
             new_status = bool(int(args[0]))
+            clock.on_playing(new_status)
+            tracer.on_playing_status(new_status)
             with self._lock:
                 old_status = state.is_playing
                 state.is_playing = new_status
@@ -178,6 +365,7 @@ class OSCHandlers:
         """Maneja cambios de tempo"""
         if args:
             new_tempo = float(args[0])
+            clock.on_tempo(new_tempo)
             with self._lock:
                 old_tempo = state.current_tempo
                 state.current_tempo = new_tempo
@@ -252,6 +440,12 @@ class OSCHandlers:
                 log_warning("Ya procesando clips, ignorando duplicado", module="OSC")
                 return
             
+            if self._cue_assembling:
+                # Los tracks aún se están reconstruyendo: asignar al completar
+                self._deferred_clip_tracks.add(track_index)
+                log_debug(f"Clips del track {track_index} en espera de cue points", module="OSC")
+                return
+            
             data = self._clip_data.get(track_index, {})
             names = data.get("names")
             times = data.get("times")
@@ -337,6 +531,11 @@ class OSCHandlers:
         if "/error" in address.lower():
             # Filtrar errores conocidos/esperados
             msg = str(args)
+            if "cue_points/range" in msg:
+                # AbletonOSC sin la extensión paginada
+                log_info("AbletonOSC no soporta cue points paginados, usando fetch completo", module="OSC")
+                self._fallback_to_full_fetch()
+                return
             if "get/beat" not in msg and "playing_status" not in msg:
                 log_error(f"OSC Error en {address}: {args}", module="OSC")
 
@@ -0,0 +1,219 @@
+# osc/health.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Monitor de conexión con Ableton Live / AbletonOSC
+Envía un getter barato como heartbeat, mide round-trip y publica el estado
+"""
+
+import threading
+import time
+from typing import Optional
+from osc.client import send_message
+from osc.handlers import handlers
+from core.state import state
+from core.transport import clock
+from core.calibration import timing
+from core.constants import (
+    HEALTH_PROBE_ADDRESS, HEALTH_MIN_INTERVAL, HEALTH_MAX_INTERVAL,
+    HEALTH_MIN_TIMEOUT, HEALTH_DEGRADED_RTT, HEALTH_LOST_AFTER
+)
+from core.logger import log_info, log_error, log_warning, log_debug
+
+STATUS_UNKNOWN = "unknown"
+STATUS_CONNECTED = "connected"
+STATUS_DEGRADED = "degraded"
+STATUS_LOST = "lost"
+
+# Listeners de alta frecuencia que se pausan sin conexión
+HIGH_RATE_LISTENERS = ["current_song_time"]
+
+
+class ConnectionMonitor:
+    """Heartbeat con intervalo y timeout adaptativos - Thread-safe"""
+
+    def __init__(self, probe_address: str = HEALTH_PROBE_ADDRESS):
+        self.probe_address = probe_address
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Estimación de RTT (estilo RFC 6298)
+        self._srtt: Optional[float] = None
+        self._rttvar: Optional[float] = None
+        self._last_rtt: Optional[float] = None
+
+        self._pending_since: Optional[float] = None
+        self._misses = 0
+        self._interval = HEALTH_MIN_INTERVAL
+        self._status = STATUS_UNKNOWN
+        self._listeners_paused = False
+        log_debug("ConnectionMonitor inicializado", module="OSC")
+
+    # ===== CICLO DE VIDA =====
+
+    def start(self):
+        """Arranca el heartbeat en background"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="HealthMonitor", daemon=True)
+        self._thread.start()
+        log_info(f"💓 Monitor de conexión activo (sonda: {self.probe_address})", module="OSC")
+
+    def stop(self):
+        """Detiene el heartbeat"""
+        self._stop_event.set()
+        log_debug("Monitor de conexión detenido", module="OSC")
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                log_error("Error en heartbeat", module="OSC", exc=e)
+
+            with self._lock:
+                # Con una sonda pendiente se despierta al vencer su timeout
+                wait = self.timeout if self._pending_since is not None else self._interval
+            self._stop_event.wait(wait)
+
+    def _tick(self):
+        now = time.monotonic()
+
+        with self._lock:
+            if self._pending_since is not None:
+                if now - self._pending_since < self.timeout:
+                    return
+                # Sonda perdida
+                self._pending_since = None
+                self._misses += 1
+                if self._misses < HEALTH_LOST_AFTER:
+                    # Degradada: sondear rápido para confirmar o descartar la caída
+                    self._interval = HEALTH_MIN_INTERVAL
+                else:
+                    # Perdida: backoff exponencial hasta el máximo
+                    self._interval = min(HEALTH_MAX_INTERVAL, self._interval * 2)
+                log_debug(f"Heartbeat sin respuesta ({self._misses} consecutivos)", module="OSC")
+                missed = True
+            else:
+                self._pending_since = now
+                missed = False
+
+        if missed:
+            self._evaluate()
+        else:
+            send_message(self.probe_address, [])
+
+    # ===== RESPUESTAS =====
+
+    def on_probe_reply(self, address, *args):
+        """Respuesta a la sonda - se registra como handler adicional en el dispatcher"""
+        now = time.monotonic()
+
+        with self._lock:
+            if self._pending_since is None:
+                # Sin sonda pendiente (respuesta tardía a una ya dada por perdida): no es un RTT válido
+                return
+            rtt = now - self._pending_since
+            self._pending_since = None
+            self._misses = 0
+            self._last_rtt = rtt
+
+            if self._srtt is None:
+                self._srtt = rtt
+                self._rttvar = rtt / 2
+            else:
+                self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - rtt)
+                self._srtt = 0.875 * self._srtt + 0.125 * rtt
+
+            # Latencia de ida para el reloj de transporte
+            clock.link_latency = self._srtt / 2
+
+            # Conexión sana: espaciar las sondas para no cargar Live
+            self._interval = min(HEALTH_MAX_INTERVAL, self._interval * 1.5)
+
+        self._evaluate()
+
+    # ===== ESTADO =====
+
+    @property
+    def timeout(self) -> float:
+        """Timeout adaptativo: SRTT + 4·RTTVAR acotado por el timeout OSC calibrado"""
+        if self._srtt is None:
+            return timing.osc_timeout
+        return max(HEALTH_MIN_TIMEOUT, min(timing.osc_timeout, self._srtt + 4 * self._rttvar))
+
+    @property
+    def status(self) -> str:
+        with self._lock:
+            return self._status
+
+    def snapshot(self) -> dict:
+        """Resumen serializable para UI y web"""
+        with self._lock:
+            return {
+                "status": self._status,
+                "rtt_ms": round(self._last_rtt * 1000, 2) if self._last_rtt is not None else None,
+                "srtt_ms": round(self._srtt * 1000, 2) if self._srtt is not None else None,
+                "timeout_ms": round(self.timeout * 1000, 1),
+                "misses": self._misses,
+                "interval_s": round(self._interval, 2),
+            }
+
+    def _evaluate(self):
+        """Recalcula el estado y publica los cambios"""
+        with self._lock:
+            if self._misses >= HEALTH_LOST_AFTER:
+                new_status = STATUS_LOST
+            elif self._misses > 0 or (self._srtt is not None and self._srtt > HEALTH_DEGRADED_RTT):
+                new_status = STATUS_DEGRADED
+            elif self._srtt is not None:
+                new_status = STATUS_CONNECTED
+            else:
+                new_status = self._status
+
+            old_status = self._status
+            if new_status == old_status:
+                return
+            self._status = new_status
+
+        if new_status == STATUS_LOST:
+            log_warning("🔌 Conexión con Ableton perdida", module="OSC")
+        elif new_status == STATUS_DEGRADED:
+            health = self.snapshot()
+            log_warning(f"⚠️  Conexión con Ableton degradada (RTT {health['srtt_ms']} ms, {health['misses']} sondas perdidas)", module="OSC")
+        else:
+            log_info(f"🔗 Conexión con Ableton: {new_status}", module="OSC")
+
+        state.connection_status = new_status
+
+        if new_status == STATUS_LOST:
+            self._pause_listeners()
+        elif old_status == STATUS_LOST:
+            self._resume_listeners()
+
+        handlers._safe_ui_update('update_connection_status')
+
+    def _pause_listeners(self):
+        """Detiene listeners de alta frecuencia mientras Live no responde"""
+        if self._listeners_paused:
+            return
+        self._listeners_paused = True
+        for prop in HIGH_RATE_LISTENERS:
+            send_message(f"/live/song/stop_listen/{prop}", [])
+        log_info("⏸ Listeners de alta frecuencia en pausa", module="OSC")
+
+    def _resume_listeners(self):
+        """Rearma listeners y refresca el estado tras reconectar (Live puede haberse reiniciado)"""
+        self._listeners_paused = False
+        for prop in HIGH_RATE_LISTENERS + ["is_playing"]:
+            send_message(f"/live/song/start_listen/{prop}", [])
+        send_message("/live/song/get/is_playing", [])
+        send_message("/live/song/get/metronome", [])
+        log_info("▶ Listeners reanudados", module="OSC")
+
+# Instancia global
+monitor = ConnectionMonitor()
+log_info("✓ Instancia global de ConnectionMonitor creada", module="OSC")
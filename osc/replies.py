@@ -0,0 +1,99 @@
+# osc/replies.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Espera asíncrona de respuestas OSC
+Permite hacer `await` sobre la respuesta de Ableton en lugar de dormir un tiempo fijo
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple, Union
+from core.logger import log_info, log_debug
+
+
+class PendingReply:
+    """Respuesta esperada para una o varias direcciones OSC"""
+
+    def __init__(self, addresses: Tuple[str, ...], predicate: Optional[Callable],
+                 loop: asyncio.AbstractEventLoop):
+        self.addresses = addresses
+        self.predicate = predicate
+        self.loop = loop
+        self.future = loop.create_future()
+        self.received_at: Optional[float] = None  # time.perf_counter() al llegar al servidor OSC
+
+    def matches(self, address: str, args: tuple) -> bool:
+        if address not in self.addresses:
+            return False
+        if self.predicate is None:
+            return True
+        try:
+            return bool(self.predicate(args))
+        except Exception:
+            return False
+
+    async def wait(self, timeout: float) -> Optional[tuple]:
+        """Devuelve los argumentos de la respuesta o None si vence el timeout"""
+        try:
+            return await asyncio.wait_for(self.future, timeout)
+        except asyncio.TimeoutError:
+            log_debug(f"Sin respuesta en {timeout:.2f}s para {', '.join(self.addresses)}", module="OSC")
+            return None
+        finally:
+            replies.discard(self)
+
+
+class ReplyWaiter:
+    """Registro de respuestas pendientes - Thread-safe
+
+    `notify` se registra en el dispatcher como handler adicional de cada ruta,
+    de modo que se ejecuta en el thread del servidor OSC tras el handler normal.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def expect(self, addresses: Union[str, Iterable[str]],
+               predicate: Optional[Callable] = None) -> PendingReply:
+        """Registra la espera ANTES de enviar la petición (evita carreras)
+
+        Debe llamarse desde una corrutina en ejecución.
+        """
+        if isinstance(addresses, str):
+            addresses = (addresses,)
+        pending = PendingReply(tuple(addresses), predicate, asyncio.get_running_loop())
+        with self._lock:
+            self._pending.append(pending)
+        return pending
+
+    def discard(self, pending: PendingReply):
+        with self._lock:
+            if pending in self._pending:
+                self._pending.remove(pending)
+
+    def notify(self, address, *args):
+        """Resuelve las esperas que coinciden con el mensaje entrante"""
+        with self._lock:
+            if not self._pending:
+                return
+            received_at = time.perf_counter()
+            matched = [p for p in self._pending if p.matches(address, args)]
+            for pending in matched:
+                self._pending.remove(pending)
+                pending.received_at = received_at
+
+        for pending in matched:
+            pending.loop.call_soon_threadsafe(self._resolve, pending.future, args)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, args: tuple):
+        if not future.done():
+            future.set_result(args)
+
+# Instancia global
+replies = ReplyWaiter()
+log_info("✓ Instancia global de ReplyWaiter creada", module="OSC")
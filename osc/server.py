@@ -9,8 +9,10 @@ Escucha mensajes OSC en CLIENT_LISTEN_PORT y los enruta a los handlers correspon
 
 from pythonosc.dispatcher import Dispatcher
 from pythonosc.osc_server import ThreadingOSCUDPServer
-from core.constants import CLIENT_LISTEN_PORT
+from core.constants import CLIENT_LISTEN_PORT, CALIBRATION_PROBE_ADDRESS
 from osc.handlers import handlers
+from osc.health import monitor
+from osc.replies import replies
 from core.logger import log_info, log_error, log_warning, log_debug
 
 def create_server():
@@ -21,6 +23,7 @@ def create_server():
     # Mapeo de rutas a handlers
     routes = {
         "/live/song/get/cue_points": handlers.handle_cue_points,
+        "/live/song/get/cue_points/range": handlers.handle_cue_points_range,
         "/live/song/get/metronome": handlers.handle_metronome,
         "/live/song/get/beat": handlers.handle_song_time,
         "/live/song/get/current_song_time": handlers.handle_song_time,
@@ -35,11 +38,20 @@ def create_server():
     
     log_debug(f"Registrando {len(routes)} rutas OSC...", module="OSC")
     
-    # Registrar rutas
+    # Registrar rutas (el ReplyWaiter se ejecuta después del handler, con el estado ya actualizado)
     for route, handler in routes.items():
         dispatcher.map(route, handler)
+        dispatcher.map(route, replies.notify)
         log_debug(f"✓ Ruta mapeada: {route}", module="OSC")
     
+    # Heartbeat: getter que nadie más pide, así cualquier respuesta es de una sonda del monitor
+    dispatcher.map(monitor.probe_address, monitor.on_probe_reply)
+    dispatcher.map(monitor.probe_address, replies.notify)
+    
+    # Calibración: sonda propia, solo se espera con el registro de respuestas
+    dispatcher.map(CALIBRATION_PROBE_ADDRESS, replies.notify)
+    log_debug(f"✓ Sonda de conexión mapeada: {monitor.probe_address}", module="OSC")
+    
     # Handler por defecto para errores y mensajes no mapeados
     dispatcher.set_default_handler(handlers.handle_error)
     log_debug("✓ Handler por defecto configurado", module="OSC")
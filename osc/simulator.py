@@ -0,0 +1,306 @@
+# osc/simulator.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Simulador mínimo de AbletonOSC para desarrollo sin Ableton Live
+Escucha en LIVE_SEND_PORT y responde a LiveCue en CLIENT_LISTEN_PORT
+
+Uso:
+    python -m osc.simulator --tracks 200 --tempo 124
+"""
+
+import argparse
+import threading
+import time
+from collections import deque
+from typing import List, Tuple
+
+from pythonosc import udp_client
+from pythonosc.dispatcher import Dispatcher
+from pythonosc.osc_server import ThreadingOSCUDPServer
+from core.constants import LIVE_IP, LIVE_SEND_PORT, CLIENT_LISTEN_PORT
+from core.logger import log_info, log_error, log_warning, log_debug
+
+DEMO_SECTIONS = ["Intro", "Verse", "Pre Chorus", "Chorus", "Bridge", "Outro"]
+LISTENABLE_PROPERTIES = ["current_song_time", "is_playing", "tempo", "metronome"]
+
+
+def build_demo_set(n_tracks: int = 12, beats_per_section: int = 16,
+                   name_padding: int = 0) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """Genera cue points y clips de ejemplo con la convención START/END TRACK"""
+    cue_points = []
+    clips = []
+    beat = 0.0
+
+    for n in range(1, n_tracks + 1):
+        title = f"Song {n:03d}" + (" " + "x" * name_padding if name_padding else "")
+        cue_points.append((f'START TRACK "{title}"', beat))
+
+        for section in DEMO_SECTIONS:
+            cue_points.append((section.upper(), beat))
+            clips.append((f"{section} {n}", beat))
+            beat += beats_per_section
+
+        cue_points.append(("END TRACK", beat))
+        beat += 4  # Silencio entre canciones
+
+    return cue_points, clips
+
+
+class AbletonSimulator:
+    """Simula el subconjunto de AbletonOSC que usa LiveCue"""
+
+    def __init__(self, cue_points=None, clips=None, tempo: float = 120.0,
+                 listen_port: int = LIVE_SEND_PORT, reply_ip: str = LIVE_IP,
+                 reply_port: int = CLIENT_LISTEN_PORT, time_signature_num: int = 4):
+        if cue_points is None or clips is None:
+            demo_cues, demo_clips = build_demo_set()
+            cue_points = demo_cues if cue_points is None else cue_points
+            clips = demo_clips if clips is None else clips
+
+        self._lock = threading.RLock()
+        self.cue_points = list(cue_points)
+        self.clips = list(clips)
+        self.tempo = tempo
+        self.time_signature_num = time_signature_num
+        self.metronome = False
+
+        # Reloj de transporte
+        self._is_playing = False
+        self._origin_beat = 0.0
+        self._origin_wall = time.time()
+
+        # Error de aterrizaje de saltos en marcha respecto a la rejilla de beats (ms)
+        self._jump_errors = deque(maxlen=1000)
+
+        # Listeners activos
+        self._listeners = set()
+        self._stop_event = threading.Event()
+
+        self.listen_port = listen_port
+        self.client = udp_client.SimpleUDPClient(reply_ip, reply_port)
+        self.server = ThreadingOSCUDPServer(("0.0.0.0", listen_port), self._create_dispatcher())
+        log_debug(f"AbletonSimulator inicializado ({len(self.cue_points)} cue points)", module="OSC")
+
+    # ===== TRANSPORTE =====
+
+    def song_time(self) -> float:
+        """Posición actual en beats"""
+        with self._lock:
+            if not self._is_playing:
+                return self._origin_beat
+            return self._origin_beat + (time.time() - self._origin_wall) * self.tempo / 60.0
+
+    def _set_song_time(self, beat: float):
+        with self._lock:
+            self._origin_beat = max(0.0, float(beat))
+            self._origin_wall = time.time()
+
+    def _record_jump(self):
+        """Mide a qué distancia del beat más cercano se ejecuta un salto en marcha"""
+        with self._lock:
+            if not self._is_playing:
+                return
+            beat = self.song_time()
+            error_ms = (beat - round(beat)) * 60000.0 / self.tempo
+        self._jump_errors.append(error_ms)
+
+    def jump_stats(self) -> dict:
+        """Jitter de los saltos ejecutados con el transporte en marcha"""
+        errors = list(self._jump_errors)
+        if not errors:
+            return {"n": 0}
+        ordered = sorted(abs(e) for e in errors)
+        return {
+            "n": len(errors),
+            "mean_ms": round(sum(errors) / len(errors), 3),
+            "p50_abs_ms": round(ordered[len(ordered) // 2], 3),
+            "p95_abs_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+            "max_abs_ms": round(ordered[-1], 3),
+        }
+
+    def _set_playing(self, playing: bool):
+        with self._lock:
+            if playing == self._is_playing:
+                return
+            self._origin_beat = self.song_time()
+            self._origin_wall = time.time()
+            self._is_playing = playing
+
+        if "is_playing" in self._listeners:
+            self._reply("/live/song/get/is_playing", [1 if playing else 0])
+
+    # ===== DISPATCHER =====
+
+    def _create_dispatcher(self) -> Dispatcher:
+        dispatcher = Dispatcher()
+        routes = {
+            "/live/song/get/cue_points": self._on_get_cue_points,
+            "/live/song/get/cue_points/range": self._on_get_cue_points_range,
+            "/live/song/cue_point/jump": self._on_cue_point_jump,
+            "/live/song/get/metronome": self._on_get_metronome,
+            "/live/song/set/metronome": self._on_set_metronome,
+            "/live/song/get/tempo": self._on_get_tempo,
+            "/live/application/get/version": self._on_get_version,
+            "/live/song/get/song_length": self._on_get_song_length,
+            "/live/song/get/time_signature": self._on_get_time_signature,
+            "/live/song/get/is_playing": self._on_get_is_playing,
+            "/live/song/get/current_song_time": self._on_get_song_time,
+            "/live/song/set/current_song_time": self._on_set_song_time,
+            "/live/song/start_playing": lambda address, *args: self._set_playing(True),
+            "/live/song/continue_playing": lambda address, *args: self._set_playing(True),
+            "/live/song/stop_playing": lambda address, *args: self._set_playing(False),
+            "/live/track/get/arrangement_clips/name": self._on_get_clip_names,
+            "/live/track/get/arrangement_clips/start_time": self._on_get_clip_times,
+        }
+        for route, handler in routes.items():
+            dispatcher.map(route, handler)
+
+        for prop in LISTENABLE_PROPERTIES:
+            dispatcher.map(f"/live/song/start_listen/{prop}", self._on_start_listen)
+            dispatcher.map(f"/live/song/stop_listen/{prop}", self._on_stop_listen)
+
+        dispatcher.set_default_handler(self._on_unknown)
+        return dispatcher
+
+    def _reply(self, address: str, args: list):
+        try:
+            self.client.send_message(address, args)
+        except Exception as e:
+            log_error(f"Simulador: error respondiendo {address}", module="OSC", exc=e)
+
+    def _on_get_cue_points(self, address, *args):
+        with self._lock:
+            flat = [value for name, beat in self.cue_points for value in (name, float(beat))]
+        self._reply(address, flat)
+
+    def _on_get_cue_points_range(self, address, *args):
+        """Extensión paginada: [start, count] → [start, total, name, beat, ...]"""
+        start = int(args[0]) if len(args) > 0 else 0
+        count = int(args[1]) if len(args) > 1 else 32
+        with self._lock:
+            total = len(self.cue_points)
+            page = self.cue_points[start:start + max(0, count)]
+        flat = [value for name, beat in page for value in (name, float(beat))]
+        self._reply(address, [start, total] + flat)
+
+    def _on_cue_point_jump(self, address, *args):
+        if not args:
+            return
+        index = int(args[0])
+        with self._lock:
+            if 0 <= index < len(self.cue_points):
+                self._record_jump()
+                self._set_song_time(self.cue_points[index][1])
+            else:
+                self._reply("/live/error", [f"Cue point fuera de rango: {index}"])
+
+    def _on_get_metronome(self, address, *args):
+        self._reply(address, [1 if self.metronome else 0])
+
+    def _on_set_metronome(self, address, *args):
+        if args:
+            self.metronome = bool(int(args[0]))
+
+    def _on_get_tempo(self, address, *args):
+        self._reply(address, [float(self.tempo)])
+
+    def _on_get_version(self, address, *args):
+        self._reply(address, [12, 0])
+
+    def _on_get_song_length(self, address, *args):
+        with self._lock:
+            length = max((float(beat) for _, beat in self.cue_points), default=0.0)
+        self._reply(address, [length])
+
+    def _on_get_time_signature(self, address, *args):
+        self._reply(address, [self.time_signature_num])
+
+    def _on_get_is_playing(self, address, *args):
+        self._reply(address, [1 if self._is_playing else 0])
+
+    def _on_get_song_time(self, address, *args):
+        self._reply(address, [self.song_time()])
+
+    def _on_set_song_time(self, address, *args):
+        if args:
+            self._record_jump()
+            self._set_song_time(float(args[0]))
+
+    def _on_get_clip_names(self, address, *args):
+        track_index = int(args[0]) if args else 0
+        with self._lock:
+            names = [name for name, _ in self.clips]
+        self._reply(address, [track_index] + names)
+
+    def _on_get_clip_times(self, address, *args):
+        track_index = int(args[0]) if args else 0
+        with self._lock:
+            times = [float(beat) for _, beat in self.clips]
+        self._reply(address, [track_index] + times)
+
+    def _on_start_listen(self, address, *args):
+        prop = address.rsplit("/", 1)[-1]
+        self._listeners.add(prop)
+        log_debug(f"Simulador: listener activo '{prop}'", module="OSC")
+
+    def _on_stop_listen(self, address, *args):
+        self._listeners.discard(address.rsplit("/", 1)[-1])
+
+    def _on_unknown(self, address, *args):
+        log_debug(f"Simulador: dirección desconocida {address}", module="OSC")
+        self._reply("/live/error", [f"Unknown OSC address: {address}"])
+
+    # ===== CICLO DE VIDA =====
+
+    def _listener_loop(self, interval: float = 0.025):
+        """Emite current_song_time mientras hay listener y se reproduce"""
+        while not self._stop_event.wait(interval):
+            if "current_song_time" in self._listeners and self._is_playing:
+                self._reply("/live/song/get/current_song_time", [self.song_time()])
+
+    def start(self):
+        """Arranca servidor y listeners en background"""
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._listener_loop, daemon=True).start()
+        log_info(f"🎛️  Simulador AbletonOSC escuchando en puerto {self.listen_port}", module="OSC")
+
+    def stop(self):
+        """Detiene el simulador"""
+        self._stop_event.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+        stats = self.jump_stats()
+        if stats["n"]:
+            log_info(f"🎯 Saltos en marcha: n={stats['n']}, error medio {stats['mean_ms']} ms, "
+                     f"p95 |error| {stats['p95_abs_ms']} ms, máx {stats['max_abs_ms']} ms", module="OSC")
+        log_info("🎛️  Simulador AbletonOSC detenido", module="OSC")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador AbletonOSC para LiveCue")
+    parser.add_argument("--tracks", type=int, default=12, help="Número de canciones del set")
+    parser.add_argument("--tempo", type=float, default=120.0, help="Tempo en BPM")
+    parser.add_argument("--time-signature", type=int, default=4, help="Beats por compás")
+    parser.add_argument("--name-padding", type=int, default=0,
+                        help="Alarga los títulos para probar datagramas grandes")
+    args = parser.parse_args()
+
+    cue_points, clips = build_demo_set(args.tracks, name_padding=args.name_padding)
+    simulator = AbletonSimulator(cue_points, clips, tempo=args.tempo,
+                                 time_signature_num=args.time_signature)
+    simulator.start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        log_warning("Simulador interrumpido (Ctrl+C)", module="OSC")
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,664 @@
+# osc/web_backend.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Backends HTTP del controlador web
+WebControllerServer solo construye la app Flask; quién la sirve se elige con
+WEB_SERVER_BACKEND:
+
+    threaded   HTTP/1.1 keep-alive sobre wsgiref: pool de workers acotado,
+               pocas peticiones ejecutándose a la vez, 503 temprano al
+               saturarse y apagado ordenado
+    werkzeug   servidor de desarrollo de Flask tal cual (un thread nuevo y una
+               conexión TCP por petición, sin límite): solo para depurar o comparar
+
+En el backend threaded una conexión solo ocupa worker mientras hay una
+petición en curso: entre peticiones la vigila un selector y se cierra tras
+WEB_SERVER_KEEPALIVE_TIMEOUT segundos inactiva. De los WEB_SERVER_THREADS
+workers, solo WEB_SERVER_ACTIVE_REQUESTS ejecutan la app a la vez: cada
+thread Python en marcha compite por el GIL con el loop de reproducción y el
+servidor OSC. Una petición que no consigue turno en WEB_SERVER_ADMISSION_TIMEOUT
+recibe 503 en lugar de quedarse esperando detrás de una vista lenta.
+
+Los streams (/events, /ws y el long-poll de /setlists) no entran en el pool:
+cada uno tiene su thread, hasta WEB_SERVER_STREAMS.
+"""
+
+import io
+import selectors
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+from werkzeug.serving import make_server
+from wsgiref.simple_server import WSGIRequestHandler, ServerHandler
+from core.constants import (
+    WEB_SERVER_THREADS, WEB_SERVER_BACKLOG, WEB_SERVER_ACTIVE_REQUESTS, WEB_SERVER_ADMISSION_TIMEOUT,
+    WEB_SERVER_KEEPALIVE_TIMEOUT, WEB_SERVER_MAX_CONNECTIONS, WEB_SERVER_STREAMS, WEB_SERVER_SHUTDOWN_TIMEOUT,
+    WEB_EVENTS_MAX_CLIENTS, WEB_SOCKET_MAX_CLIENTS
+)
+from core.logger import log_info, log_error, log_warning, log_debug
+
+# Respuesta fija cuando no queda sitio para la conexión
+REJECT_RESPONSE = (b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: text/plain\r\n"
+                   b"Content-Length: 12\r\nRetry-After: 1\r\nConnection: close\r\n\r\nServer busy\n")
+
+# Cuerpo sin leer que se descarta para reutilizar la conexión (más grande: se cierra)
+MAX_DRAIN_BYTES = 64 * 1024
+
+# Estados de una conexión del backend threaded
+IDLE, QUEUED, BUSY, STREAM = "idle", "queued", "busy", "stream"
+
+
+class ServerBackend:
+    """Sirve una app WSGI en segundo plano; start() falla en el llamante si el puerto está ocupado"""
+
+    name = ""
+
+    def __init__(self, app, host: str, port: int):
+        self.app = app
+        self.host = host
+        self.port = port
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self, timeout: float = WEB_SERVER_SHUTDOWN_TIMEOUT):
+        raise NotImplementedError
+
+    def snapshot(self) -> dict:
+        return {"backend": self.name, "port": self.port}
+
+
+def is_stream(environ) -> bool:
+    """Por defecto son streams las subidas a WebSocket y las peticiones SSE"""
+    return (environ.get("HTTP_UPGRADE", "").lower() == "websocket"
+            or "text/event-stream" in environ.get("HTTP_ACCEPT", ""))
+
+
+def _busy(environ, start_response):
+    """App WSGI de la respuesta 503 cuando una petición no consigue turno"""
+    start_response("503 Service Unavailable", [("Content-Type", "text/plain"), ("Content-Length", "12"),
+                                               ("Retry-After", "1")])
+    return [b"Server busy\n"]
+
+
+# ===== BACKEND THREADED =====
+
+class _Body:
+    """wsgi.input limitado a Content-Length; cuenta lo leído para poder descartar el resto"""
+
+    def __init__(self, rfile, length: int):
+        self._rfile = rfile
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._rfile.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._rfile.readline(size)
+        self.remaining -= len(data)
+        return data
+
+    def readlines(self, hint: int = -1):
+        return list(iter(self.readline, b""))
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+    def drain(self) -> bool:
+        """Descarta lo que la app no leyó; False si es demasiado o el cliente se cortó"""
+        if self.remaining > MAX_DRAIN_BYTES:
+            return False
+        while self.remaining > 0:
+            if not self.read(min(self.remaining, 16 * 1024)):
+                return False
+        return True
+
+
+class _Connection:
+    """Conexión keep-alive: el socket y sus buffers sobreviven entre peticiones"""
+
+    def __init__(self, sock: socket.socket, address, timeout: float):
+        self.sock = sock
+        self.address = address
+        self.timeout = timeout
+        sock.settimeout(timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # respuestas pequeñas: sin ACK retardado
+        self.rfile = sock.makefile("rb")
+        self.wfile = sock.makefile("wb")  # cabeceras y cuerpo salen en un único envío
+        self.since = time.monotonic()
+        self.requests = 0
+        self.close_connection = False
+        self.detached = False
+
+    def pending(self) -> bool:
+        """¿Ya hay otra petición leída o por leer? (sin bloquear)"""
+        self.sock.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def cut(self):
+        """Corta la conexión; el thread que la atiende ve el error y la cierra"""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self):
+        self.cut()
+        for stream in (self.wfile, self.rfile, self.sock):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class _ServerHandler(ServerHandler):
+    """ServerHandler de wsgiref en HTTP/1.1: decide si la conexión sigue viva tras la respuesta"""
+
+    http_version = "1.1"
+    server_software = "LiveCue"
+    os_environ = {}  # sin copiar os.environ en cada petición
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        request = self.request_handler
+        # Sin longitud, el final del cuerpo lo marca el cierre (streams SSE)
+        if "Content-Length" not in self.headers and self.status[:3] not in ("204", "304"):
+            request.close_connection = True
+        if request.close_connection:
+            self.headers["Connection"] = "close"
+
+    def handle_error(self):
+        if self.environ.get("werkzeug.socket") is not None and isinstance(sys.exc_info()[1], OSError):
+            return  # WebSocket cerrado: el socket ya no habla HTTP
+        super().handle_error()
+
+    def log_exception(self, exc_info):
+        log_error("Web: Error no controlado en la aplicación", module="UI", exc=exc_info[1])
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """Una petición HTTP/1.1 sobre una _Connection; el bucle keep-alive lo lleva el servidor"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        self.conn = self.request
+        self.connection = self.conn.sock
+        self.rfile, self.wfile = self.conn.rfile, self.conn.wfile
+
+    def handle(self):
+        self.close_connection = True
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+            if not self.raw_requestline:
+                return  # el cliente cerró la conexión
+            self.conn.requests += 1
+            # Turno desde la línea de petición: el parseo también compite por el GIL
+            admitted = self.server.admit()
+            try:
+                self._handle_admitted(admitted)
+            finally:
+                if admitted:
+                    self.server.release()
+        finally:
+            self.conn.close_connection = self.close_connection
+
+    def _handle_admitted(self, admitted: bool):
+        if len(self.raw_requestline) > 65536:
+            self.requestline = self.request_version = self.command = ""
+            self.send_error(414)
+            return
+        if not self.parse_request():
+            return
+        if self.server.draining:
+            self.close_connection = True
+
+        environ = self.get_environ()
+        if self.server.streaming(environ):
+            self.close_connection = True
+            if self.server.detach(self.conn, lambda: self._run_wsgi(environ, self.server.app)):
+                return
+            self._run_wsgi(environ, _busy)
+            return
+        if not admitted:
+            self.server.shed()
+        self._run_wsgi(environ, self.server.app if admitted else _busy)
+
+    def _run_wsgi(self, environ, app):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.send_error(400, "Content-Length inválido")
+            return
+        body = _Body(self.rfile, length)
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            # Cuerpo chunked (ningún navegador lo usa para formularios): se lee hasta el cierre
+            body, self.close_connection = self.rfile, True
+            environ["wsgi.input_terminated"] = True
+
+        output = self.wfile
+        if environ.get("HTTP_UPGRADE", "").lower() == "websocket" and app is not _busy:
+            # flask-sock toma el socket en modo werkzeug: lo que devuelva la app después ya no es HTTP
+            environ["werkzeug.socket"] = self.connection
+            self.connection.settimeout(None)
+            self.close_connection = True
+            output = io.BytesIO()
+
+        handler = _ServerHandler(body, output, self.get_stderr(), environ, multithread=True)
+        handler.request_handler = self
+        handler.run(app)
+        if handler.status is not None:
+            # Respuesta a medias (error con cabeceras ya enviadas o cliente cortado)
+            self.close_connection = True
+        if output is self.wfile:
+            self.wfile.flush()
+            if isinstance(body, _Body) and not body.drain():
+                self.close_connection = True
+
+    def finish(self):
+        pass  # la conexión sigue abierta: el servidor la aparca o la cierra
+
+    def log_message(self, format, *args):
+        pass  # registro por petición desactivado (como el de werkzeug)
+
+
+class _KeepAliveServer:
+    """Servidor HTTP/1.1: un selector vigila las conexiones inactivas y el pool solo atiende peticiones"""
+
+    def __init__(self, host: str, port: int, app, threads: int, backlog: int, active: int,
+                 admission_timeout: float, keepalive_timeout: float, max_connections: int, streams: int,
+                 streaming: Callable[[dict], bool]):
+        self.app = app
+        self.threads = threads
+        self.backlog = backlog
+        self.active = active
+        self.admission_timeout = admission_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_connections = max_connections
+        self.streams = streams
+        self.streaming = streaming
+        self.draining = False
+
+        self.socket = socket.create_server((host, port), backlog=128)
+        self.server_port = self.socket.getsockname()[1]
+        self.base_environ = {
+            "SERVER_NAME": host, "GATEWAY_INTERFACE": "CGI/1.1", "SERVER_PORT": str(self.server_port),
+            "REMOTE_HOST": "", "CONTENT_LENGTH": "", "SCRIPT_NAME": "",
+        }
+        self._selector = selectors.DefaultSelector()
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._selector.register(self.socket, selectors.EVENT_READ, "accept")
+        self._selector.register(self._wake_recv, selectors.EVENT_READ, "wake")
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="WebWorker")
+        self._turns = threading.Semaphore(active)
+        self._cond = threading.Condition()
+        self._connections: Dict[_Connection, str] = {}
+        self._parked: List[_Connection] = []
+        self._queued = 0
+        self._streams = 0
+        self._stopped = threading.Event()
+        self._running = False
+        self._accepted = 0
+        self._rejected = 0
+        self._shed = 0
+        self._requests = 0
+
+    # ===== SELECTOR (thread WebServer) =====
+
+    def serve_forever(self):
+        self._running = True
+        next_sweep = time.monotonic() + 1.0
+        try:
+            while self._running:
+                for key, _ in self._selector.select(timeout=1.0):
+                    if key.data == "accept":
+                        self._accept()
+                    elif key.data == "wake":
+                        self._wake_recv.recv(4096)
+                    else:
+                        self._selector.unregister(key.fileobj)
+                        self._dispatch(key.data)
+                self._watch_parked()
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + 1.0
+                    self._expire()
+        finally:
+            self._selector.close()
+            self.socket.close()
+            self._stopped.set()
+
+    def shutdown(self):
+        """Deja de aceptar y de vigilar conexiones; vuelve cuando el selector ha parado"""
+        self._running = False
+        self._wake()
+        self._stopped.wait(5.0)
+
+    def _wake(self):
+        try:
+            self._wake_send.send(b"\0")
+        except OSError:
+            pass
+
+    def _accept(self):
+        try:
+            sock, address = self.socket.accept()
+        except OSError:
+            return
+        with self._cond:
+            reject = self.draining or len(self._connections) >= self.max_connections
+            if reject:
+                self._rejected += 1
+            else:
+                self._accepted += 1
+        if reject:
+            self._reject(sock)
+            return
+        conn = _Connection(sock, address, self.keepalive_timeout)
+        with self._cond:
+            self._connections[conn] = IDLE
+        # Nueva o aparcada: no ocupa worker hasta que llega la petición
+        self._selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _dispatch(self, conn: _Connection):
+        with self._cond:
+            reject = self._queued >= self.backlog
+            if reject:
+                self._rejected += 1
+                self._connections.pop(conn, None)
+            else:
+                self._connections[conn] = QUEUED
+                self._queued += 1
+        if reject:
+            self._reject(conn.sock)
+            conn.close()
+            return
+        self._pool.submit(self._serve, conn)
+
+    def _watch_parked(self):
+        with self._cond:
+            parked, self._parked = self._parked, []
+        for conn in parked:
+            try:
+                self._selector.register(conn.sock, selectors.EVENT_READ, conn)
+            except (OSError, ValueError):
+                self._forget(conn)  # cerrada mientras tanto (apagado)
+
+    def _expire(self):
+        """Cierra las conexiones inactivas más de keepalive_timeout"""
+        limit = time.monotonic() - self.keepalive_timeout
+        expired = [key.data for key in self._selector.get_map().values()
+                   if isinstance(key.data, _Connection) and key.data.since < limit]
+        for conn in expired:
+            self._selector.unregister(conn.sock)
+            self._forget(conn)
+            conn.close()
+
+    @staticmethod
+    def _reject(sock: socket.socket):
+        try:
+            sock.settimeout(0.5)
+            sock.sendall(REJECT_RESPONSE)
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    # ===== WORKERS =====
+
+    def _serve(self, conn: _Connection):
+        with self._cond:
+            if self._connections.get(conn) != QUEUED:
+                return  # descartada por el apagado mientras esperaba worker
+            self._connections[conn] = BUSY
+            self._queued -= 1
+        close = True
+        try:
+            while True:
+                _RequestHandler(conn, conn.address, self)
+                if conn.detached:
+                    return
+                conn.wfile.flush()  # respuestas de error de http.server (send_error)
+                # Pipelining: si ya llegó la siguiente petición se atiende sin pasar por el selector
+                if conn.close_connection or self.draining or not conn.pending():
+                    break
+            close = conn.close_connection or self.draining
+        except OSError:
+            pass  # keep-alive expirado a mitad de petición o cliente cortado
+        except Exception:
+            self.handle_error(conn)
+        with self._cond:
+            self._requests += conn.requests
+            conn.requests = 0
+        if close:
+            self._forget(conn)
+            conn.close()
+        else:
+            self._park(conn)
+
+    def _park(self, conn: _Connection):
+        with self._cond:
+            if conn not in self._connections:
+                conn.close()  # cortada por el apagado
+                return
+            conn.since = time.monotonic()
+            self._connections[conn] = IDLE
+            self._parked.append(conn)
+            self._cond.notify_all()
+        self._wake()
+
+    def _forget(self, conn: _Connection):
+        with self._cond:
+            self._connections.pop(conn, None)
+            self._cond.notify_all()
+
+    def admit(self) -> bool:
+        """Turno para ejecutar una petición; False si no llega en admission_timeout"""
+        return self._turns.acquire(timeout=self.admission_timeout)
+
+    def release(self):
+        self._turns.release()
+
+    def shed(self):
+        with self._cond:
+            self._shed += 1
+
+    def detach(self, conn: _Connection, target: Callable[[], None]) -> bool:
+        """Pasa la conexión a un thread propio (stream); False si ya están todos ocupados"""
+        with self._cond:
+            if self._streams >= self.streams or self.draining:
+                return False
+            self._streams += 1
+            self._connections[conn] = STREAM
+        conn.detached = True
+        threading.Thread(target=self._stream, args=(conn, target), name="WebStream", daemon=True).start()
+        return True
+
+    def _stream(self, conn: _Connection, target: Callable[[], None]):
+        try:
+            target()
+        except OSError:
+            pass  # móvil desconectado (o conexión cortada al apagar)
+        except Exception:
+            self.handle_error(conn)
+        finally:
+            with self._cond:
+                self._streams -= 1
+                self._requests += conn.requests
+            self._forget(conn)
+            conn.close()
+
+    def handle_error(self, conn: _Connection):
+        log_error(f"Web: Error en la conexión de {conn.address[0]}", module="UI", exc=sys.exc_info()[1])
+
+    # ===== APAGADO =====
+
+    def drain(self, timeout: float) -> int:
+        """Cierra las conexiones inactivas y los streams y espera a las peticiones en curso
+
+        Devuelve cuántas hubo que cortar a mitad de petición.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self.draining = True
+            idle = [conn for conn, status in self._connections.items() if status in (IDLE, QUEUED)]
+            streams = [conn for conn, status in self._connections.items() if status == STREAM]
+            for conn in idle:
+                del self._connections[conn]
+            self._queued = 0
+        for conn in idle:
+            conn.close()
+        for conn in streams:
+            conn.cut()
+        with self._cond:
+            while any(status == BUSY for status in self._connections.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            forced = [conn for conn, status in self._connections.items() if status == BUSY]
+        for conn in forced:
+            conn.cut()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._wake_send.close()
+        self._wake_recv.close()
+        return len(forced)
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            states = list(self._connections.values())
+            return {
+                "connections": len(states),
+                "idle": states.count(IDLE),
+                "queued": states.count(QUEUED),
+                "busy": states.count(BUSY),
+                "streams": states.count(STREAM),
+                "threads": self.threads,
+                "active": self.active,
+                "accepted": self._accepted,
+                "requests": self._requests,
+                "rejected": self._rejected,
+                "shed": self._shed,
+            }
+
+
+class ThreadedBackend(ServerBackend):
+    """HTTP/1.1 keep-alive con pool acotado y turnos de ejecución - Thread-safe"""
+
+    name = "threaded"
+
+    def __init__(self, app, host: str, port: int, threads: int = WEB_SERVER_THREADS,
+                 backlog: int = WEB_SERVER_BACKLOG, active: int = WEB_SERVER_ACTIVE_REQUESTS,
+                 admission_timeout: float = WEB_SERVER_ADMISSION_TIMEOUT,
+                 keepalive_timeout: float = WEB_SERVER_KEEPALIVE_TIMEOUT,
+                 max_connections: int = WEB_SERVER_MAX_CONNECTIONS, streams: int = WEB_SERVER_STREAMS,
+                 streaming: Callable[[dict], bool] = is_stream):
+        super().__init__(app, host, port)
+        # Configuraciones que dejarían peticiones normales sin worker
+        if not 0 < active < threads:
+            raise ValueError(f"El servidor web necesita 0 < peticiones activas ({active}) < workers ({threads})")
+        if streams < WEB_EVENTS_MAX_CLIENTS + WEB_SOCKET_MAX_CLIENTS:
+            raise ValueError(f"El servidor web admite {streams} streams y /events + /ws permiten "
+                             f"{WEB_EVENTS_MAX_CLIENTS + WEB_SOCKET_MAX_CLIENTS}")
+        self.options = dict(threads=threads, backlog=backlog, active=active, admission_timeout=admission_timeout,
+                            keepalive_timeout=keepalive_timeout, max_connections=max_connections,
+                            streams=streams, streaming=streaming)
+        self._server = None
+
+    def start(self):
+        self._server = _KeepAliveServer(self.host, self.port, self.app, **self.options)
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, name="WebServer", daemon=True).start()
+        log_info(f"🌐 Servidor web (threaded) en {self.host}:{self.port} · {self.options['threads']} workers, "
+                 f"{self.options['active']} activos, {self.options['streams']} streams", module="UI")
+
+    def stop(self, timeout: float = WEB_SERVER_SHUTDOWN_TIMEOUT):
+        server = self._server
+        if server is None:
+            return
+        self._server = None
+        # Primero se deja de aceptar (el selector cierra el socket de escucha); luego se vacía el pool
+        server.shutdown()
+        started = time.monotonic()
+        forced = server.drain(timeout)
+        if forced:
+            log_warning(f"Servidor web: {forced} peticiones cortadas al apagar", module="UI")
+        log_info(f"🌐 Servidor web detenido ({(time.monotonic() - started) * 1000:.0f} ms)", module="UI")
+
+    def snapshot(self) -> dict:
+        server = self._server
+        return {**super().snapshot(), **(server.snapshot() if server else {"connections": 0})}
+
+
+# ===== BACKEND WERKZEUG =====
+
+def _bind(factory, host: str, port: int):
+    """Crea el servidor de werkzeug; un puerto ocupado llega como OSError, no como sys.exit()"""
+    try:
+        return factory()
+    except SystemExit:
+        raise OSError(f"No se pudo escuchar en {host}:{port} (¿puerto ocupado?)") from None
+
+
+class WerkzeugBackend(ServerBackend):
+    """Servidor de desarrollo de Flask (un thread por conexión, sin límite)"""
+
+    name = "werkzeug"
+
+    def __init__(self, app, host: str, port: int, **options):
+        super().__init__(app, host, port)
+        self._server = None
+
+    def start(self):
+        self._server = _bind(lambda: make_server(self.host, self.port, self.app, threaded=True),
+                             self.host, self.port)
+        self.port = self._server.port
+        threading.Thread(target=self._server.serve_forever, name="WebServer", daemon=True).start()
+        log_info(f"🌐 Servidor web (werkzeug, desarrollo) en {self.host}:{self.port}", module="UI")
+
+    def stop(self, timeout: float = WEB_SERVER_SHUTDOWN_TIMEOUT):
+        server = self._server
+        if server is None:
+            return
+        self._server = None
+        # Sin registro de conexiones: las peticiones en curso terminan en sus threads daemon
+        server.shutdown()
+        log_info("🌐 Servidor web detenido", module="UI")
+
+
+BACKENDS = {
+    ThreadedBackend.name: ThreadedBackend,
+    WerkzeugBackend.name: WerkzeugBackend,
+}
+
+
+def create_backend(name: str, app, host: str, port: int, **options) -> ServerBackend:
+    """Backend por nombre (ver BACKENDS); uno desconocido cae al threaded"""
+    backend = BACKENDS.get(name)
+    if backend is None:
+        log_warning(f"Backend web desconocido '{name}', se usa '{ThreadedBackend.name}'", module="UI")
+        backend = ThreadedBackend
+    log_debug(f"Backend web: {backend.name}", module="UI")
+    return backend(app, host, port, **options)
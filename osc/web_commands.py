@@ -0,0 +1,172 @@
+# osc/web_commands.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Comandos del controlador web por WebSocket (/ws)
+Cada mensaje es un JSON {"id": ..., "cmd": ..., ...}. El id de correlación
+vuelve en dos respuestas:
+
+    {"id", "type": "ack", "cmd", "ms", "pending", ...}  validado y encolado
+    {"id", "type": "done", "cmd", "ok", ...}            terminado en el loop de reproducción
+    {"id", "type": "error", "error"}                    rechazado (no habrá "done")
+
+El ack sale antes de tocar el loop de reproducción: no espera a Ableton. Si
+lleva "pending": true, el "done" llega desde el callback del future cuando el
+lanzamiento termina (o se colapsa con una pulsación posterior: "superseded");
+los comandos inmediatos (ping, quantize...) terminan con el propio ack.
+
+    ping                         {"server_time"}
+    play      index              → {"target", "title"}
+    next / prev                  → {"target", "title"}
+    section   track, section
+    stop
+    metronome [state]            → done {"state"}
+    quantize  mode               → {"mode"}
+"""
+
+import time
+from typing import Callable, Optional, Tuple
+from core.tracing import tracer
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+class CommandError(ValueError):
+    """Comando mal formado o imposible (no se encola)"""
+
+
+class WebCommandChannel:
+    """Valida, encola y confirma comandos del controlador web - Thread-safe"""
+
+    def __init__(self, playback_controller, state):
+        self.playback = playback_controller
+        self.state = state
+        self._commands = {
+            "ping": self._ping,
+            "play": self._play,
+            "next": lambda message: self._navigate(1),
+            "prev": lambda message: self._navigate(-1),
+            "section": self._section,
+            "stop": self._stop,
+            "metronome": self._metronome,
+            "quantize": self._quantize,
+        }
+        log_debug("WebCommandChannel inicializado", module="UI")
+
+    def handle(self, message: dict, reply: Callable[[dict], None], remote: str = None):
+        """Procesa un mensaje; `reply` envía por la conexión (se llama también desde otros threads)"""
+        started = time.perf_counter()
+        cid = message.get("id")
+        cmd = message.get("cmd")
+        handler = self._commands.get(cmd)
+        if handler is None:
+            reply({"id": cid, "type": "error", "error": f"Comando desconocido: {cmd}"})
+            return
+
+        try:
+            result, future, finish = handler(message)
+        except CommandError as e:
+            reply({"id": cid, "type": "error", "cmd": cmd, "error": str(e)})
+            return
+        except Exception as e:
+            log_error(f"WS: Error en comando '{cmd}'", module="UI", exc=e)
+            reply({"id": cid, "type": "error", "cmd": cmd, "error": str(e)})
+            return
+
+        if cmd != "ping":
+            log_info(f"📱 WS: {cmd} desde {remote}", module="UI")
+        reply({"id": cid, "type": "ack", "cmd": cmd, "ms": round((time.perf_counter() - started) * 1000, 2),
+               "pending": future is not None, **result})
+
+        if future is None:
+            return
+
+        def done(f):
+            try:
+                payload = {"ok": True, **finish(f.result())}
+            except Exception as e:
+                log_error(f"WS: Error ejecutando '{cmd}'", module="UI", exc=e)
+                payload = {"ok": False, "error": str(e)}
+            reply({"id": cid, "type": "done", "cmd": cmd,
+                   "ms": round((time.perf_counter() - started) * 1000, 2), **payload})
+
+        future.add_done_callback(done)
+
+    # ===== COMANDOS =====
+    # Cada uno devuelve (datos del ack, future o None, datos del "done" a partir del resultado)
+
+    @staticmethod
+    def _int(message: dict, key: str) -> int:
+        try:
+            return int(message[key])
+        except (KeyError, TypeError, ValueError):
+            raise CommandError(f"'{key}' debe ser un entero")
+
+    def _ping(self, message: dict) -> Tuple[dict, None, None]:
+        return {"server_time": time.time()}, None, None
+
+    def _launched(self, nav) -> Tuple[dict, object, Callable]:
+        def finish(result: Optional[bool]) -> dict:
+            # None: otra pulsación posterior reemplazó a esta antes de lanzarse
+            if result is None:
+                return {"superseded": True}
+            if not result:
+                raise RuntimeError("El lanzamiento falló")
+            return {"index": nav.target}
+
+        track = self.state.tracks[nav.target]
+        return {"target": nav.target, "title": track.title}, nav.done, finish
+
+    def _play(self, message: dict):
+        index = self._int(message, "index")
+        nav = self.playback.request_navigation(index=index, trace_id=tracer.begin("ws", index))
+        if nav is None:
+            raise CommandError(f"Track fuera de rango ({index})")
+        return self._launched(nav)
+
+    def _navigate(self, delta: int):
+        nav = self.playback.request_navigation(delta=delta, trace_id=tracer.begin("ws"))
+        if nav is None:
+            raise CommandError("Ya en el último track" if delta > 0 else "Ya en el primer track")
+        return self._launched(nav)
+
+    def _section(self, message: dict):
+        track_index, section_index = self._int(message, "track"), self._int(message, "section")
+        tracks = self.state.tracks
+        if not (0 <= track_index < len(tracks) and 0 <= section_index < len(tracks[track_index].sections)):
+            raise CommandError(f"Sección inválida ({track_index}, {section_index})")
+
+        def finish(result: bool) -> dict:
+            if not result:
+                raise RuntimeError("El salto a la sección falló")
+            return {}
+
+        aio = self.playback.aio
+        future = aio.submit(aio.jump_to_section(track_index, section_index, tracer.begin("ws", track_index)))
+        return {"name": tracks[track_index].sections[section_index].name}, future, finish
+
+    def _refresh_ui(self, result=None) -> dict:
+        self.state.needs_ui_refresh = True
+        return {}
+
+    def _stop(self, message: dict):
+        aio = self.playback.aio
+        return {}, aio.submit(aio.stop()), self._refresh_ui
+
+    def _metronome(self, message: dict):
+        wanted = message.get("state")
+        aio = self.playback.aio
+
+        def finish(is_on: bool) -> dict:
+            self._refresh_ui()
+            return {"state": is_on}
+
+        # Con "state" se fija en el loop (bajo su lock): repetirlo no alterna dos veces
+        coro = aio.toggle_metronome() if wanted is None else aio.set_metronome(bool(wanted))
+        return {}, aio.submit(coro), finish
+
+    def _quantize(self, message: dict):
+        mode = message.get("mode", "")
+        if not self.playback.set_quantize(mode):
+            raise CommandError(f"Modo desconocido: {mode}")
+        return {"mode": mode}, None, None
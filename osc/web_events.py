@@ -0,0 +1,205 @@
+# osc/web_events.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Eventos en vivo para el controlador web (Server-Sent Events)
+Los observadores de AppState, del scan y de la carpeta de setlists solo suben
+un contador por tipo de evento; cada conexión /events espera a que alguno
+cambie y envía el estado actual de ese tipo. Así el coste en el thread que
+cambia el estado (OSC, reproducción) no depende de cuántos móviles haya, y un
+cliente lento recibe el último valor en vez de una cola de cambios viejos.
+
+    event: track        {"index", "title", "count"}
+    event: tracks       {"version", "tracks": [{"index", "title", "sections"}]}
+    event: playing      {"state"}
+    event: metronome    {"state"}
+    event: tempo        {"bpm"}
+    event: beat         {"beat", "num"}
+    event: connection   snapshot de osc.health.monitor
+    event: scan         snapshot del ScanPipeline
+    event: setlists     {"seq", "count", "events", "watcher"}
+"""
+
+import json
+import threading
+from typing import Dict, Iterator, Optional
+from core.constants import WEB_EVENTS_KEEPALIVE, WEB_EVENTS_MAX_CLIENTS, WEB_EVENTS_RETRY_MS
+from core.logger import log_info, log_error, log_warning, log_debug
+
+# Campo notificado por AppState → eventos que hay que reenviar
+STATE_EVENTS = {
+    "current_index": ("track",),
+    "tracks": ("tracks", "track"),
+    "reset": ("tracks", "track"),
+    "is_playing": ("playing",),
+    "metronome_on": ("metronome",),
+    "current_tempo": ("tempo",),
+    "current_beat": ("beat",),
+    "time_signature_num": ("beat",),
+    "connection_status": ("connection",),
+}
+
+# Orden de envío (la lista antes que el track actual que la referencia)
+EVENTS = ("tracks", "track", "playing", "metronome", "tempo", "beat", "connection", "scan", "setlists")
+
+
+def format_event(name: str, payload: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+class WebEventHub:
+    """Difunde cambios de estado a las conexiones SSE abiertas - Thread-safe"""
+
+    def __init__(self, playback_controller, state, keepalive: float = WEB_EVENTS_KEEPALIVE,
+                 max_clients: int = WEB_EVENTS_MAX_CLIENTS):
+        self.playback = playback_controller
+        self.state = state
+        self.keepalive = keepalive
+        self.max_clients = max_clients
+        self._cond = threading.Condition()
+        self._versions: Dict[str, int] = {name: 0 for name in EVENTS}
+        self._clients = 0
+        self._attached = False
+        self._closed = False
+        log_debug("WebEventHub inicializado", module="UI")
+
+    # ===== FUENTES =====
+
+    def attach(self):
+        """Se suscribe a estado, scan y carpeta de setlists (una vez)"""
+        with self._cond:
+            if self._attached:
+                return
+            self._attached = True
+        from setlist.watcher import watcher
+        self.state.add_listener(self._on_state)
+        self.playback.scan_pipeline.add_listener(self._on_scan)
+        watcher.add_listener(self._on_setlists)
+        log_debug("WebEventHub suscrito a estado, scan y setlists", module="UI")
+
+    def detach(self):
+        with self._cond:
+            if not self._attached:
+                return
+            self._attached = False
+        from setlist.watcher import watcher
+        self.state.remove_listener(self._on_state)
+        self.playback.scan_pipeline.remove_listener(self._on_scan)
+        watcher.remove_listener(self._on_setlists)
+
+    def _on_state(self, field: str):
+        names = STATE_EVENTS.get(field)
+        if names:
+            self.publish(*names)
+
+    def _on_scan(self, snapshot: dict):
+        self.publish("scan")
+
+    def _on_setlists(self, events: list):
+        self.publish("setlists")
+
+    def publish(self, *names: str):
+        """Marca eventos como cambiados y despierta a las conexiones (no bloquea)"""
+        with self._cond:
+            for name in names:
+                self._versions[name] += 1
+            self._cond.notify_all()
+
+    # ===== PAYLOADS =====
+
+    def payload(self, name: str, setlists_seq: int = 0) -> dict:
+        state = self.state
+        if name == "track":
+            track = state.get_current_track()
+            return {"index": state.current_index, "title": track.title if track else None,
+                    "count": state.get_track_count()}
+        if name == "tracks":
+            return {
+                "version": state.structure_version,
+                "tracks": [{"index": i, "title": t.title, "sections": [s.name for s in t.sections]}
+                           for i, t in enumerate(state.tracks)],
+            }
+        if name == "playing":
+            return {"state": state.is_playing}
+        if name == "metronome":
+            return {"state": state.metronome_on}
+        if name == "tempo":
+            return {"bpm": state.current_tempo}
+        if name == "beat":
+            return {"beat": state.current_beat, "num": state.time_signature_num}
+        if name == "connection":
+            from osc.health import monitor
+            return monitor.snapshot()
+        if name == "scan":
+            return self.playback.scan_pipeline.snapshot()
+        if name == "setlists":
+            from setlist.manager import manager
+            from setlist.watcher import watcher
+            return {"seq": watcher.seq, "count": len(manager.list_entries()),
+                    "events": watcher.events_since(setlists_seq), "watcher": watcher.backend}
+        raise KeyError(name)
+
+    # ===== CONEXIONES =====
+
+    def open(self) -> Optional[Iterator[str]]:
+        """Stream SSE para una conexión nueva; None si ya hay demasiadas"""
+        with self._cond:
+            if self._closed or self._clients >= self.max_clients:
+                return None
+            self._clients += 1
+            clients = self._clients
+        self.attach()
+        log_debug(f"SSE: conexión abierta ({clients} activas)", module="UI")
+        stream = self._stream()
+        # Arrancado ya: aunque el cliente se vaya antes del primer envío, su finally libera la plaza
+        next(stream)
+        return stream
+
+    def _stream(self) -> Iterator[str]:
+        # Sin versiones vistas: la primera vuelta envía el estado completo
+        seen: Dict[str, int] = {}
+        setlists_seq = None
+        try:
+            yield ""  # arranque (ver open)
+            yield f"retry: {WEB_EVENTS_RETRY_MS}\n\n"
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed or self._versions != seen, timeout=self.keepalive)
+                    if self._closed:
+                        return
+                    changed = [name for name in EVENTS if seen.get(name) != self._versions[name]]
+                    seen = dict(self._versions)
+
+                if not changed:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                chunks = []
+                for name in changed:
+                    if name == "setlists":
+                        from setlist.watcher import watcher
+                        # Al conectar solo el recuento; después, los cambios desde el último envío
+                        payload = self.payload(name, watcher.seq if setlists_seq is None else setlists_seq)
+                        setlists_seq = payload["seq"]
+                    else:
+                        payload = self.payload(name)
+                    chunks.append(format_event(name, payload))
+                yield "".join(chunks)
+        finally:
+            with self._cond:
+                self._clients -= 1
+                clients = self._clients
+            log_debug(f"SSE: conexión cerrada ({clients} activas)", module="UI")
+
+    def close(self):
+        """Termina todas las conexiones abiertas (apagado del servidor)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.detach()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {"clients": self._clients, "max_clients": self.max_clients,
+                    "published": sum(self._versions.values())}
@@ -0,0 +1,329 @@
+# osc/web_loadtest.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Prueba de carga local del controlador web
+Arranca el simulador AbletonOSC (proceso aparte), el servidor OSC, el loop de
+reproducción y el servidor web con el backend elegido, y mide la latencia de
+un comando OSC (petición desde otro thread → loop de reproducción → Ableton →
+respuesta) primero en reposo y después con N "móviles" machacando /play y
+/metronome/status desde otro proceso.
+
+Antes de la carga comprueba el canal WebSocket: un comando por /ws debe
+volver con su ack y su done con el mismo id de correlación.
+
+Uso:
+    python -m osc.web_loadtest --clients 50 --duration 10
+    python -m osc.web_loadtest --backend werkzeug      # comparar con el servidor de desarrollo
+    python -m osc.web_loadtest --live                  # contra Ableton real en vez del simulador
+    python -m osc.web_loadtest --check                 # solo la comprobación de /ws, sin carga
+    python -m osc.web_loadtest --think 0.2             # carga realista: ~5 peticiones/s por móvil
+
+Por defecto cada móvil encadena peticiones sin pausa (--think 0): satura el
+servidor y es el caso que debe aguantar el loop de reproducción.
+
+Las dos fases miden con el transporte en marcha. Sale con código 1 si falla
+la comprobación de /ws, si la carga sube el p95 de la latencia OSC más allá
+de --tolerance-ms o si los móviles no reutilizan la conexión (keep-alive).
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from core.constants import SCAN_CONNECT_ADDRESS, WEB_SERVER_BACKEND
+from core.logger import log_info, log_error, log_warning, log_debug
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Por debajo, el servidor está cerrando la conexión tras cada petición
+MIN_REQUESTS_PER_CONNECTION = 2
+
+
+def _percentiles(samples: List[float]) -> dict:
+    if not samples:
+        return {"n": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 2)
+
+    return {"n": len(ordered), "p50": pick(50), "p95": pick(95), "p99": pick(99), "max": round(ordered[-1], 2)}
+
+
+# ===== LATENCIA OSC =====
+
+async def _osc_round_trip(timeout: float) -> bool:
+    """Getter OSC enviado y esperado desde el loop de reproducción (el camino de cualquier comando)"""
+    from osc.client import send_message
+    from osc.replies import replies
+    probe = replies.expect(SCAN_CONNECT_ADDRESS)
+    send_message(SCAN_CONNECT_ADDRESS, [])
+    return await probe.wait(timeout) is not None
+
+
+class OscProbe:
+    """Mide en bucle la latencia OSC vista desde un thread ajeno al loop de reproducción"""
+
+    def __init__(self, aio, interval: float = 0.02, timeout: float = 1.0):
+        self.aio = aio
+        self.interval = interval
+        self.timeout = timeout
+        self.samples: List[float] = []
+        self.lost = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_for(self, seconds: float) -> dict:
+        self.start()
+        time.sleep(seconds)
+        return self.stop()
+
+    def start(self):
+        self.samples, self.lost = [], 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="OscProbe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self._stop_event.set()
+        self._thread.join()
+        return {**_percentiles(self.samples), "lost": self.lost}
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            started = time.perf_counter()
+            try:
+                ok = self.aio.submit(_osc_round_trip(self.timeout)).result(self.timeout * 2)
+            except Exception:
+                ok = False
+            if ok:
+                self.samples.append((time.perf_counter() - started) * 1000)
+            else:
+                self.lost += 1
+
+
+# ===== MÓVILES =====
+
+def _phone(port: int, deadline: float, play_ratio: float, tracks: int, think: float, seed: int) -> dict:
+    """Un cliente: reutiliza la conexión mientras el servidor no la cierre"""
+    rng = random.Random(seed)
+    latencies, statuses = [], Counter()
+    connects, errors = 0, 0
+    conn = None
+    while time.monotonic() < deadline:
+        if conn is None:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connects += 1
+        play = rng.random() < play_ratio
+        started = time.perf_counter()
+        try:
+            if play:
+                conn.request("POST", "/play", body=f"index={rng.randrange(tracks)}", headers=FORM_HEADERS)
+            else:
+                conn.request("GET", "/metronome/status")
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            errors += 1
+            conn.close()
+            conn = None
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses[response.status] += 1
+        if response.will_close:
+            conn.close()
+            conn = None
+        if think:
+            time.sleep(rng.uniform(0, 2 * think))
+    if conn is not None:
+        conn.close()
+    return {"latencies": latencies, "statuses": statuses, "connects": connects, "errors": errors}
+
+
+def _swarm(port: int, clients: int, duration: float, play_ratio: float, tracks: int, think: float, results):
+    """Proceso de clientes: `clients` threads, como móviles independientes"""
+    deadline = time.monotonic() + duration
+    outcomes = [None] * clients
+
+    def run(i: int):
+        outcomes[i] = _phone(port, deadline, play_ratio, tracks, think, seed=i)
+
+    threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies, statuses = [], Counter()
+    for outcome in outcomes:
+        latencies.extend(outcome["latencies"])
+        statuses.update(outcome["statuses"])
+    results.put({
+        "http": _percentiles(latencies),
+        "statuses": dict(statuses),
+        "connects": sum(o["connects"] for o in outcomes),
+        "errors": sum(o["errors"] for o in outcomes),
+    })
+
+
+# ===== WEBSOCKET =====
+
+def _check_websocket(port: int, index: int, timeout: float = 5.0) -> Optional[bool]:
+    """ping y play por /ws: cada ack/done debe traer el id de su comando; None si no hay cliente WS"""
+    try:
+        from simple_websocket import Client
+    except ImportError:
+        return None
+
+    sent = {"check-ping": {"cmd": "ping"}, "check-play": {"cmd": "play", "index": index}}
+    expected = {("check-ping", "ack"), ("check-play", "ack"), ("check-play", "done")}
+    received = {}
+    ws = Client.connect(f"ws://127.0.0.1:{port}/ws")
+    try:
+        for cid, command in sent.items():
+            ws.send(json.dumps({"id": cid, **command}))
+        deadline = time.monotonic() + timeout
+        while not expected <= received.keys() and time.monotonic() < deadline:
+            raw = ws.receive(timeout=max(0.0, deadline - time.monotonic()))
+            if raw is None:
+                break
+            message = json.loads(raw)
+            received[(message.get("id"), message.get("type"))] = message
+    finally:
+        ws.close()
+
+    for key in sorted(expected | received.keys(), key=str):
+        message = received.get(key)
+        print(f"  {key[0]} {key[1]}: {json.dumps(message, ensure_ascii=False) if message else 'sin respuesta'}")
+    ack, done = received.get(("check-play", "ack"), {}), received.get(("check-play", "done"), {})
+    return (received.keys() == expected
+            and all(message.get("cmd") == sent[cid]["cmd"] for (cid, _), message in received.items())
+            and ack.get("target") == index and done.get("ok") is True and done.get("index") == index)
+
+
+# ===== PRUEBA =====
+
+def run(args) -> int:
+    from core.state import state
+    from core.playback import playback
+    from core.tracing import tracer
+    from osc.server import create_server
+    from osc.web_server import WebControllerServer
+
+    simulator = None
+    if not args.live:
+        simulator = subprocess.Popen([sys.executable, "-m", "osc.simulator", "--tracks", str(args.tracks)],
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(1.0)
+
+    osc_server = create_server()
+    threading.Thread(target=osc_server.serve_forever, name="OSCServer", daemon=True).start()
+    web = None
+    try:
+        if not playback.scan_all() or not state.tracks:
+            print("✖ El scan no devolvió tracks (¿simulador/Ableton escuchando?)")
+            return 2
+        tracks = len(state.tracks)
+
+        web = WebControllerServer(playback, state, port=args.port, host="127.0.0.1", backend=args.backend)
+        web.serve()
+        print(f"Backend '{args.backend}' en 127.0.0.1:{web.port} · {tracks} tracks · "
+              f"{args.clients} clientes · {args.duration:.0f} s")
+
+        ws_ok = _check_websocket(web.port, tracks - 1)
+        if ws_ok is None:
+            print("· WebSocket /ws sin comprobar (simple-websocket no instalado)")
+        else:
+            print(f"{'✓' if ws_ok else '✖'} WebSocket /ws: ack y done con su id de correlación")
+            if not ws_ok:
+                return 1
+        if args.check:
+            return 0
+
+        # Transporte en marcha en ambas fases: el reposo también recibe current_song_time
+        playback.play_track(0)
+        time.sleep(0.5)
+        probe = OscProbe(playback.aio)
+        baseline = probe.run_for(args.baseline)
+        print(_line("OSC en reposo ", baseline))
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        swarm = context.Process(target=_swarm, args=(web.port, args.clients, args.duration, args.play_ratio,
+                                                     tracks, args.think, results))
+        swarm.start()
+        probe.start()
+        load = results.get(timeout=args.duration + 60)
+        loaded = probe.stop()
+        swarm.join()
+        print(_line("OSC con carga ", loaded))
+
+        requests = sum(load["statuses"].values())
+        print(_line("HTTP          ", load["http"]))
+        print(f"  {requests / args.duration:.0f} peticiones/s · estados {load['statuses']} · "
+              f"{load['connects']} conexiones TCP ({requests / max(load['connects'], 1):.0f} peticiones/conexión) · "
+              f"{load['errors']} errores")
+        launches = tracer.snapshot()
+        print(f"  Lanzamientos: {launches['outcomes']} · total p50 {launches['total']['p50_ms']} ms, "
+              f"p95 {launches['total']['p95_ms']} ms")
+        if web.server is not None:
+            print(f"  Servidor: {web.server.snapshot()}")
+
+        if not baseline["n"] or not loaded["n"]:
+            print("✖ Sin respuestas OSC suficientes para comparar")
+            return 2
+        reuse = requests / max(load["connects"], 1)
+        keepalive_ok = reuse >= MIN_REQUESTS_PER_CONNECTION
+        print(f"{'✓' if keepalive_ok else '✖'} Keep-alive: {reuse:.1f} peticiones/conexión "
+              f"(mínimo {MIN_REQUESTS_PER_CONNECTION})")
+        delta = loaded["p95"] - baseline["p95"]
+        ok = delta <= args.tolerance_ms and loaded["lost"] == baseline["lost"] == 0
+        print(f"{'✓' if ok else '✖'} p95 OSC {baseline['p95']} → {loaded['p95']} ms "
+              f"({delta:+.2f} ms, tolerancia {args.tolerance_ms} ms)")
+        return 0 if ok and keepalive_ok else 1
+    finally:
+        if web is not None:
+            web.stop()
+        osc_server.shutdown()
+        playback.aio.shutdown()
+        if simulator is not None:
+            simulator.terminate()
+            simulator.wait(timeout=5)
+
+
+def _line(label: str, stats: dict) -> str:
+    lost = f" · {stats['lost']} perdidas" if "lost" in stats else ""
+    return (f"{label} n={stats['n']} p50 {stats['p50']} ms · p95 {stats['p95']} ms · "
+            f"p99 {stats['p99']} ms · máx {stats['max']} ms{lost}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del controlador web de LiveCue")
+    parser.add_argument("--clients", type=int, default=50, help="Móviles simultáneos")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de carga")
+    parser.add_argument("--baseline", type=float, default=3.0, help="Segundos midiendo OSC en reposo")
+    parser.add_argument("--backend", default=WEB_SERVER_BACKEND, help="Backend HTTP (threaded | werkzeug)")
+    parser.add_argument("--port", type=int, default=0, help="Puerto web (0: uno libre)")
+    parser.add_argument("--tracks", type=int, default=24, help="Tracks del set simulado")
+    parser.add_argument("--play-ratio", type=float, default=0.2, help="Fracción de peticiones que son /play")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="Pausa media entre peticiones de cada móvil (s); 0 satura el servidor")
+    parser.add_argument("--tolerance-ms", type=float, default=10.0,
+                        help="Subida máxima admitida del p95 OSC (un tick de 24 ppq a 120 BPM son ~20 ms)")
+    parser.add_argument("--live", action="store_true", help="Usar Ableton real en vez del simulador")
+    parser.add_argument("--check", action="store_true", help="Solo comprobar el canal /ws, sin carga")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,19 +7,39 @@ Servidor web Flask para control remoto desde móvil/tablet
 Permite reproducir tracks, detener y controlar metrónomo vía HTTP
 """
 
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, render_template_string, request, jsonify
 from ui.templates.controller_html import CONTROLLER_HTML
+from osc.web_events import WebEventHub
+from osc.web_commands import WebCommandChannel
+from osc.web_backend import create_backend
+from core.constants import (
+    WEB_SOCKET_MAX_CLIENTS, WEB_SOCKET_PING_INTERVAL, WEB_SERVER_BACKEND, WEB_SERVER_SHUTDOWN_TIMEOUT
+)
 from core.logger import log_info, log_error, log_warning, log_debug
+import json
 import threading
 import socket
 from core.state import state 
+from core.tracing import tracer
+
+try:
+    from flask_sock import Sock, ConnectionClosed
+except ImportError:  # Opcional: sin flask-sock el controlador usa las rutas HTTP
+    Sock = ConnectionClosed = None
 
 class WebControllerServer:
-    def __init__(self, playback_controller, state, port=5000):
+    def __init__(self, playback_controller, state, port=5000, host='0.0.0.0', backend=WEB_SERVER_BACKEND):
         self.playback = playback_controller
         self.state = state
         self.port = port
+        self.host = host
+        self.backend = backend
+        self.server = None
         self.app = Flask(__name__)
+        self.events = WebEventHub(playback_controller, state)
+        self.commands = WebCommandChannel(playback_controller, state)
+        self._ws_lock = threading.Lock()
+        self._ws_clients = 0
         
         # Deshabilitar logs de Flask (muy verbose)
         import logging
@@ -27,6 +47,11 @@ class WebControllerServer:
         werkzeug_logger.setLevel(logging.ERROR)
         
         self._setup_routes()
+        if Sock is not None:
+            self.app.config["SOCK_SERVER_OPTIONS"] = {"ping_interval": WEB_SOCKET_PING_INTERVAL}
+            self._setup_socket(Sock(self.app))
+        else:
+            log_warning("flask-sock no instalado: canal WebSocket /ws desactivado (pip install flask-sock)", module="UI")
         log_debug(f"WebControllerServer inicializado (puerto {port})", module="UI")
 
     def _setup_routes(self):
@@ -43,34 +68,33 @@ class WebControllerServer:
                 index = int(request.form.get("index", 0))
                 log_info(f"📱 Web: Play track {index} desde {request.remote_addr}", module="UI")
 
-                def worker(idx):
-                    try:
-                        log_debug(f"Worker: Ejecutando play_track({idx})", module="UI")
-                        ok = self.playback.play_track(idx)
-                        log_debug(f"Worker: play_track({idx}) = {ok}", module="UI")
-                    except Exception as e:
-                        log_error(f"Worker: Error en play_track({idx})", module="UI", exc=e)
-                    finally:
-                        self.state.needs_ui_refresh = True
-
-                threading.Thread(target=worker, args=(index,), daemon=True).start()
+                # La cola de navegación colapsa toques rápidos y no bloquea la petición
+                trace_id = tracer.begin("web", index)
+                if self.playback.request_navigation(index=index, trace_id=trace_id) is None:
+                    log_warning(f"Web: Track fuera de rango ({index})", module="UI")
+                    return "FAIL", 404
                 return ("", 204)
 
             except Exception as e:
                 log_error(f"Web: Error en /play", module="UI", exc=e)
                 return "FAIL", 500
 
+        @self.app.route('/next', methods=['POST'])
+        def next_track():
+            return self._navigate(1)
+
+        @self.app.route('/prev', methods=['POST'])
+        def prev_track():
+            return self._navigate(-1)
+
         @self.app.route('/stop', methods=['POST'])
         def stop():
             try:
                 log_info(f"📱 Web: Stop desde {request.remote_addr}", module="UI")
-                
-                def worker():
-                    log_debug("Worker: Ejecutando stop", module="UI")
-                    self.playback.stop()
-                    self.state.needs_ui_refresh = True
 
-                threading.Thread(target=worker, daemon=True).start()
+                # Directo al loop de reproducción, sin thread por petición
+                future = self.playback.aio.submit(self.playback.aio.stop())
+                future.add_done_callback(lambda f: setattr(self.state, "needs_ui_refresh", True))
                 return ("", 204)
 
             except Exception as e:
@@ -82,20 +106,10 @@ class WebControllerServer:
             """Toggle metrónomo - Retorna estado nuevo"""
             try:
                 log_info(f"📱 Web: Toggle metrónomo desde {request.remote_addr}", module="UI")
-                
-                def worker():
-                    log_debug("Worker: Toggle metrónomo", module="UI")
-                    self.playback.toggle_metronome()
-                    self.state.needs_ui_refresh = True
-
-                threading.Thread(target=worker, daemon=True).start()
-                
-                # Esperar un poquito a que se actualice el estado
-                import time
-                time.sleep(0.05)
-                
-                # Retornar estado actual
-                is_on = self.state.metronome_on
+
+                # Espera al loop de reproducción: devuelve el estado real, no uno supuesto
+                is_on = self.playback.toggle_metronome()
+                self.state.needs_ui_refresh = True
                 log_debug(f"Metrónomo: {'ON' if is_on else 'OFF'}", module="UI")
                 return jsonify({"state": is_on})
 
@@ -103,6 +117,162 @@ class WebControllerServer:
                 log_error("Web: Error en toggle metrónomo", module="UI", exc=e)
                 return jsonify({"error": str(e)}), 500
 
+        @self.app.route('/health', methods=['GET'])
+        def health():
+            """Estado de la conexión con Ableton"""
+            try:
+                from osc.health import monitor
+                return jsonify(monitor.snapshot())
+            except Exception as e:
+                log_error("Web: Error obteniendo estado de conexión", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/latency', methods=['GET'])
+        def latency():
+            """Latencia de lanzamiento: percentiles por etapa, histograma y últimas trazas"""
+            try:
+                return jsonify(tracer.snapshot())
+            except Exception as e:
+                log_error("Web: Error obteniendo latencias", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/autoadvance', methods=['GET', 'POST'])
+        def auto_advance():
+            """Consultar o cambiar el modo de auto-advance (off/segue/gap/stop)"""
+            try:
+                from core.autoadvance import autoadvance
+                if request.method == 'POST':
+                    mode = request.form.get("mode")
+                    log_info(f"📱 Web: Auto-advance {mode or 'siguiente modo'} desde {request.remote_addr}", module="UI")
+                    if mode is None:
+                        autoadvance.cycle_mode()
+                    elif not autoadvance.set_mode(mode):
+                        return jsonify({"error": f"Modo desconocido: {mode}"}), 400
+                return jsonify(autoadvance.snapshot())
+            except Exception as e:
+                log_error("Web: Error en auto-advance", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/quantize', methods=['GET', 'POST'])
+        def quantize():
+            """Consultar o cambiar la cuantización de lanzamientos (immediate/beat/bar/section)"""
+            try:
+                if request.method == 'POST':
+                    mode = request.form.get("mode", "")
+                    log_info(f"📱 Web: Cuantización {mode} desde {request.remote_addr}", module="UI")
+                    if not self.playback.set_quantize(mode):
+                        return jsonify({"error": f"Modo desconocido: {mode}"}), 400
+                return jsonify({"mode": self.playback.quantize})
+            except Exception as e:
+                log_error("Web: Error en cuantización", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/vamp', methods=['GET', 'POST'])
+        def section_vamp():
+            """Retener/soltar una sección (action=hold|release|toggle, track, section)"""
+            try:
+                from core.vamp import vamp
+                if request.method == 'POST':
+                    action = request.form.get("action", "toggle")
+                    log_info(f"📱 Web: Vamp {action} desde {request.remote_addr}", module="UI")
+                    if action == "release":
+                        vamp.release()
+                    elif action == "hold" and "track" in request.form and "section" in request.form:
+                        if not vamp.hold(int(request.form["track"]), int(request.form["section"])):
+                            return jsonify({"error": "Sección inválida"}), 400
+                    elif action == "hold":
+                        vamp.hold_current()
+                    else:
+                        vamp.toggle_current()
+                return jsonify(vamp.snapshot())
+            except Exception as e:
+                log_error("Web: Error en vamp", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/scan', methods=['GET', 'POST'])
+        def scan():
+            """Progreso del scan por etapas; POST action=start|cancel"""
+            try:
+                if request.method == 'POST':
+                    action = request.form.get("action", "start")
+                    log_info(f"📱 Web: Scan {action} desde {request.remote_addr}", module="UI")
+                    if action == "cancel":
+                        if not self.playback.cancel_scan():
+                            return jsonify({"error": "No hay scan en curso"}), 409
+                    elif self.playback.scan_pipeline.running:
+                        return jsonify({"error": "Scan ya en curso"}), 409
+                    else:
+                        def worker():
+                            if self.playback.scan_all():
+                                self.state.needs_ui_refresh = True
+
+                        threading.Thread(target=worker, daemon=True).start()
+                return jsonify(self.playback.scan_pipeline.snapshot())
+            except Exception as e:
+                log_error("Web: Error en scan", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/calibration', methods=['GET', 'POST'])
+        def calibration():
+            """Tiempos OSC vigentes; POST recalibra contra Ableton en background"""
+            try:
+                from core.calibration import timing
+                if request.method == 'POST':
+                    log_info(f"📱 Web: Calibración desde {request.remote_addr}", module="UI")
+                    threading.Thread(target=lambda: self.playback.calibrate(force=True), daemon=True).start()
+                    return jsonify(timing.snapshot()), 202
+                return jsonify(timing.snapshot())
+            except Exception as e:
+                log_error("Web: Error en calibración", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/search', methods=['GET'])
+        def search():
+            """Busca tracks y secciones en todos los setlists guardados (?q=...&limit=...)"""
+            try:
+                from setlist.manager import manager
+                query = request.args.get("q", "").strip()
+                limit = request.args.get("limit", type=int)
+                results = manager.search(query, limit=limit) if query else []
+                return jsonify({"query": query, "results": results})
+            except Exception as e:
+                log_error("Web: Error en búsqueda", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/setlists', methods=['GET'])
+        def setlists():
+            """Nº de setlists y cambios en la carpeta desde ?since=seq; ?wait=s espera hasta que haya alguno"""
+            try:
+                from setlist.manager import manager
+                from setlist.watcher import watcher
+                since = request.args.get("since", 0, type=int)
+                wait = min(max(request.args.get("wait", 0, type=float), 0.0), 25.0)
+                events = watcher.wait_events(since, wait) if wait else watcher.events_since(since)
+                return jsonify({
+                    "seq": watcher.seq,
+                    "count": len(manager.list_entries()),
+                    "events": events,
+                    "watcher": watcher.backend,
+                })
+            except Exception as e:
+                log_error("Web: Error en /setlists", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
+        @self.app.route('/events', methods=['GET'])
+        def events():
+            """Canal SSE: track actual, lista, transporte, metrónomo, tempo, beat, conexión, scan y setlists"""
+            try:
+                stream = self.events.open()
+                if stream is None:
+                    log_warning(f"Web: /events rechazado para {request.remote_addr} (máximo de conexiones)", module="UI")
+                    return jsonify({"error": "Demasiadas conexiones de eventos"}), 503
+                log_debug(f"📱 Web: eventos en vivo para {request.remote_addr}", module="UI")
+                return Response(stream, mimetype="text/event-stream",
+                                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+            except Exception as e:
+                log_error("Web: Error abriendo /events", module="UI", exc=e)
+                return jsonify({"error": str(e)}), 500
+
         @self.app.route('/metronome/status', methods=['GET'])
         def metronome_status():
             """Consultar estado actual del metrónomo"""
@@ -113,6 +283,68 @@ class WebControllerServer:
                 log_error("Web: Error obteniendo estado metrónomo", module="UI", exc=e)
                 return jsonify({"error": str(e)}), 500
 
+    def _setup_socket(self, sock):
+
+        @sock.route('/ws')
+        def command_socket(ws):
+            """Canal persistente de comandos con ack por id de correlación (ver osc.web_commands)"""
+            remote = request.remote_addr
+            with self._ws_lock:
+                if self._ws_clients >= WEB_SOCKET_MAX_CLIENTS:
+                    log_warning(f"WS: conexión rechazada para {remote} (máximo de conexiones)", module="UI")
+                    ws.close(reason=1013, message="Demasiadas conexiones")
+                    return
+                self._ws_clients += 1
+            log_info(f"📱 WS: conectado {remote}", module="UI")
+
+            send_lock = threading.Lock()
+            closed = threading.Event()
+
+            def reply(payload: dict):
+                # Los "done" llegan desde el loop de reproducción: envíos serializados
+                if closed.is_set():
+                    return
+                try:
+                    with send_lock:
+                        ws.send(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+                except Exception:
+                    closed.set()
+
+            try:
+                while not closed.is_set():
+                    raw = ws.receive()
+                    if raw is None:
+                        continue
+                    try:
+                        message = json.loads(raw)
+                        if not isinstance(message, dict):
+                            raise ValueError("se esperaba un objeto")
+                    except ValueError as e:
+                        reply({"type": "error", "error": f"Mensaje inválido: {e}"})
+                        continue
+                    self.commands.handle(message, reply, remote=remote)
+            except ConnectionClosed:
+                pass
+            except Exception as e:
+                log_error(f"WS: Error en la conexión de {remote}", module="UI", exc=e)
+            finally:
+                closed.set()
+                with self._ws_lock:
+                    self._ws_clients -= 1
+                log_info(f"📱 WS: desconectado {remote}", module="UI")
+
+    def _navigate(self, delta: int):
+        """Next/Prev relativo al objetivo pendiente - Retorna el track objetivo"""
+        try:
+            log_info(f"📱 Web: {'Next' if delta > 0 else 'Prev'} desde {request.remote_addr}", module="UI")
+            nav = self.playback.request_navigation(delta=delta, trace_id=tracer.begin("web"))
+            if nav is None:
+                return jsonify({"target": None})
+            return jsonify({"target": nav.target, "title": self.state.tracks[nav.target].title})
+        except Exception as e:
+            log_error("Web: Error en navegación", module="UI", exc=e)
+            return jsonify({"error": str(e)}), 500
+
     def start(self):
         def get_wifi_ip():
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -139,13 +371,6 @@ class WebControllerServer:
                 pass
             return None
 
-        def run():
-            try:
-                log_info(f"🌐 Iniciando servidor Flask en 0.0.0.0:{self.port}", module="UI")
-                self.app.run(host='0.0.0.0', port=self.port, debug=False, use_reloader=False)
-            except Exception as e:
-                log_error("Error en servidor Flask", module="UI", exc=e)
-
         local_ip = get_wifi_ip()
         tailscale_ip = get_tailscale_ip()
         
@@ -153,7 +378,7 @@ class WebControllerServer:
         if tailscale_ip:
             log_debug(f"IP Tailscale: {tailscale_ip}", module="UI")
         
-        threading.Thread(target=run, daemon=True).start()
+        self.serve()
 
         log_info("=" * 70, module="UI")
         log_info("🌐 Servidor Web Control Remoto Disponible:", module="UI")
@@ -161,4 +386,24 @@ class WebControllerServer:
         if tailscale_ip:
             log_info(f"   🔒 Tailscale VPN: http://{tailscale_ip}:{self.port}", module="UI")
         log_info("   💡 Abre desde tu móvil/tablet en la misma red", module="UI")
-        log_info("=" * 70, module="UI")
\ No newline at end of file
+        log_info("=" * 70, module="UI")
+
+    def serve(self):
+        """Arranca el backend HTTP; escucha ya al volver (un puerto ocupado falla aquí)"""
+        self.server = create_backend(self.backend, self.app, self.host, self.port, streaming=self._long_lived)
+        self.server.start()
+        self.port = self.server.port
+
+    @staticmethod
+    def _long_lived(environ) -> bool:
+        """Peticiones que duran (streams del backend): /events, /ws y el long-poll de /setlists"""
+        path = environ.get("PATH_INFO", "")
+        return path in ("/events", "/ws") or (path == "/setlists" and "wait=" in environ.get("QUERY_STRING", ""))
+
+    def stop(self, timeout: float = WEB_SERVER_SHUTDOWN_TIMEOUT):
+        """Cierra /events y espera a las peticiones en curso (como mucho `timeout`)"""
+        if self.server is None:
+            return
+        self.events.close()
+        self.server.stop(timeout)
+        self.server = None
@@ -0,0 +1,187 @@
+# setlist/autosave.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Autoguardado del setlist en memoria
+Observa los cambios de locators/tracks (scan, carga, reordenar, expandir),
+espera a que el estado se calme y escribe en un hilo propio una generación
+nueva en AUTOSAVE_DIR con escritura atómica. Se conservan las últimas
+AUTOSAVE_GENERATIONS para poder recuperar tras un cierre inesperado.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+from core.constants import (
+    AUTOSAVE_DIR, AUTOSAVE_DEBOUNCE, AUTOSAVE_MAX_DELAY, AUTOSAVE_GENERATIONS
+)
+from core.state import state, STRUCTURE_FIELDS
+from core.utils import atomic_write
+from setlist import codec
+from setlist.manager import manager
+from core.logger import log_info, log_error, log_warning, log_debug
+
+AUTOSAVE_PREFIX = "autosave-"
+
+
+class AutosaveWorker:
+    """Guarda el estado con debounce en background - Thread-safe"""
+
+    def __init__(self, directory: Path = AUTOSAVE_DIR, debounce: float = AUTOSAVE_DEBOUNCE,
+                 max_delay: float = AUTOSAVE_MAX_DELAY, generations: int = AUTOSAVE_GENERATIONS):
+        self.directory = Path(directory)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.generations = generations
+        self._cond = threading.Condition()
+        self._first_change: Optional[float] = None  # primer cambio pendiente (monotonic)
+        self._last_change: Optional[float] = None
+        self._saved_version: Optional[int] = None
+        self._saves = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        log_debug(f"AutosaveWorker inicializado ({self.directory})", module="Playback")
+
+    # ===== CICLO DE VIDA =====
+
+    def start(self):
+        """Empieza a observar el estado y arranca el hilo de guardado"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop_event.clear()
+        state.add_listener(self._on_change)
+        self._thread = threading.Thread(target=self._loop, name="Autosave", daemon=True)
+        self._thread.start()
+        log_info(f"💾 Autoguardado activo ({self.generations} generaciones)", module="Playback")
+
+    def stop(self, flush: bool = True):
+        """Deja de observar; con `flush` escribe lo pendiente antes de salir"""
+        state.remove_listener(self._on_change)
+        self._stop_event.set()
+        with self._cond:
+            pending = self._first_change is not None
+            self._first_change = self._last_change = None
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        if flush and pending:
+            self.save_now()
+
+    # ===== DEBOUNCE =====
+
+    def _on_change(self, field: str):
+        """Observador de AppState: solo marca y despierta al hilo (sin E/S)"""
+        if field not in STRUCTURE_FIELDS:
+            return  # Transporte/conexión: nada que guardar
+        now = time.monotonic()
+        with self._cond:
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._cond.notify_all()
+
+    def _due(self) -> Optional[float]:
+        if self._first_change is None:
+            return None
+        return min(self._last_change + self.debounce, self._first_change + self.max_delay)
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                due = self._due()
+                while not self._stop_event.is_set() and (due is None or time.monotonic() < due):
+                    self._cond.wait(None if due is None else due - time.monotonic())
+                    due = self._due()
+                if self._stop_event.is_set():
+                    return
+                self._first_change = self._last_change = None
+            try:
+                self.save_now()
+            except Exception as e:
+                log_error("Error en el autoguardado", module="Playback", exc=e)
+
+    # ===== GUARDADO =====
+
+    def save_now(self) -> Optional[Path]:
+        """Escribe una generación con el estado actual si cambió desde la última"""
+        version = state.structure_version
+        locators, tracks = state.locators, state.tracks
+        if state.structure_version != version:
+            self._on_change("retry")  # cambió mientras se copiaba: otra vuelta
+            return None
+        if not locators or version == self._saved_version:
+            return None
+
+        started = time.perf_counter()
+        data = codec.to_json("Autoguardado", time.strftime("%Y-%m-%d %H:%M:%S"), locators, tracks)
+
+        now = time.time()
+        path = self.directory / f"{AUTOSAVE_PREFIX}{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}.json"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, json.dumps(data, ensure_ascii=False))
+        except OSError as e:
+            log_error("No se pudo escribir el autoguardado", module="Playback", exc=e)
+            return None
+
+        self._saved_version = version
+        self._saves += 1
+        self._prune()
+        log_debug(f"💾 Autoguardado {path.name} ({len(tracks)} tracks, "
+                  f"{(time.perf_counter() - started) * 1000:.1f} ms)", module="Playback")
+        return path
+
+    def _files(self) -> List[Path]:
+        """Generaciones en disco, la más reciente primero"""
+        try:
+            return sorted(self.directory.glob(f"{AUTOSAVE_PREFIX}*.json"), reverse=True)
+        except OSError:
+            return []
+
+    def _prune(self):
+        for old in self._files()[self.generations:]:
+            try:
+                old.unlink()
+            except OSError as e:
+                log_warning(f"No se pudo borrar el autoguardado {old.name}: {e}", module="Playback")
+
+    # ===== RECUPERACIÓN =====
+
+    def generations_available(self) -> List[dict]:
+        """Autoguardados disponibles (más reciente primero) con tamaño y fecha"""
+        result = []
+        for path in self._files():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            result.append({"path": str(path), "name": path.name, "size": st.st_size, "mtime": st.st_mtime})
+        return result
+
+    def recover(self, generation: int = 0) -> Optional[dict]:
+        """Carga la generación pedida (0 = la última) como un setlist normal"""
+        files = self._files()
+        if not (0 <= generation < len(files)):
+            log_warning("No hay autoguardado que recuperar", module="Playback")
+            return None
+        log_info(f"♻ Recuperando autoguardado {files[generation].name}", module="Playback")
+        return manager.load(str(files[generation]))
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            pending = self._first_change is not None
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "pending": pending,
+            "saves": self._saves,
+            "saved_version": self._saved_version,
+            "generations": len(self._files()),
+        }
+
+# Instancia global
+autosave = AutosaveWorker()
+log_info("✓ Instancia global de AutosaveWorker creada", module="Playback")
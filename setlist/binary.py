@@ -0,0 +1,294 @@
+# setlist/binary.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Formato binario de setlist (.lcs)
+
+    cabecera   magic "LCS1", versión, contadores y offsets (HEADER)
+    locators   registros de ancho fijo (LOCATOR)
+    tracks     registros de ancho fijo (TRACK) con rango de secciones
+    sections   registros de ancho fijo (SECTION)
+    strings    tabla de offsets u32 (n + 1) + blob UTF-8 (nombres deduplicados)
+
+Todo little-endian. La carga usa mmap; las secciones de cada track se
+decodifican la primera vez que se accede a `track.sections`.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional
+from core.state import Track, Section, Locator
+from core.logger import log_info, log_error, log_warning, log_debug
+
+MAGIC = b"LCS1"
+FORMAT_VERSION = 1
+
+# magic, versión, flags, n_locators, n_tracks, n_sections, n_strings,
+# offset de la tabla de strings, nombre (idx), timestamp (idx)
+HEADER = struct.Struct("<4sHHIIIIIII")
+# id, original_id, nombre (idx), beat
+LOCATOR = struct.Struct("<iiId")
+# título (idx), start, end, track_number, start_locator_id (-1 = None), primera sección, nº secciones
+TRACK = struct.Struct("<IddiiII")
+# nombre (idx), beat, time, relative_beat
+SECTION = struct.Struct("<Iddd")
+OFFSET = struct.Struct("<I")
+
+NO_LOCATOR = -1
+
+
+class BinarySetlistError(ValueError):
+    """Archivo .lcs inválido o de una versión no soportada"""
+
+
+class StringTable:
+    """Tabla de strings deduplicada (escritura) / decodificada bajo demanda (lectura)"""
+
+    def __init__(self, offsets: Optional[List[int]] = None, blob: bytes = b""):
+        self._index: Dict[str, int] = {}
+        self._encoded: List[bytes] = []
+        self._offsets = offsets
+        self._blob = blob
+        self._decoded: Dict[int, str] = {}
+
+    def add(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self._encoded)
+            self._encoded.append(value.encode("utf-8"))
+        return idx
+
+    def pack(self) -> bytes:
+        offsets, position = [], 0
+        for data in self._encoded:
+            offsets.append(position)
+            position += len(data)
+        offsets.append(position)
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(self._encoded)
+
+    def __len__(self) -> int:
+        return len(self._encoded) if self._offsets is None else len(self._offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        value = self._decoded.get(idx)
+        if value is None:
+            value = self._decoded[idx] = self._blob[self._offsets[idx]:self._offsets[idx + 1]].decode("utf-8")
+        return value
+
+
+class LazySections(list):
+    """Lista de secciones que se decodifica en el primer acceso"""
+
+    def __init__(self, decode, count: int):
+        super().__init__()
+        self._decode = decode
+        self.count_hint = count  # nº de secciones sin decodificar
+
+    @property
+    def loaded(self) -> bool:
+        return self._decode is None
+
+    def fork(self) -> list:
+        """Lista independiente; si aún no se decodificó, lo hará una sola vez para ambas"""
+        if self.loaded:
+            return self.copy()
+        return LazySections(lambda: list(self), self.count_hint)
+
+    def _ensure(self):
+        if self._decode is not None:
+            decode, self._decode = self._decode, None
+            super().extend(decode())
+
+    def __len__(self):
+        self._ensure()
+        return super().__len__()
+
+    def __iter__(self):
+        self._ensure()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self._ensure()
+        return super().__reversed__()
+
+    def __getitem__(self, index):
+        self._ensure()
+        return super().__getitem__(index)
+
+    def __contains__(self, item):
+        self._ensure()
+        return super().__contains__(item)
+
+    def __eq__(self, other):
+        self._ensure()
+        return super().__eq__(other)
+
+    def __repr__(self):
+        self._ensure()
+        return super().__repr__()
+
+    def append(self, item):
+        self._ensure()
+        super().append(item)
+
+    def extend(self, items):
+        self._ensure()
+        super().extend(items)
+
+    def insert(self, index, item):
+        self._ensure()
+        super().insert(index, item)
+
+    def remove(self, item):
+        self._ensure()
+        super().remove(item)
+
+    def pop(self, *args):
+        self._ensure()
+        return super().pop(*args)
+
+    def sort(self, *args, **kwargs):
+        self._ensure()
+        super().sort(*args, **kwargs)
+
+    def index(self, *args):
+        self._ensure()
+        return super().index(*args)
+
+    def count(self, item):
+        self._ensure()
+        return super().count(item)
+
+    def copy(self):
+        self._ensure()
+        return list(super().__iter__())
+
+    __hash__ = None
+
+
+# ===== ESCRITURA =====
+
+def encode(name: str, timestamp: str, locators: list, tracks: Optional[list] = None) -> bytes:
+    """Serializa un setlist (objetos Locator/Track) a bytes .lcs"""
+    strings = StringTable()
+    name_idx, timestamp_idx = strings.add(name), strings.add(timestamp)
+
+    locator_blob = b"".join(
+        LOCATOR.pack(int(loc.id), int(loc.original_id), strings.add(loc.name), float(loc.beat))
+        for loc in locators
+    )
+
+    track_records, section_records = [], []
+    for track in tracks or []:
+        first = len(section_records)
+        for section in track.sections:
+            section_records.append(SECTION.pack(
+                strings.add(section.name), float(section.beat),
+                float(section.time if section.time is not None else section.beat),
+                float(section.relative_beat)
+            ))
+        track_records.append(TRACK.pack(
+            strings.add(track.title), float(track.start), float(track.end), int(track.track_number),
+            NO_LOCATOR if track.start_locator_id is None else int(track.start_locator_id),
+            first, len(section_records) - first
+        ))
+
+    body = locator_blob + b"".join(track_records) + b"".join(section_records)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0 if tracks is None else 1,
+                         len(locators), len(track_records), len(section_records), len(strings),
+                         HEADER.size + len(body), name_idx, timestamp_idx)
+    return header + body + strings.pack()
+
+
+# ===== LECTURA =====
+
+def _read_header(buf) -> tuple:
+    if len(buf) < HEADER.size:
+        raise BinarySetlistError("archivo truncado")
+    header = HEADER.unpack_from(buf, 0)
+    if header[0] != MAGIC:
+        raise BinarySetlistError("no es un setlist .lcs")
+    if header[1] != FORMAT_VERSION:
+        raise BinarySetlistError(f"versión .lcs no soportada: {header[1]}")
+    return header
+
+
+def _read_strings(buf, offset: int, count: int) -> StringTable:
+    table_end = offset + (count + 1) * OFFSET.size
+    offsets = list(struct.unpack_from(f"<{count + 1}I", buf, offset))
+    return StringTable(offsets, bytes(buf[table_end:table_end + offsets[-1]]))
+
+
+def decode(buf) -> dict:
+    """Deserializa bytes .lcs al mismo dict que SetlistManager.load produce desde JSON
+
+    Las secciones se copian como bloque de bytes y cada track las decodifica al
+    primer acceso, así que `buf` (p.ej. un mmap) puede cerrarse al volver.
+    """
+    _, _, flags, n_locators, n_tracks, n_sections, n_strings, strings_offset, name_idx, timestamp_idx = _read_header(buf)
+    strings = _read_strings(buf, strings_offset, n_strings)
+
+    offset = HEADER.size
+    locators = [
+        Locator(id=loc_id, original_id=original_id, name=strings[name], beat=beat)
+        for loc_id, original_id, name, beat in LOCATOR.iter_unpack(buf[offset:offset + n_locators * LOCATOR.size])
+    ]
+    offset += n_locators * LOCATOR.size
+
+    track_rows = list(TRACK.iter_unpack(buf[offset:offset + n_tracks * TRACK.size]))
+    offset += n_tracks * TRACK.size
+    sections_blob = bytes(buf[offset:offset + n_sections * SECTION.size])
+
+    def section_decoder(first: int, count: int):
+        def decode_sections():
+            start = first * SECTION.size
+            return [
+                Section(name=strings[name], beat=beat, time=time, relative_beat=relative)
+                for name, beat, time, relative in SECTION.iter_unpack(sections_blob[start:start + count * SECTION.size])
+            ]
+        return decode_sections
+
+    tracks = []
+    for title, start, end, number, locator_id, first, count in track_rows:
+        track = Track(
+            title=strings[title], start=start, end=end, track_number=number,
+            start_locator_id=None if locator_id == NO_LOCATOR else locator_id,
+            sections=LazySections(section_decoder(first, count), count)
+        )
+        tracks.append(track)
+
+    data = {"name": strings[name_idx], "timestamp": strings[timestamp_idx], "locators": locators}
+    if flags & 1:
+        data["tracks"] = tracks
+    return data
+
+
+def load(path: Path) -> dict:
+    """Carga un .lcs vía mmap"""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return decode(buf)
+
+
+def summarize_file(path: Path) -> dict:
+    """Metadatos para el catálogo leyendo solo cabecera, tracks y strings"""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            _, _, flags, n_locators, n_tracks, n_sections, n_strings, strings_offset, name_idx, timestamp_idx = _read_header(buf)
+            strings = _read_strings(buf, strings_offset, n_strings)
+            offset = HEADER.size + n_locators * LOCATOR.size
+            duration = sum(max(0.0, end - start) for _, start, end, *_ in
+                           TRACK.iter_unpack(buf[offset:offset + n_tracks * TRACK.size]))
+            if not n_tracks and n_locators:
+                beats = [beat for *_, beat in LOCATOR.iter_unpack(buf[HEADER.size:offset])]
+                duration = max(beats) - min(beats)
+    return {
+        "name": strings[name_idx],
+        "timestamp": strings[timestamp_idx],
+        "tracks": n_tracks,
+        "sections": n_sections,
+        "locators": n_locators,
+        "duration_beats": round(duration, 3),
+    }
@@ -0,0 +1,133 @@
+# setlist/cache.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Caché LRU de setlists deserializados
+Clave: ruta del archivo; validez: (mtime_ns, size). Cada acierto devuelve listas
+nuevas y Tracks clonados superficialmente, así que la UI puede mutarlos
+(expandir, reordenar) sin tocar la copia cacheada.
+"""
+
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from core.constants import SETLIST_CACHE_BUDGET_MB, SETLIST_CACHE_MAX_ENTRIES
+from core.state import Section
+from setlist.binary import LazySections
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+def _estimate_size(data: dict) -> int:
+    """Tamaño aproximado en memoria de un setlist deserializado (bytes)"""
+    def obj_size(obj) -> int:
+        size = sys.getsizeof(obj) + sys.getsizeof(obj.__dict__)
+        return size + sum(sys.getsizeof(v) for v in obj.__dict__.values() if isinstance(v, str))
+
+    size = sys.getsizeof(data)
+    for loc in data.get("locators", []):
+        size += obj_size(loc)
+    section_size = None
+    for track in data.get("tracks", []):
+        size += obj_size(track) + sys.getsizeof(track.sections)
+        sections = track.sections
+        if isinstance(sections, LazySections) and not sections.loaded:
+            # Sin decodificar: estimación por registro (no forzar el mmap perezoso)
+            section_size = section_size or obj_size(Section("", 0.0))
+            size += sections.count_hint * section_size
+        else:
+            size += sum(obj_size(section) for section in sections)
+    return size
+
+
+def clone(data: dict) -> dict:
+    """Copia barata: listas nuevas y Tracks nuevos; Locators y Sections compartidos
+
+    Locators y Sections no se mutan tras la carga; de los Tracks la UI cambia
+    `expanded`, por eso se clonan. Las secciones perezosas (.lcs) se bifurcan
+    sin decodificarlas.
+    """
+    def copy_sections(sections):
+        return sections.fork() if isinstance(sections, LazySections) else list(sections)
+
+    copy = dict(data)
+    copy["locators"] = list(data.get("locators", []))
+    if "tracks" in data:
+        copy["tracks"] = [dataclasses.replace(t, sections=copy_sections(t.sections)) for t in data["tracks"]]
+    return copy
+
+
+class SetlistCache:
+    """LRU con presupuesto de memoria - Thread-safe"""
+
+    def __init__(self, budget_bytes: int = SETLIST_CACHE_BUDGET_MB * 1024 * 1024,
+                 max_entries: int = SETLIST_CACHE_MAX_ENTRIES):
+        self.budget_bytes = budget_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def signature(stat) -> Tuple[int, int]:
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key: str, signature: Tuple[int, int]) -> Optional[dict]:
+        """Clon del setlist cacheado si el archivo no cambió; None si no está o caducó"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                if entry is not None:
+                    self._drop(key)
+                    log_debug(f"Caché: '{key}' modificado en disco, invalidado", module="Playback")
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            data = entry[1]
+        return clone(data)
+
+    def put(self, key: str, signature: Tuple[int, int], data: dict) -> dict:
+        """Guarda el setlist recién deserializado y devuelve un clon para el llamante"""
+        size = _estimate_size(data)
+        if size > self.budget_bytes:
+            log_debug(f"Caché: '{key}' ({size // 1024} KB) supera el presupuesto, sin cachear", module="Playback")
+            return clone(data)
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (signature, data, size)
+            self._bytes += size
+            while self._entries and (self._bytes > self.budget_bytes or len(self._entries) > self.max_entries):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                log_debug(f"Caché: expulsado '{oldest}'", module="Playback")
+        return clone(data)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Invalida una entrada o toda la caché"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
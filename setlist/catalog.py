@@ -0,0 +1,227 @@
+# setlist/catalog.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Índice de setlists (.catalog.json)
+Guarda por archivo nombre, fecha, nº de tracks/secciones/locators, duración,
+formato (.json/.lcs) y mtime/size. Solo se vuelve a leer un setlist cuando su mtime o tamaño cambian,
+así que listar y previsualizar cientos de setlists no parsea ninguno.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from core.constants import SETLISTS_DIR
+from core.utils import atomic_write
+from setlist import binary
+from core.logger import log_info, log_error, log_warning, log_debug
+
+CATALOG_NAME = ".catalog.json"
+CATALOG_VERSION = 2
+SETLIST_SUFFIXES = (".lcs", ".json")  # por preferencia si un stem existe en ambos formatos
+
+
+def summarize(data: dict) -> dict:
+    """Metadatos de un setlist a partir de su JSON (dicts, no objetos)"""
+    tracks = data.get("tracks") or []
+    locators = data.get("locators") or []
+    if tracks:
+        duration = sum(max(0.0, float(t["end"]) - float(t["start"])) for t in tracks)
+    elif locators:
+        beats = [float(loc["beat"]) for loc in locators]
+        duration = max(beats) - min(beats)
+    else:
+        duration = 0.0
+    return {
+        "name": data.get("name", ""),
+        "timestamp": data.get("timestamp", ""),
+        "tracks": len(tracks),
+        "sections": sum(len(t.get("sections", [])) for t in tracks),
+        "locators": len(locators),
+        "duration_beats": round(duration, 3),
+    }
+
+
+def scan_setlists(directory: Path) -> Dict[str, os.DirEntry]:
+    """stem → entrada de directorio de cada setlist (sin abrirlos)"""
+    files = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(".") or not entry.is_file():
+                continue
+            stem, suffix = os.path.splitext(name)
+            suffix = suffix.lower()
+            if suffix not in SETLIST_SUFFIXES:
+                continue
+            current = files.get(stem)
+            if current is None or SETLIST_SUFFIXES.index(suffix) < SETLIST_SUFFIXES.index(os.path.splitext(current.name)[1].lower()):
+                files[stem] = entry
+    return files
+
+
+def preferred_file(directory: Path, stem: str) -> Optional[Path]:
+    """Archivo vigente de un stem (.lcs antes que .json); None si no queda ninguno"""
+    for suffix in SETLIST_SUFFIXES:
+        candidate = directory / f"{stem}{suffix}"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+class SetlistCatalog:
+    """Índice persistente de setlists revalidado por mtime/size - Thread-safe"""
+
+    def __init__(self, directory: Path = SETLISTS_DIR):
+        self.directory = Path(directory)
+        self.path = self.directory / CATALOG_NAME
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, dict]] = None  # stem → entrada
+        self.watched = False  # SetlistWatcher aplica los cambios: refresh() no recorre el directorio
+        log_debug(f"SetlistCatalog inicializado ({self.path})", module="Playback")
+
+    # ===== PERSISTENCIA =====
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION and isinstance(data.get("entries"), dict):
+                return data["entries"]
+            log_debug("Catálogo de otra versión, se reconstruye", module="Playback")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log_warning(f"Catálogo ilegible, se reconstruye: {e}", module="Playback")
+        return {}
+
+    def _write(self, entries: Dict[str, dict]):
+        try:
+            atomic_write(self.path, json.dumps({"version": CATALOG_VERSION, "entries": entries}, ensure_ascii=False))
+        except OSError as e:
+            log_error("No se pudo guardar el catálogo de setlists", module="Playback", exc=e)
+
+    # ===== REVALIDACIÓN =====
+
+    def _scan_files(self) -> Dict[str, os.DirEntry]:
+        return scan_setlists(self.directory)
+
+    @staticmethod
+    def _read_summary(path: Path) -> Optional[dict]:
+        try:
+            if path.suffix.lower() == ".lcs":
+                return binary.summarize_file(path)
+            with open(path, "r", encoding="utf-8") as f:
+                return summarize(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log_warning(f"Setlist ilegible en el catálogo: {path.name} ({e})", module="Playback")
+            return None
+
+    def refresh(self) -> Dict[str, dict]:
+        """Sincroniza el índice con el directorio; solo relee archivos con mtime/size distintos"""
+        with self._lock:
+            if self.watched and self._entries is not None:
+                return dict(self._entries)
+            entries = self._entries if self._entries is not None else self._read()
+            changed = self._entries is None and not self.path.exists()
+
+            files = self._scan_files()
+            for stem in [s for s in entries if s not in files]:
+                del entries[stem]
+                changed = True
+
+            reparsed = 0
+            for stem, dir_entry in files.items():
+                st = dir_entry.stat()
+                fmt = os.path.splitext(dir_entry.name)[1].lower().lstrip(".")
+                entry = entries.get(stem)
+                if (entry is not None and entry.get("format") == fmt
+                        and entry.get("mtime") == st.st_mtime and entry.get("size") == st.st_size):
+                    continue
+                summary = self._read_summary(Path(dir_entry.path))
+                if summary is None:
+                    entries.pop(stem, None)
+                    continue
+                entries[stem] = {**summary, "stem": stem, "format": fmt, "mtime": st.st_mtime, "size": st.st_size}
+                reparsed += 1
+                changed = True
+
+            self._entries = entries
+            if changed:
+                self._write(entries)
+            if reparsed:
+                log_debug(f"Catálogo: {reparsed} setlist(s) reindexado(s), {len(entries)} en total", module="Playback")
+            return dict(entries)
+
+    # ===== API =====
+
+    def entries(self) -> List[dict]:
+        """Entradas ordenadas por nombre de archivo"""
+        return [entry for _, entry in sorted(self.refresh().items())]
+
+    def get(self, stem: str) -> Optional[dict]:
+        """Metadatos de un setlist para la previsualización"""
+        return self.refresh().get(stem)
+
+    def record(self, path: Path, summary: dict):
+        """Registra un setlist recién guardado sin volver a leerlo"""
+        self.record_many([(path, summary)])
+
+    def record_many(self, items, replace: bool = False):
+        """Registra varios (ruta, resumen) con una sola escritura; `replace` descarta el resto"""
+        with self._lock:
+            entries = {} if replace else (self._entries if self._entries is not None else self._read())
+            for path, summary in items:
+                stem, fmt = path.stem, path.suffix.lower().lstrip(".")
+                try:
+                    st = path.stat()
+                except OSError as e:
+                    log_warning(f"No se pudo indexar '{stem}': {e}", module="Playback")
+                    continue
+                entries[stem] = {**summary, "stem": stem, "format": fmt, "mtime": st.st_mtime, "size": st.st_size}
+            self._entries = entries
+            self._write(entries)
+
+    def apply(self, stems) -> Dict[str, str]:
+        """Revalida solo los stems indicados (eventos del watcher), sin recorrer el directorio
+
+        Devuelve stem → "added" | "modified" | "removed" de lo que cambió en el índice.
+        """
+        changes = {}
+        with self._lock:
+            entries = self._entries if self._entries is not None else self._read()
+            for stem in stems:
+                path = preferred_file(self.directory, stem)
+                entry = entries.get(stem)
+                if path is None:
+                    if entries.pop(stem, None) is not None:
+                        changes[stem] = "removed"
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                fmt = path.suffix.lower().lstrip(".")
+                if (entry is not None and entry.get("format") == fmt
+                        and entry.get("mtime") == st.st_mtime and entry.get("size") == st.st_size):
+                    continue
+                summary = self._read_summary(path)
+                if summary is None:
+                    continue
+                entries[stem] = {**summary, "stem": stem, "format": fmt, "mtime": st.st_mtime, "size": st.st_size}
+                changes[stem] = "modified" if entry is not None else "added"
+            self._entries = entries
+            if changes:
+                self._write(entries)
+        return changes
+
+    def forget(self, stem: str):
+        """Quita un setlist del índice (borrado)"""
+        with self._lock:
+            entries = self._entries if self._entries is not None else self._read()
+            if entries.pop(stem, None) is not None:
+                self._entries = entries
+                self._write(entries)
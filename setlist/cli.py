@@ -0,0 +1,426 @@
+# setlist/cli.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+livecue-setlists: importar, exportar, validar y reindexar bibliotecas de setlists
+
+Cada archivo se procesa en un pool de procesos (parseo, validación,
+conversión y escritura); el proceso principal solo junta resultados y
+actualiza catálogo e índice de búsqueda con una escritura cada uno.
+
+Uso:
+    python -m setlist.cli validate [RUTA ...] [--strict]
+    python -m setlist.cli import ORIGEN [ORIGEN ...] [--format lcs] [--overwrite]
+    python -m setlist.cli export DESTINO [--format json] [--overwrite]
+    python -m setlist.cli reindex
+    python -m setlist.cli migrate [--db RUTA] [--no-history] [--overwrite]
+    python -m setlist.cli compile [NOMBRE ...]
+
+Con SETLIST_STORAGE = "sqlite", import y export trabajan contra la base de
+datos y reindex no hace nada (los índices son de SQLite).
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+from core.logger import get_logger
+
+SUFFIXES = (".lcs", ".json")
+
+
+def _quiet_console():
+    """Solo avisos y errores por consola: la salida del comando es el informe"""
+    logging.disable(logging.INFO)  # sin el banner de sesión por consola
+    try:
+        get_logger()
+    finally:
+        logging.disable(logging.NOTSET)
+    for handler in logging.getLogger("LiveCue").handlers:
+        if not isinstance(handler, logging.FileHandler):
+            handler.setLevel(logging.WARNING)
+
+
+# ===== VALIDACIÓN =====
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate(data) -> Tuple[List[str], List[str]]:
+    """Errores y avisos de un setlist en forma JSON"""
+    errors, warnings = [], []
+    if not isinstance(data, dict):
+        return ["la raíz no es un objeto"], warnings
+
+    locators = data.get("locators")
+    if not isinstance(locators, list):
+        errors.append("falta la lista 'locators'")
+        locators = []
+    if not locators:
+        warnings.append("sin locators")
+
+    ids, positions, original_ids = {}, {}, set()
+    for i, loc in enumerate(locators):
+        where = f"locator #{i}"
+        if not isinstance(loc, dict):
+            errors.append(f"{where}: no es un objeto")
+            continue
+        if not isinstance(loc.get("id"), int):
+            errors.append(f"{where}: 'id' debe ser entero")
+        if not isinstance(loc.get("name"), str):
+            errors.append(f"{where}: 'name' debe ser texto")
+        if not _is_number(loc.get("beat")):
+            errors.append(f"{where}: 'beat' debe ser numérico")
+            continue
+        if loc.get("id") in ids:
+            errors.append(f"{where}: id {loc['id']} duplicado (ya en locator #{ids[loc['id']]})")
+        ids.setdefault(loc.get("id"), i)
+        key = (loc.get("name"), float(loc["beat"]))
+        if key in positions:
+            warnings.append(f"{where}: '{loc.get('name')}' repetido en el beat {loc['beat']} (locator #{positions[key]})")
+        positions.setdefault(key, i)
+        original_ids.add(loc.get("original_id", loc.get("id")))
+
+    tracks = data.get("tracks", [])
+    if not isinstance(tracks, list):
+        errors.append("'tracks' debe ser una lista")
+        tracks = []
+    for i, track in enumerate(tracks):
+        where = f"track #{i}"
+        if not isinstance(track, dict):
+            errors.append(f"{where}: no es un objeto")
+            continue
+        title = track.get("title")
+        if isinstance(title, str):
+            where = f"track #{i} '{title}'"
+        else:
+            errors.append(f"{where}: 'title' debe ser texto")
+        start, end = track.get("start"), track.get("end")
+        if not (_is_number(start) and _is_number(end)):
+            errors.append(f"{where}: 'start'/'end' deben ser numéricos")
+            continue
+        if end <= start:
+            errors.append(f"{where}: end ({end}) <= start ({start})")
+        if not isinstance(track.get("track_number"), int):
+            errors.append(f"{where}: 'track_number' debe ser entero")
+        locator_id = track.get("start_locator_id")
+        if locator_id is not None and locator_id not in original_ids:
+            warnings.append(f"{where}: start_locator_id {locator_id} no existe entre los locators")
+        sections = track.get("sections", [])
+        if not isinstance(sections, list):
+            errors.append(f"{where}: 'sections' debe ser una lista")
+            continue
+        for j, section in enumerate(sections):
+            if not isinstance(section, dict) or not isinstance(section.get("name"), str) or not _is_number(section.get("beat")):
+                errors.append(f"{where}, sección #{j}: requiere 'name' (texto) y 'beat' (numérico)")
+            elif not start <= section["beat"] <= end:
+                warnings.append(f"{where}, sección '{section['name']}': beat {section['beat']} fuera del track")
+    return errors, warnings
+
+
+# ===== TRABAJO POR ARCHIVO (procesos del pool) =====
+
+def _read(path: Path) -> dict:
+    """Setlist en forma JSON, venga de .json o de .lcs"""
+    if path.suffix.lower() == ".lcs":
+        from setlist import binary, codec
+        data = binary.load(path)
+        data["locators"] = [codec.serialize_locator(loc) for loc in data["locators"]]
+        if "tracks" in data:
+            data["tracks"] = [codec.serialize_track(t) for t in data["tracks"]]
+        return data
+    import json
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(data: dict, destination: Path):
+    """Escribe `data` (forma JSON) en el formato que indica la extensión de destino"""
+    from setlist import codec
+    codec.write_file(destination, data.get("name", destination.stem), data.get("timestamp", ""),
+                     data["locators"], data.get("tracks"), data=data)
+
+
+def _process(task: tuple) -> dict:
+    """Lee, valida y (según la acción) convierte un archivo. Corre en un proceso del pool"""
+    action, source, destination, overwrite = task
+    source = Path(source)
+    result = {"source": str(source), "errors": [], "warnings": [], "written": None}
+    try:
+        data = _read(source)
+    except Exception as e:
+        result["errors"].append(f"ilegible: {e}")
+        return result
+
+    result["errors"], result["warnings"] = validate(data)
+    if result["errors"]:
+        return result
+
+    if action in ("import", "export"):
+        destination = Path(destination)
+        if destination.exists() and not overwrite:
+            result["warnings"].append(f"{destination.name} ya existe (usa --overwrite)")
+            return result
+        try:
+            _write(data, destination)
+            result["written"] = str(destination)
+        except Exception as e:
+            result["errors"].append(f"no se pudo escribir {destination}: {e}")
+            return result
+
+    if action in ("import", "reindex"):
+        from setlist.catalog import summarize
+        from setlist.search import extract
+        result["summary"] = summarize(data)
+        result["doc"] = {"name": data.get("name", ""), "tracks": extract(data)}
+    elif action == "migrate":
+        result["data"] = data
+    return result
+
+
+# ===== ORQUESTACIÓN =====
+
+def _collect(paths: List[Path]) -> List[Path]:
+    """Setlists de las rutas dadas (archivos o directorios, sin recursión)"""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir()
+                                if p.is_file() and p.suffix.lower() in SUFFIXES and not p.name.startswith(".")))
+        elif path.suffix.lower() in SUFFIXES:
+            files.append(path)
+        else:
+            print(f"⚠️  Ignorado (no es .json/.lcs ni directorio): {path}")
+    return files
+
+
+def _run(tasks: List[tuple], workers: Optional[int]) -> List[dict]:
+    if not tasks:
+        return []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 8:
+        return [_process(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_quiet_console) as pool:
+        return list(pool.map(_process, tasks, chunksize=chunksize))
+
+
+def _report(results: List[dict], started: float, strict: bool = False) -> int:
+    failed = warned = written = 0
+    for result in results:
+        name = Path(result["source"]).name
+        for error in result["errors"]:
+            print(f"✖ {name}: {error}")
+        for warning in result["warnings"]:
+            print(f"⚠️  {name}: {warning}")
+        failed += bool(result["errors"]) or (strict and bool(result["warnings"]))
+        warned += bool(result["warnings"])
+        written += bool(result["written"])
+    print(f"{len(results)} setlist(s) · {failed} con errores · {warned} con avisos · "
+          f"{written} escrito(s) · {time.perf_counter() - started:.2f} s")
+    return 1 if failed else 0
+
+
+def _index(results: List[dict], replace: bool):
+    """Catálogo e índice de búsqueda con una escritura cada uno"""
+    from setlist.manager import manager
+    store = manager.store
+    indexed = [(Path(r["written"] or r["source"]), r) for r in results if "summary" in r and not r["errors"]]
+    store.catalog.record_many([(path, r["summary"]) for path, r in indexed], replace=replace)
+    store.search_index.update_many([(path, r["doc"]) for path, r in indexed], replace=replace)
+    store.cache.invalidate()
+
+
+def _store_to_db(results: List[dict], db, stems: dict, history=None, overwrite: bool = False) -> int:
+    """Vuelca a SQLite los setlists leídos por el pool (con su historial si se pasa)"""
+    items = []
+    for result in results:
+        if result["errors"] or "data" not in result:
+            continue
+        stem = stems[result["source"]]
+        items.append((stem, result["data"], history.records(stem) if history else []))
+    written = set(db.import_many(items, replace=overwrite))
+    for result in results:
+        if result.pop("data", None) is None or result["errors"]:
+            continue
+        if stems[result["source"]] in written:
+            result["written"] = str(db.path)
+        else:
+            result["warnings"].append(f"'{stems[result['source']]}' ya está en {db.path.name} (usa --overwrite)")
+    return len(written)
+
+
+def _sqlite_store():
+    """El SQLiteStore del gestor si es el almacén configurado; None con el de directorio"""
+    from setlist.manager import manager
+    from setlist.storage import SQLiteStore
+    return manager.store if isinstance(manager.store, SQLiteStore) else None
+
+
+def cmd_validate(args) -> int:
+    from core.constants import SETLISTS_DIR
+    started = time.perf_counter()
+    files = _collect([Path(p) for p in args.paths] or [SETLISTS_DIR])
+    return _report(_run([("validate", str(f), None, False) for f in files], args.workers), started, args.strict)
+
+
+def cmd_import(args) -> int:
+    from core.constants import SETLISTS_DIR
+    from core.utils import sanitize_filename
+    started = time.perf_counter()
+    db = _sqlite_store()
+    tasks, seen = [], {}
+    for source in _collect([Path(p) for p in args.sources]):
+        stem = sanitize_filename(source.stem)
+        if stem in seen:
+            print(f"⚠️  {source.name}: mismo nombre que {seen[stem].name}, se omite")
+            continue
+        seen[stem] = source
+        if db is not None:
+            tasks.append(("migrate", str(source), None, False))
+            continue
+        suffix = f".{args.format}" if args.format else source.suffix.lower()
+        tasks.append(("import", str(source), str(SETLISTS_DIR / f"{stem}{suffix}"), args.overwrite))
+
+    results = _run(tasks, args.workers)
+    if db is not None:
+        # Almacén SQLite: los procesos solo leen y validan, la escritura es una transacción
+        _store_to_db(results, db, {str(source): stem for stem, source in seen.items()}, overwrite=args.overwrite)
+        return _report(results, started)
+    # Un stem, un archivo: como en SetlistManager.save
+    for result in results:
+        if result["written"]:
+            written = Path(result["written"])
+            for suffix in SUFFIXES:
+                other = written.with_suffix(suffix)
+                if other != written and other.exists():
+                    other.unlink()
+    _index(results, replace=False)
+    return _report(results, started)
+
+
+def cmd_export(args) -> int:
+    from core.constants import SETLISTS_DIR
+    from setlist.catalog import scan_setlists
+    started = time.perf_counter()
+    destination = Path(args.destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    db = _sqlite_store()
+    if db is not None:
+        results = []
+        for stem in db.stems():
+            target = destination / f"{stem}.{args.format or 'json'}"
+            result = {"source": f"{stem} ({db.path.name})", "errors": [], "warnings": [], "written": None}
+            if target.exists() and not args.overwrite:
+                result["warnings"].append(f"{target.name} ya existe (usa --overwrite)")
+            else:
+                _write(db.load_json(stem), target)
+                result["written"] = str(target)
+            results.append(result)
+        return _report(results, started)
+    tasks = []
+    for stem, entry in sorted(scan_setlists(SETLISTS_DIR).items()):
+        suffix = f".{args.format}" if args.format else os.path.splitext(entry.name)[1].lower()
+        tasks.append(("export", entry.path, str(destination / f"{stem}{suffix}"), args.overwrite))
+    return _report(_run(tasks, args.workers), started)
+
+
+def cmd_reindex(args) -> int:
+    from core.constants import SETLISTS_DIR
+    from setlist.catalog import scan_setlists
+    started = time.perf_counter()
+    if _sqlite_store() is not None:
+        print("El almacén SQLite mantiene sus índices al guardar: no hay nada que reindexar")
+        return 0
+    tasks = [("reindex", entry.path, None, False) for _, entry in sorted(scan_setlists(SETLISTS_DIR).items())]
+    results = _run(tasks, args.workers)
+    _index(results, replace=True)
+    return _report(results, started)
+
+
+def cmd_migrate(args) -> int:
+    from core.constants import SETLISTS_DIR, SETLIST_DB_PATH
+    from setlist.catalog import scan_setlists
+    from setlist.history import SetlistHistory
+    from setlist.storage import SQLiteStore
+    started = time.perf_counter()
+    source = Path(args.source) if args.source else SETLISTS_DIR
+    db = SQLiteStore(Path(args.db) if args.db else SETLIST_DB_PATH)
+    files = sorted(scan_setlists(source).items())
+    results = _run([("migrate", entry.path, None, False) for _, entry in files], args.workers)
+    history = None if args.no_history else SetlistHistory(source / ".history")
+    migrated = _store_to_db(results, db, {entry.path: stem for stem, entry in files}, history, overwrite=args.overwrite)
+    db.close()
+    print(f"🗄 {migrated} setlist(s) migrado(s) a {db.path}")
+    return _report(results, started)
+
+
+def cmd_compile(args) -> int:
+    from setlist.manager import manager
+    from setlist.show import compile_setlist, ShowCompileError
+    started = time.perf_counter()
+    results = []
+    for stem in args.names or manager.list_all():
+        result = {"source": stem, "errors": [], "warnings": [], "written": None}
+        data = manager.store.load(stem)
+        if data is None:
+            result["errors"].append("no existe en el almacén de setlists")
+        else:
+            try:
+                result["written"] = str(compile_setlist(stem, data))
+            except ShowCompileError as e:
+                result["errors"].extend(e.errors)
+        results.append(result)
+    return _report(results, started)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="livecue-setlists",
+                                     description="Importa, exporta, valida y reindexa bibliotecas de setlists de LiveCue")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto: nº de CPUs)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("validate", help="Valida setlists (por defecto, la carpeta de setlists)")
+    p.add_argument("paths", nargs="*", help="Archivos .json/.lcs o directorios")
+    p.add_argument("--strict", action="store_true", help="Los avisos también cuentan como error")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("import", help="Importa archivos o directorios a la carpeta de setlists")
+    p.add_argument("sources", nargs="+", help="Archivos .json/.lcs o directorios")
+    p.add_argument("--format", choices=("json", "lcs"), help="Convierte al formato indicado")
+    p.add_argument("--overwrite", action="store_true", help="Sobrescribe setlists existentes")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="Exporta todos los setlists a un directorio")
+    p.add_argument("destination", help="Directorio de destino")
+    p.add_argument("--format", choices=("json", "lcs"), help="Convierte al formato indicado")
+    p.add_argument("--overwrite", action="store_true", help="Sobrescribe archivos existentes")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("reindex", help="Reconstruye catálogo e índice de búsqueda desde cero")
+    p.set_defaults(func=cmd_reindex)
+
+    p = sub.add_parser("compile", help="Compila setlists guardados a shows .lcshow para el directo")
+    p.add_argument("names", nargs="*", help="Setlists a compilar (por defecto, todos)")
+    p.set_defaults(func=cmd_compile)
+
+    p = sub.add_parser("migrate", help="Copia los setlists .json/.lcs (y su historial) a la base de datos SQLite")
+    p.add_argument("--source", help="Directorio de setlists (por defecto, la carpeta de setlists)")
+    p.add_argument("--db", help="Base de datos de destino (por defecto, SETLIST_DB_PATH)")
+    p.add_argument("--no-history", action="store_true", help="Solo la versión actual, sin el historial")
+    p.add_argument("--overwrite", action="store_true", help="Sustituye setlists que ya estén en la base de datos")
+    p.set_defaults(func=cmd_migrate)
+
+    args = parser.parse_args(argv)
+    _quiet_console()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# setlist/codec.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Conversión de setlists entre objetos (Locator/Track/Section), su forma JSON
+y los archivos .json/.lcs. Compartido por el gestor, los almacenes y la CLI.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+from core.state import Track, Section, Locator
+from core.utils import atomic_write
+from setlist import binary
+from setlist.catalog import summarize
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+def serialize_locator(loc) -> dict:
+    """Convierte Locator a dict"""
+    if isinstance(loc, Locator):
+        return {
+            "id": loc.id,
+            "original_id": loc.original_id,
+            "name": loc.name,
+            "beat": loc.beat
+        }
+    return loc  # Ya es dict
+
+
+def deserialize_locator(data: dict) -> Locator:
+    """Convierte dict a Locator"""
+    return Locator(
+        id=data.get("id"),
+        original_id=data.get("original_id", data.get("id")),
+        name=data["name"],
+        beat=data["beat"]
+    )
+
+
+def serialize_track(track) -> dict:
+    """Convierte Track a dict"""
+    if isinstance(track, Track):
+        return {
+            "title": track.title,
+            "start": track.start,
+            "end": track.end,
+            "track_number": track.track_number,
+            "start_locator_id": track.start_locator_id,
+            "expanded": track.expanded,
+            "sections": [
+                {
+                    "name": sec.name,
+                    "beat": sec.beat,
+                    "time": sec.time,
+                    "relative_beat": sec.relative_beat
+                }
+                for sec in track.sections
+            ]
+        }
+    return track  # Ya es dict
+
+
+def deserialize_track(data: dict) -> Track:
+    """Convierte dict a Track"""
+    track = Track(
+        title=data["title"],
+        start=data["start"],
+        end=data["end"],
+        track_number=data["track_number"],
+        start_locator_id=data.get("start_locator_id"),
+        expanded=data.get("expanded", False)
+    )
+
+    for sec_data in data.get("sections", []):
+        section = Section(
+            name=sec_data["name"],
+            beat=sec_data["beat"],
+            time=sec_data.get("time", sec_data["beat"]),
+            relative_beat=sec_data.get("relative_beat", 0)
+        )
+        track.sections.append(section)
+
+    return track
+
+
+def to_json(name: str, timestamp: str, locators: list, tracks: list = None) -> dict:
+    """Setlist en su forma JSON (la del archivo .json, el historial y los almacenes)"""
+    data = {
+        "name": name,
+        "timestamp": timestamp,
+        "locators": [serialize_locator(loc) for loc in locators],
+    }
+    if tracks:
+        data["tracks"] = [serialize_track(track) for track in tracks]
+    return data
+
+
+def from_json(data: dict) -> dict:
+    """Copia de `data` con locators y tracks convertidos a objetos"""
+    data = dict(data)
+    data["locators"] = [deserialize_locator(loc) for loc in data.get("locators", [])]
+    if "tracks" in data:
+        data["tracks"] = [deserialize_track(t) for t in data["tracks"]]
+    return data
+
+
+def read_file(path: Path) -> dict:
+    """Setlist con objetos desde .lcs (vía mmap, secciones perezosas) o .json"""
+    if path.suffix.lower() == ".lcs":
+        return binary.load(path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data = from_json(data)
+    sections_count = sum(len(t.sections) for t in data.get("tracks", []))
+    log_debug(f"Deserializados {len(data['locators'])} locators, {len(data.get('tracks', []))} tracks "
+              f"con {sections_count} secciones", module="Playback")
+    return data
+
+
+def write_file(path: Path, name: str, timestamp: str, locators: list, tracks: list = None,
+               data: Optional[dict] = None) -> dict:
+    """Escribe el archivo (atómico) según su extensión y devuelve el resumen para el catálogo"""
+    if tracks:
+        sections_count = sum(len(t.sections) if isinstance(t, Track) else len(t.get("sections", [])) for t in tracks)
+        log_debug(f"Serializando {len(tracks)} tracks con {sections_count} secciones", module="Playback")
+
+    if path.suffix.lower() == ".lcs":
+        locators = [loc if isinstance(loc, Locator) else deserialize_locator(loc) for loc in locators]
+        tracks = [t if isinstance(t, Track) else deserialize_track(t) for t in tracks] if tracks else None
+        atomic_write(path, binary.encode(name, timestamp, locators, tracks))
+        return binary.summarize_file(path)
+
+    if data is None:
+        data = to_json(name, timestamp, locators, tracks)
+    atomic_write(path, json.dumps(data, indent=2, ensure_ascii=False))
+    return summarize(data)
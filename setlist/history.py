@@ -0,0 +1,252 @@
+# setlist/history.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Historial de versiones de setlists
+Cada guardado añade una línea a SETLISTS_DIR/.history/<stem>.jsonl:
+
+    {"v": 1, "k": "full", "ts": ..., "data": {...}}     fotograma completo
+    {"v": 2, "k": "delta", "ts": ..., "ops": {...}}     cambios respecto a v-1
+
+Los deltas copian por rangos lo que no cambió de las listas (tracks,
+locators, secciones) y solo guardan lo nuevo; un track con el mismo título
+se describe por sus campos y secciones cambiados. Cada
+SETLIST_HISTORY_KEYFRAME_EVERY versiones (o si el delta no compensa) se
+escribe un fotograma completo, así reconstruir cualquier versión aplica como
+mucho ese número de deltas.
+"""
+
+import json
+import os
+import threading
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from core.constants import SETLISTS_DIR, SETLIST_HISTORY_KEYFRAME_EVERY
+from core.logger import log_info, log_error, log_warning, log_debug
+
+HISTORY_DIRNAME = ".history"
+KEYFRAME_MARK = b'"k": "full"'
+
+# Identidad de los elementos de cada lista para describir cambios en vez de reemplazos
+ITEM_KEYS = {
+    "tracks": "title",
+    "locators": "id",
+}
+
+
+# ===== DELTAS =====
+
+def _item_key(item) -> str:
+    return json.dumps(item, sort_keys=True, ensure_ascii=False)
+
+
+def diff_list(old: list, new: list, identity: Optional[str] = None) -> list:
+    """Operaciones que transforman `old` en `new`
+
+    [i, n]          copia old[i:i + n]
+    {"+": x}        elemento nuevo x
+    {"@": i, "d"}   old[i] con el delta de dict "d"
+    """
+    matcher = SequenceMatcher(None, [_item_key(x) for x in old], [_item_key(x) for x in new], autojunk=False)
+    by_identity = {}
+    if identity:
+        for i, item in enumerate(old):
+            if isinstance(item, dict):
+                by_identity.setdefault(item.get(identity), i)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2 - i1])
+            continue
+        for item in new[j1:j2]:
+            source = by_identity.get(item.get(identity)) if identity and isinstance(item, dict) else None
+            if source is not None:
+                ops.append({"@": source, "d": diff_dict(old[source], item)})
+            else:
+                ops.append({"+": item})
+    return ops
+
+
+def apply_list(old: list, ops: list) -> list:
+    new = []
+    for op in ops:
+        if isinstance(op, list):
+            new.extend(old[op[0]:op[0] + op[1]])
+        elif "+" in op:
+            new.append(op["+"])
+        else:
+            new.append(apply_dict(old[op["@"]], op["d"]))
+    return new
+
+
+def diff_dict(old: dict, new: dict) -> dict:
+    """Delta entre dicts: campos cambiados, borrados y listas anidadas por diff_list"""
+    delta = {}
+    changed = {}
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        if isinstance(value, list) and isinstance(old.get(key), list):
+            delta.setdefault("lists", {})[key] = diff_list(old[key], value, ITEM_KEYS.get(key))
+        else:
+            changed[key] = value
+    if changed:
+        delta["set"] = changed
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta["del"] = removed
+    return delta
+
+
+def apply_dict(old: dict, delta: dict) -> dict:
+    new = dict(old)
+    for key in delta.get("del", []):
+        new.pop(key, None)
+    new.update(delta.get("set", {}))
+    for key, ops in delta.get("lists", {}).items():
+        new[key] = apply_list(old.get(key, []), ops)
+    return new
+
+
+# ===== REGISTROS =====
+
+def make_record(previous: Optional[Tuple[int, dict]], data: dict, keyframe_every: int) -> dict:
+    """Registro de la versión siguiente a `previous` (versión, datos): delta o fotograma completo"""
+    version = previous[0] + 1 if previous else 1
+    record = {"v": version, "k": "full", "ts": time.time(), "data": data}
+    if previous is not None and (version - 1) % keyframe_every:
+        delta = {"v": version, "k": "delta", "ts": record["ts"], "ops": diff_dict(previous[1], data)}
+        full_size = len(json.dumps(data, ensure_ascii=False))
+        # Un delta mayor que media copia completa no compensa
+        if len(json.dumps(delta, ensure_ascii=False)) < full_size // 2:
+            record = delta
+    return record
+
+
+def replay(records) -> Optional[dict]:
+    """Datos tras aplicar en orden registros que empiezan por un fotograma completo"""
+    data = None
+    for record in records:
+        data = record["data"] if record["k"] == "full" else apply_dict(data, record["ops"])
+    return data
+
+
+# ===== HISTORIAL =====
+
+class SetlistHistory:
+    """Historial append-only por setlist con deltas y fotogramas periódicos - Thread-safe"""
+
+    def __init__(self, directory: Path = SETLISTS_DIR / HISTORY_DIRNAME,
+                 keyframe_every: int = SETLIST_HISTORY_KEYFRAME_EVERY):
+        self.directory = Path(directory)
+        self.keyframe_every = max(1, keyframe_every)
+        self._lock = threading.Lock()
+        self._last: Dict[str, Tuple[int, dict]] = {}  # stem → (versión, datos) del último guardado
+        log_debug(f"SetlistHistory inicializado ({self.directory})", module="Playback")
+
+    def _path(self, stem: str) -> Path:
+        return self.directory / f"{stem}.jsonl"
+
+    def _lines(self, stem: str) -> List[bytes]:
+        """Líneas completas del historial (una línea final cortada se descarta)"""
+        try:
+            raw = self._path(stem).read_bytes()
+        except FileNotFoundError:
+            return []
+        lines = raw.split(b"\n")
+        if lines and lines[-1] == b"":
+            lines.pop()
+        elif lines:
+            log_warning(f"Historial de '{stem}' con la última línea incompleta, se ignora", module="Playback")
+            lines.pop()
+        return lines
+
+    @staticmethod
+    def _is_keyframe(line: bytes) -> bool:
+        return KEYFRAME_MARK in line[:48]
+
+    def _rebuild(self, lines: List[bytes], index: int) -> dict:
+        """Datos de la versión en la línea `index`: último fotograma + deltas"""
+        start = index
+        while start > 0 and not self._is_keyframe(lines[start]):
+            start -= 1
+        return replay(json.loads(line) for line in lines[start:index + 1])
+
+    # ===== API =====
+
+    def record(self, stem: str, data: dict) -> Optional[int]:
+        """Añade `data` (setlist ya serializado a JSON) como nueva versión; devuelve su número"""
+        with self._lock:
+            try:
+                previous = self._last.get(stem)
+                lines = None
+                if previous is None:
+                    lines = self._lines(stem)
+                    if lines:
+                        previous = (json.loads(lines[-1])["v"], self._rebuild(lines, len(lines) - 1))
+
+                record = make_record(previous, data, self.keyframe_every)
+                version = record["v"]
+
+                self.directory.mkdir(parents=True, exist_ok=True)
+                line = json.dumps(record, ensure_ascii=False, separators=(",", ": ")).encode("utf-8")
+                with open(self._path(stem), "ab") as f:
+                    f.write(line + b"\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                self._last[stem] = (version, data)
+                log_debug(f"Historial '{stem}': v{version} ({record['k']}, {len(line)} bytes)", module="Playback")
+                return version
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                log_error(f"No se pudo registrar la versión de '{stem}'", module="Playback", exc=e)
+                return None
+
+    def versions(self, stem: str) -> List[dict]:
+        """Versiones registradas (más antigua primero) sin reconstruir ninguna"""
+        result = []
+        for line in self._lines(stem):
+            record = json.loads(line)
+            result.append({"version": record["v"], "kind": record["k"], "ts": record["ts"], "bytes": len(line)})
+        return result
+
+    def records(self, stem: str) -> List[dict]:
+        """Registros tal cual están en disco (para migrarlos a otro almacén)"""
+        return [json.loads(line) for line in self._lines(stem)]
+
+    def reconstruct(self, stem: str, version: Optional[int] = None) -> Optional[dict]:
+        """Setlist (JSON) de la versión pedida; None si no existe. Sin versión: la última"""
+        lines = self._lines(stem)
+        if not lines:
+            return None
+        if version is None:
+            index = len(lines) - 1
+        else:
+            # Las versiones son consecutivas desde 1; se comprueba por si el archivo se editó
+            index = version - 1
+            if not (0 <= index < len(lines)) or json.loads(lines[index])["v"] != version:
+                index = next((i for i, line in enumerate(lines) if json.loads(line)["v"] == version), None)
+                if index is None:
+                    return None
+        return self._rebuild(lines, index)
+
+    def forget(self, stem: str):
+        """Borra el historial de un setlist"""
+        with self._lock:
+            self._last.pop(stem, None)
+            try:
+                self._path(stem).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self, stem: str) -> dict:
+        lines = self._lines(stem)
+        return {
+            "versions": len(lines),
+            "keyframes": sum(1 for line in lines if self._is_keyframe(line)),
+            "bytes": sum(len(line) + 1 for line in lines),
+        }
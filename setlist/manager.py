@@ -2,21 +2,25 @@
 # Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
 # NO uso comercial sin autorización - mcolladorguez@gmail.com
 
-"""Gestor de setlists con serialización/deserialización JSON"""
+"""Gestor de setlists: guarda, carga y lista sobre el almacén configurado (directorio o SQLite)"""
 
 import json
 import time
 from pathlib import Path
-from core.constants import SETLISTS_DIR  # ← Ya usa AppData automáticamente
-from core.state import Track, Section, Locator
+from typing import Optional
+from core.constants import SETLISTS_DIR, SETLIST_STREAM_MIN_BYTES  # ← Ya usa AppData automáticamente
+from setlist import binary, codec
+from setlist.catalog import SETLIST_SUFFIXES
+from setlist.storage import SetlistStore, DirectoryStore, create_store
+from setlist.stream import StreamingLoad
 from core.logger import log_info, log_error, log_warning, log_debug
 
 class SetlistManager:
     """Gestor de setlists con serialización/deserialización"""
     
-    def __init__(self):
-        SETLISTS_DIR.mkdir(parents=True, exist_ok=True)
-        log_debug(f"SetlistManager inicializado (directorio: {SETLISTS_DIR})", module="Playback")
+    def __init__(self, store: SetlistStore = None):
+        self.store = store or create_store()
+        log_debug(f"SetlistManager inicializado (almacén: {self.store.kind})", module="Playback")
     
     @staticmethod
     def _sanitize_filename(name: str) -> str:
@@ -26,34 +30,27 @@ class SetlistManager:
         log_debug(f"Nombre sanitizado: '{name}' → '{sanitized}'", module="Playback")
         return sanitized
     
-    def save(self, name: str, locators: list, tracks: list = None) -> bool:
-        """Guarda un setlist en JSON"""
-        log_info(f"💾 Guardando setlist: '{name}'", module="Playback")
+    @staticmethod
+    def _external(name: str) -> Optional[Path]:
+        """Ruta de archivo si `name` la indica (extensión .json/.lcs); None si es un nombre de setlist"""
+        path = Path(name)
+        if path.suffix.lower() in SETLIST_SUFFIXES:
+            return path if path.is_absolute() else SETLISTS_DIR / path
+        return None
+    
+    def save(self, name: str, locators: list, tracks: list = None, fmt: str = None) -> bool:
+        """Guarda un setlist (fmt: "json" | "lcs", solo en el almacén de directorio)"""
+        log_info(f"💾 Guardando setlist: '{name}'" + (f" ({fmt})" if fmt else ""), module="Playback")
         
         try:
             if not locators:
                 log_warning("No hay locators para guardar", module="Playback")
                 return False
             
-            filepath = SETLISTS_DIR / f"{self._sanitize_filename(name)}.json"
-            log_debug(f"Ruta destino: {filepath}", module="Playback")
-            
-            data = {
-                "name": name,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "locators": [self._serialize_locator(loc) for loc in locators],
-            }
-            
-            if tracks:
-                data["tracks"] = [self._serialize_track(track) for track in tracks]
-                sections_count = sum(len(t.sections) for t in tracks)
-                log_debug(f"Serializando {len(tracks)} tracks con {sections_count} secciones", module="Playback")
-            
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            file_size = filepath.stat().st_size
-            log_info(f"✓ Setlist guardado: '{filepath.name}' ({file_size} bytes)", module="Playback")
+            stem = self._sanitize_filename(name)
+            data = codec.to_json(name, time.strftime("%Y-%m-%d %H:%M:%S"), locators, tracks)
+            where = self.store.save(stem, data, locators, tracks, fmt=fmt)
+            log_info(f"✓ Setlist guardado: {where}", module="Playback")
             return True
             
         except Exception as e:
@@ -61,118 +58,170 @@ class SetlistManager:
             return False
     
     def load(self, name: str) -> dict:
-        """Carga un setlist desde JSON"""
+        """Carga un setlist por nombre, o un archivo .lcs/.json si `name` lleva extensión"""
         log_info(f"📂 Cargando setlist: '{name}'", module="Playback")
         
         try:
-            filepath = SETLISTS_DIR / f"{name}.json"
+            filepath = self._external(name)
+            if filepath is not None:
+                data = self.store.load_file(filepath) if filepath.exists() else None
+            else:
+                data = self.store.load(name)
             
-            if not filepath.exists():
-                log_error(f"Setlist no encontrado: {filepath}", module="Playback")
+            if data is None:
+                log_error(f"Setlist no encontrado: {filepath or name}", module="Playback")
                 return None
             
-            log_debug(f"Leyendo archivo: {filepath}", module="Playback")
-            
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            # Deserializar objetos
-            locators_count = len(data.get("locators", []))
-            data["locators"] = [self._deserialize_locator(loc) for loc in data.get("locators", [])]
-            log_debug(f"Deserializados {locators_count} locators", module="Playback")
-            
-            if "tracks" in data:
-                tracks_count = len(data["tracks"])
-                data["tracks"] = [self._deserialize_track(t) for t in data["tracks"]]
-                sections_count = sum(len(t.sections) for t in data["tracks"])
-                log_debug(f"Deserializados {tracks_count} tracks con {sections_count} secciones", module="Playback")
-            
-            timestamp = data.get("timestamp", "desconocido")
-            log_info(f"✓ Setlist cargado: '{name}' (guardado: {timestamp})", module="Playback")
+            log_info(f"✓ Setlist cargado: '{name}' (guardado: {data.get('timestamp', 'desconocido')})", module="Playback")
             return data
             
         except json.JSONDecodeError as e:
             log_error(f"Archivo JSON corrupto: '{name}'", module="Playback", exc=e)
             return None
+        except binary.BinarySetlistError as e:
+            log_error(f"Archivo .lcs corrupto: '{name}'", module="Playback", exc=e)
+            return None
         except Exception as e:
             log_error(f"Error cargando setlist '{name}'", module="Playback", exc=e)
             return None
     
-    def list_all(self) -> list:
-        """Lista todos los setlists guardados"""
+    def load_streaming(self, name: str, on_batch=None, on_done=None) -> Optional[StreamingLoad]:
+        """Como load(), pero un .json grande vuelve con la cabecera y los primeros tracks
+
+        El resto se decodifica en segundo plano (ver setlist.stream). Archivos
+        pequeños, .lcs y el almacén SQLite se cargan enteros y vuelven ya
+        completos, sin llamar a on_batch/on_done.
+        """
+        filepath = self._external(name)
+        if filepath is None and isinstance(self.store, DirectoryStore):
+            filepath = self.store.resolve(name)
         try:
-            setlists = sorted([f.stem for f in SETLISTS_DIR.glob("*.json")])
-            log_debug(f"Setlists encontrados: {len(setlists)}", module="Playback")
-            return setlists
+            streamable = (filepath is not None and filepath.suffix.lower() == ".json"
+                          and filepath.stat().st_size >= SETLIST_STREAM_MIN_BYTES)
+        except OSError:
+            streamable = False
+
+        if not streamable:
+            data = self.load(name)
+            return StreamingLoad.completed(data) if data is not None else None
+
+        log_info(f"📂 Cargando setlist por streaming: '{name}' ({filepath.stat().st_size // 1024} KB)", module="Playback")
+        try:
+            return StreamingLoad(filepath, on_batch=on_batch, on_done=on_done).start()
+        except json.JSONDecodeError as e:
+            log_error(f"Archivo JSON corrupto: '{name}'", module="Playback", exc=e)
+            return None
         except Exception as e:
-            log_error("Error listando setlists", module="Playback", exc=e)
+            log_error(f"Error cargando setlist '{name}'", module="Playback", exc=e)
+            return None
+    
+    def search(self, query: str, limit: int = None) -> list:
+        """Busca en títulos de track y nombres de sección de todos los setlists guardados"""
+        try:
+            started = time.perf_counter()
+            results = self.store.search(query, **({"limit": limit} if limit else {}))
+            log_debug(f"🔍 '{query}': {len(results)} resultado(s) en {(time.perf_counter() - started) * 1000:.1f} ms", module="Playback")
+            return results
+        except Exception as e:
+            log_error(f"Error buscando '{query}'", module="Playback", exc=e)
             return []
     
-    @staticmethod
-    def _serialize_locator(loc) -> dict:
-        """Convierte Locator a dict"""
-        if isinstance(loc, Locator):
-            return {
-                "id": loc.id,
-                "original_id": loc.original_id,
-                "name": loc.name,
-                "beat": loc.beat
-            }
-        return loc  # Ya es dict
+    def versions(self, name: str) -> list:
+        """Versiones guardadas de un setlist (más antigua primero)"""
+        try:
+            return self.store.versions(self._sanitize_filename(name))
+        except Exception as e:
+            log_error(f"Error leyendo versiones de '{name}'", module="Playback", exc=e)
+            return []
     
-    @staticmethod
-    def _deserialize_locator(data: dict) -> Locator:
-        """Convierte dict a Locator"""
-        return Locator(
-            id=data.get("id"),
-            original_id=data.get("original_id", data.get("id")),
-            name=data["name"],
-            beat=data["beat"]
-        )
+    def load_version(self, name: str, version: int = None) -> dict:
+        """Reconstruye una versión anterior de un setlist (sin tocar el archivo actual)"""
+        stem = self._sanitize_filename(name)
+        log_info(f"🕘 Cargando versión {version or 'última'} de '{stem}'", module="Playback")
+        try:
+            data = self.store.reconstruct(stem, version)
+            if data is None:
+                log_warning(f"Versión {version} de '{stem}' no encontrada", module="Playback")
+                return None
+            return codec.from_json(data)
+        except Exception as e:
+            log_error(f"Error reconstruyendo la versión {version} de '{stem}'", module="Playback", exc=e)
+            return None
     
-    @staticmethod
-    def _serialize_track(track) -> dict:
-        """Convierte Track a dict"""
-        if isinstance(track, Track):
-            return {
-                "title": track.title,
-                "start": track.start,
-                "end": track.end,
-                "track_number": track.track_number,
-                "start_locator_id": track.start_locator_id,
-                "sections": [
-                    {
-                        "name": sec.name,
-                        "beat": sec.beat,
-                        "time": sec.time,
-                        "relative_beat": sec.relative_beat
-                    }
-                    for sec in track.sections
-                ]
-            }
-        return track  # Ya es dict
+    def convert(self, name: str, fmt: str) -> bool:
+        """Reescribe un setlist guardado en otro formato ("json" | "lcs")"""
+        data = self.load(name)
+        if data is None:
+            return False
+        return self.save(data.get("name") or name, data["locators"], data.get("tracks"), fmt=fmt)
     
-    @staticmethod
-    def _deserialize_track(data: dict) -> Track:
-        """Convierte dict a Track"""
-        track = Track(
-            title=data["title"],
-            start=data["start"],
-            end=data["end"],
-            track_number=data["track_number"],
-            start_locator_id=data.get("start_locator_id")
-        )
-        
-        for sec_data in data.get("sections", []):
-            section = Section(
-                name=sec_data["name"],
-                beat=sec_data["beat"],
-                time=sec_data.get("time", sec_data["beat"]),
-                relative_beat=sec_data.get("relative_beat", 0)
-            )
-            track.sections.append(section)
-        
-        return track
+    def export(self, name: str, destination) -> bool:
+        """Exporta un setlist a un archivo externo; el formato sale de su extensión"""
+        destination = Path(destination)
+        if destination.suffix.lower() not in SETLIST_SUFFIXES:
+            log_error(f"Extensión de exportación no soportada: '{destination.suffix}'", module="Playback")
+            return False
+        data = self.load(name)
+        if data is None:
+            return False
+        try:
+            codec.write_file(destination, data.get("name") or name, data.get("timestamp", ""), data["locators"], data.get("tracks"))
+            log_info(f"📤 Setlist '{name}' exportado a {destination}", module="Playback")
+            return True
+        except Exception as e:
+            log_error(f"Error exportando setlist '{name}'", module="Playback", exc=e)
+            return False
+    
+    def import_file(self, source, fmt: str = None) -> Optional[str]:
+        """Importa un .json/.lcs externo al almacén de setlists; devuelve su stem"""
+        source = Path(source)
+        data = self.load(str(source.resolve()))
+        if data is None:
+            return None
+        name = data.get("name") or source.stem
+        if not self.save(name, data["locators"], data.get("tracks"), fmt=fmt):
+            return None
+        log_info(f"📥 Setlist importado desde {source}", module="Playback")
+        return self._sanitize_filename(name)
+    
+    def compile_show(self, name: str) -> Optional[Path]:
+        """Compila el setlist guardado a un show .lcshow (bundles OSC pre-codificados)"""
+        from setlist.show import compile_setlist, ShowCompileError
+        stem = self._sanitize_filename(name)
+        data = self.load(stem)
+        if data is None:
+            return None
+        try:
+            return compile_setlist(stem, data)
+        except ShowCompileError as e:
+            for error in e.errors:
+                log_error(f"Show '{stem}': {error}", module="Playback")
+            return None
+        except Exception as e:
+            log_error(f"Error compilando el show '{stem}'", module="Playback", exc=e)
+            return None
+    
+    def list_all(self) -> list:
+        """Lista todos los setlists guardados (desde el catálogo)"""
+        return [entry["stem"] for entry in self.list_entries()]
+    
+    def list_entries(self) -> list:
+        """Setlists guardados con sus metadatos (nombre, tracks, secciones, duración...)"""
+        try:
+            entries = self.store.entries()
+            log_debug(f"Setlists encontrados: {len(entries)}", module="Playback")
+            return entries
+        except Exception as e:
+            log_error("Error listando setlists", module="Playback", exc=e)
+            return []
+    
+    def preview(self, name: str) -> dict:
+        """Metadatos de un setlist sin cargarlo"""
+        try:
+            return self.store.get(name)
+        except Exception as e:
+            log_error(f"Error leyendo metadatos de '{name}'", module="Playback", exc=e)
+            return None
 
 # Instancia global
 manager = SetlistManager()
@@ -0,0 +1,338 @@
+# setlist/search.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Búsqueda de texto en todos los setlists guardados
+Índice invertido token → (setlist, track, sección) sobre títulos de track y
+nombres de sección. Los documentos extraídos se guardan en .search.json y se
+revalidan por mtime/size como el catálogo; solo se relee lo que cambió.
+
+Cada término de la consulta casa por token exacto, por prefijo (bisect sobre
+el vocabulario ordenado) o, si no hay nada, por distancia de edición acotada.
+Todos los términos deben casar en el mismo track.
+"""
+
+import json
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from core.constants import SETLISTS_DIR, SEARCH_MAX_RESULTS, SEARCH_PREFIX_LIMIT
+from core.utils import atomic_write
+from setlist import binary
+from setlist.catalog import scan_setlists, preferred_file
+from core.logger import log_info, log_error, log_warning, log_debug
+
+INDEX_NAME = ".search.json"
+INDEX_VERSION = 1
+TITLE = -1  # índice de sección para el título del track
+
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.8
+SCORE_FUZZY = 0.6
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=16384)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Minúsculas sin acentos, separado por cualquier cosa que no sea letra o dígito
+
+    Cacheado: títulos y nombres de sección se repiten mucho entre setlists.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return tuple(_TOKEN_RE.findall(text))
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein con corte: devuelve limit + 1 en cuanto se supera `limit`"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _fuzzy_limit(term: str) -> int:
+    return 0 if len(term) < 3 else 1 if len(term) < 6 else 2
+
+
+def extract(data: dict) -> List[list]:
+    """[[título, [secciones...]], ...] de un setlist JSON (dicts) u objetos Track"""
+    tracks = []
+    for track in data.get("tracks") or []:
+        if isinstance(track, dict):
+            tracks.append([track["title"], [s["name"] for s in track.get("sections", [])]])
+        else:
+            tracks.append([track.title, [s.name for s in track.sections]])
+    return tracks
+
+
+class SearchIndex:
+    """Índice invertido incremental de los setlists - Thread-safe"""
+
+    def __init__(self, directory: Path = SETLISTS_DIR):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_NAME
+        self._lock = threading.Lock()
+        self._docs: Optional[Dict[str, dict]] = None                   # stem → {name, mtime, size, tracks}
+        self._postings: Dict[str, Set[Tuple[str, int, int]]] = defaultdict(set)
+        self._tokens_by_stem: Dict[str, Set[str]] = {}
+        self._vocab: List[str] = []
+        self._vocab_by_len: Dict[int, List[str]] = {}
+        self._vocab_dirty = True
+        self.watched = False  # SetlistWatcher aplica los cambios: refresh() no recorre el directorio
+        log_debug(f"SearchIndex inicializado ({self.path})", module="Playback")
+
+    # ===== PERSISTENCIA =====
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and isinstance(data.get("docs"), dict):
+                return data["docs"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log_warning(f"Índice de búsqueda ilegible, se reconstruye: {e}", module="Playback")
+        return {}
+
+    def _write(self):
+        try:
+            atomic_write(self.path, json.dumps({"version": INDEX_VERSION, "docs": self._docs}, ensure_ascii=False))
+        except OSError as e:
+            log_error("No se pudo guardar el índice de búsqueda", module="Playback", exc=e)
+
+    @staticmethod
+    def _read_doc(path: Path) -> Optional[dict]:
+        try:
+            if path.suffix.lower() == ".lcs":
+                data = binary.load(path)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            return {"name": data.get("name", ""), "tracks": extract(data)}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log_warning(f"Setlist ilegible para el índice: {path.name} ({e})", module="Playback")
+            return None
+
+    # ===== POSTINGS =====
+
+    def _add_postings(self, stem: str, doc: dict):
+        tokens = set()
+        for ti, (title, sections) in enumerate(doc["tracks"]):
+            for token in tokenize(title):
+                self._postings[token].add((stem, ti, TITLE))
+                tokens.add(token)
+            for si, section in enumerate(sections):
+                for token in tokenize(section):
+                    self._postings[token].add((stem, ti, si))
+                    tokens.add(token)
+        self._tokens_by_stem[stem] = tokens
+        self._vocab_dirty = True
+
+    def _remove_postings(self, stem: str):
+        for token in self._tokens_by_stem.pop(stem, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.difference_update([p for p in postings if p[0] == stem])
+            if not postings:
+                del self._postings[token]
+        self._vocab_dirty = True
+
+    def _ensure_vocab(self):
+        if not self._vocab_dirty:
+            return
+        self._vocab = sorted(self._postings)
+        by_len = defaultdict(list)
+        for token in self._vocab:
+            by_len[len(token)].append(token)
+        self._vocab_by_len = dict(by_len)
+        self._vocab_dirty = False
+
+    # ===== REVALIDACIÓN =====
+
+    def refresh(self) -> int:
+        """Sincroniza con el directorio; devuelve cuántos setlists se releyeron"""
+        with self._lock:
+            first_load = self._docs is None
+            if self.watched and not first_load:
+                return 0
+            if first_load:
+                self._docs = self._read()
+                for stem, doc in self._docs.items():
+                    self._add_postings(stem, doc)
+
+            files = scan_setlists(self.directory)
+            changed = first_load and not self.path.exists()
+            for stem in [s for s in self._docs if s not in files]:
+                self._remove_postings(stem)
+                del self._docs[stem]
+                changed = True
+
+            reread = 0
+            for stem, entry in files.items():
+                st = entry.stat()
+                doc = self._docs.get(stem)
+                if doc is not None and doc.get("mtime") == st.st_mtime and doc.get("size") == st.st_size:
+                    continue
+                new_doc = self._read_doc(Path(entry.path))
+                self._remove_postings(stem)
+                if new_doc is None:
+                    self._docs.pop(stem, None)
+                    continue
+                self._docs[stem] = {**new_doc, "mtime": st.st_mtime, "size": st.st_size}
+                self._add_postings(stem, self._docs[stem])
+                reread += 1
+                changed = True
+
+            if changed:
+                self._write()
+            if reread:
+                log_debug(f"Búsqueda: {reread} setlist(s) reindexado(s), {len(self._docs)} en total", module="Playback")
+            return reread
+
+    def update(self, path: Path, data: dict):
+        """Reindexa un setlist recién guardado sin volver a leerlo"""
+        self.update_many([(path, {"name": data.get("name", ""), "tracks": extract(data)})])
+
+    def update_many(self, items, replace: bool = False):
+        """Indexa varios (ruta, {name, tracks}) con una sola escritura; `replace` descarta el resto"""
+        with self._lock:
+            if replace:
+                self._docs = {}
+                self._postings.clear()
+                self._tokens_by_stem.clear()
+                self._vocab_dirty = True
+            elif self._docs is None:
+                self._docs = self._read()
+                for stem, doc in self._docs.items():
+                    self._add_postings(stem, doc)
+            for path, doc in items:
+                try:
+                    st = path.stat()
+                except OSError as e:
+                    log_warning(f"No se pudo indexar '{path.stem}': {e}", module="Playback")
+                    continue
+                stem = path.stem
+                self._remove_postings(stem)
+                self._docs[stem] = {"name": doc.get("name", ""), "tracks": doc["tracks"],
+                                    "mtime": st.st_mtime, "size": st.st_size}
+                self._add_postings(stem, self._docs[stem])
+            self._write()
+
+    def apply(self, stems):
+        """Revalida solo los stems indicados (eventos del watcher), sin recorrer el directorio"""
+        with self._lock:
+            if self._docs is None:
+                return  # aún sin cargar: el primer refresh() lo verá todo
+            changed = False
+            for stem in stems:
+                path = preferred_file(self.directory, stem)
+                if path is None:
+                    if self._docs.pop(stem, None) is not None:
+                        self._remove_postings(stem)
+                        changed = True
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                doc = self._docs.get(stem)
+                if doc is not None and doc.get("mtime") == st.st_mtime and doc.get("size") == st.st_size:
+                    continue
+                new_doc = self._read_doc(path)
+                if new_doc is None:
+                    continue
+                self._remove_postings(stem)
+                self._docs[stem] = {**new_doc, "mtime": st.st_mtime, "size": st.st_size}
+                self._add_postings(stem, self._docs[stem])
+                changed = True
+            if changed:
+                self._write()
+
+    # ===== CONSULTA =====
+
+    def _expand(self, term: str, fuzzy: bool) -> Dict[str, float]:
+        """Tokens del vocabulario que casan con `term` y su peso"""
+        matches = {}
+        if term in self._postings:
+            matches[term] = SCORE_EXACT
+        start = bisect_left(self._vocab, term)
+        for token in self._vocab[start:start + SEARCH_PREFIX_LIMIT]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, SCORE_PREFIX)
+        if not matches and fuzzy:
+            limit = _fuzzy_limit(term)
+            for length in range(len(term) - limit, len(term) + limit + 1):
+                for token in self._vocab_by_len.get(length, ()):
+                    distance = _edit_distance(term, token, limit)
+                    if distance <= limit:
+                        matches[token] = max(matches.get(token, 0), SCORE_FUZZY - 0.1 * distance)
+        return matches
+
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS, fuzzy: bool = True) -> List[dict]:
+        """Tracks de cualquier setlist que contienen todos los términos (título o secciones)"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self.refresh()
+
+        with self._lock:
+            self._ensure_vocab()
+            combined = None
+            for term in terms:
+                hits: Dict[Tuple[str, int], list] = {}
+                for token, weight in self._expand(term, fuzzy).items():
+                    for stem, ti, si in self._postings[token]:
+                        hit = hits.setdefault((stem, ti), [0.0, set()])
+                        # Casar en el título pesa algo más que en una sección
+                        hit[0] = max(hit[0], weight * (1.2 if si == TITLE else 1.0))
+                        hit[1].add(si)
+                if combined is None:
+                    combined = hits
+                else:
+                    combined = {key: [combined[key][0] + hit[0], combined[key][1] | hit[1]]
+                                for key, hit in hits.items() if key in combined}
+                if not combined:
+                    return []
+
+            ranked = sorted(combined.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+            results = []
+            for (stem, ti), (score, matched) in ranked:
+                doc = self._docs[stem]
+                title, sections = doc["tracks"][ti]
+                results.append({
+                    "stem": stem,
+                    "setlist": doc["name"] or stem,
+                    "track_index": ti,
+                    "track": title,
+                    "sections": sections,
+                    "matched_sections": [sections[si] for si in sorted(matched) if si != TITLE],
+                    "title_match": TITLE in matched,
+                    "score": round(score, 3),
+                })
+            return results
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "setlists": len(self._docs or {}),
+                "tokens": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+            }
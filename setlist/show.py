@@ -0,0 +1,256 @@
+# setlist/show.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Shows compilados (.lcshow)
+"Compilar" un setlist valida sus locators y deja hecho todo lo que hoy se
+calcula al pulsar: los bundles OSC de lanzamiento de cada track (stop + jump
++ start) y de salto a cada sección (stop + set time + start) ya codificados,
+y los offsets acumulados de cada track y sección dentro del show.
+
+    cabecera   magic "LCSHOW", versión, longitud del manifiesto y del blob (HEADER)
+    manifiesto JSON: setlist, huella, offsets y (offset, longitud) de cada datagrama
+    blob       datagramas OSC concatenados
+
+Cargarlo en el directo restaura locators y tracks e instala la tabla en
+LaunchPrearm: cada Next/Prev/sección envía un datagrama ya hecho. La tabla se
+mantiene mientras la huella de locators + tracks coincida (un re-scan idéntico
+la conserva; reordenar o cambiar el set de Ableton la descarta).
+"""
+
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pythonosc.osc_bundle import OscBundle
+from core.constants import SHOWS_DIR
+from core.state import state, Track, Locator
+from core.utils import atomic_write
+from core.prearm import prearm, ArmedLaunch, structure_fingerprint
+from osc.client import build_bundle
+from setlist import codec
+from core.logger import log_info, log_error, log_warning, log_debug
+
+MAGIC = b"LCSHOW"
+FORMAT_VERSION = 1
+SHOW_SUFFIX = ".lcshow"
+
+# magic, versión, bytes del manifiesto, bytes del blob
+HEADER = struct.Struct("<6sHII")
+
+# Tolerancia (beats) entre el inicio del track y su locator
+LOCATOR_TOLERANCE = 1e-6
+
+
+class ShowCompileError(ValueError):
+    """El setlist no se puede compilar (locators inválidos, tracks mal formados...)"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def launch_messages(locator_id: int) -> list:
+    return [
+        ("/live/song/stop_playing", []),
+        ("/live/song/cue_point/jump", [locator_id]),
+        ("/live/song/start_playing", []),
+    ]
+
+
+def section_messages(beat: float) -> list:
+    return [
+        ("/live/song/stop_playing", []),
+        ("/live/song/set/current_song_time", [float(beat)]),
+        ("/live/song/start_playing", []),
+    ]
+
+
+def validate(locators: List[Locator], tracks: List[Track]) -> List[str]:
+    """Errores que impiden compilar: cada track debe arrancar en un locator existente"""
+    errors = []
+    by_original = {loc.original_id: loc for loc in locators}
+    if not tracks:
+        errors.append("el setlist no tiene tracks")
+    for i, track in enumerate(tracks):
+        where = f"track #{i} '{track.title}'"
+        if track.end <= track.start:
+            errors.append(f"{where}: end ({track.end}) <= start ({track.start})")
+        if track.start_locator_id is None:
+            errors.append(f"{where}: sin locator de inicio")
+            continue
+        locator = by_original.get(track.start_locator_id)
+        if locator is None:
+            errors.append(f"{where}: locator {track.start_locator_id} no existe")
+        elif abs(locator.beat - track.start) > LOCATOR_TOLERANCE:
+            errors.append(f"{where}: locator {track.start_locator_id} está en el beat {locator.beat}, no en {track.start}")
+        for section in track.sections:
+            if not track.start <= section.beat <= track.end:
+                errors.append(f"{where}, sección '{section.name}': beat {section.beat} fuera del track")
+    return errors
+
+
+class CompiledShow:
+    """Setlist + datagramas OSC listos para enviar"""
+
+    def __init__(self, name: str, timestamp: str, locators: List[Locator], tracks: List[Track],
+                 launches: List[OscBundle], sections: List[List[OscBundle]], offsets: List[dict],
+                 fingerprint: str, compiled_at: float):
+        self.name = name
+        self.timestamp = timestamp
+        self.locators = locators
+        self.tracks = tracks
+        self.launches = launches      # índice de track → bundle de lanzamiento
+        self.sections = sections      # índice de track → [bundle de cada sección]
+        self.offsets = offsets        # índice de track → {"start", "duration", "sections": [...]} en beats de show
+        self.fingerprint = fingerprint
+        self.compiled_at = compiled_at
+
+    @property
+    def duration_beats(self) -> float:
+        return self.offsets[-1]["start"] + self.offsets[-1]["duration"] if self.offsets else 0.0
+
+    # ===== COMPILACIÓN =====
+
+    @classmethod
+    def compile(cls, name: str, timestamp: str, locators: List[Locator], tracks: List[Track]) -> "CompiledShow":
+        """Valida y codifica; lanza ShowCompileError con todos los problemas encontrados"""
+        errors = validate(locators, tracks)
+        if errors:
+            raise ShowCompileError(errors)
+
+        launches, sections, offsets = [], [], []
+        elapsed = 0.0
+        for track in tracks:
+            launches.append(build_bundle(launch_messages(track.start_locator_id)))
+            sections.append([build_bundle(section_messages(section.beat)) for section in track.sections])
+            duration = track.end - track.start
+            offsets.append({
+                "start": elapsed,
+                "duration": duration,
+                "sections": [elapsed + (section.beat - track.start) for section in track.sections],
+            })
+            elapsed += duration
+        return cls(name, timestamp, list(locators), list(tracks), launches, sections, offsets,
+                   structure_fingerprint(locators, tracks), time.time())
+
+    # ===== ARCHIVO =====
+
+    def to_bytes(self) -> bytes:
+        blob = bytearray()
+
+        def put(bundle: OscBundle) -> List[int]:
+            dgram = bundle.dgram
+            blob.extend(dgram)
+            return [len(blob) - len(dgram), len(dgram)]
+
+        manifest = {
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "compiled_at": self.compiled_at,
+            "fingerprint": self.fingerprint,
+            "setlist": codec.to_json(self.name, self.timestamp, self.locators, self.tracks),
+            "tracks": [
+                {**offsets, "launch": put(launch), "jumps": [put(bundle) for bundle in jumps]}
+                for offsets, launch, jumps in zip(self.offsets, self.launches, self.sections)
+            ],
+        }
+        encoded = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), len(blob)) + encoded + bytes(blob)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> "CompiledShow":
+        if len(buf) < HEADER.size:
+            raise ShowCompileError(["archivo demasiado corto"])
+        magic, version, manifest_len, blob_len = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ShowCompileError([f"no es un show compilado v{FORMAT_VERSION}"])
+        if len(buf) != HEADER.size + manifest_len + blob_len:
+            raise ShowCompileError(["tamaño inconsistente con la cabecera"])
+        manifest = json.loads(buf[HEADER.size:HEADER.size + manifest_len])
+        blob = memoryview(buf)[HEADER.size + manifest_len:]
+
+        def take(span: List[int]) -> OscBundle:
+            return OscBundle(bytes(blob[span[0]:span[0] + span[1]]))
+
+        data = codec.from_json(manifest["setlist"])
+        entries = manifest["tracks"]
+        return cls(
+            manifest["name"], manifest["timestamp"], data["locators"], data.get("tracks", []),
+            [take(entry["launch"]) for entry in entries],
+            [[take(span) for span in entry["jumps"]] for entry in entries],
+            [{"start": e["start"], "duration": e["duration"], "sections": e["sections"]} for e in entries],
+            manifest["fingerprint"], manifest["compiled_at"],
+        )
+
+    def write(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, self.to_bytes())
+
+    @classmethod
+    def read(cls, path: Path) -> "CompiledShow":
+        return cls.from_bytes(Path(path).read_bytes())
+
+    # ===== ACTIVACIÓN =====
+
+    def armed_table(self, version: int) -> Tuple[Dict[int, ArmedLaunch], Dict[Tuple[int, int], ArmedLaunch]]:
+        """Lanzamientos de tracks y secciones como los usa LaunchPrearm"""
+        launches = {
+            i: ArmedLaunch(i, track.title, track.start_locator_id, track.start, version, bundle=self.launches[i])
+            for i, track in enumerate(self.tracks)
+        }
+        jumps = {
+            (i, j): ArmedLaunch(i, f"{track.title} · {section.name}", None, section.beat, version,
+                                bundle=self.sections[i][j])
+            for i, track in enumerate(self.tracks)
+            for j, section in enumerate(track.sections)
+        }
+        return launches, jumps
+
+
+# ===== API =====
+
+def show_path(stem: str) -> Path:
+    return SHOWS_DIR / f"{stem}{SHOW_SUFFIX}"
+
+
+def compile_setlist(stem: str, data: dict) -> Path:
+    """Compila un setlist cargado (dict con objetos) a SHOWS_DIR/<stem>.lcshow"""
+    started = time.perf_counter()
+    show = CompiledShow.compile(data.get("name") or stem, data.get("timestamp", ""),
+                                data["locators"], data.get("tracks") or [])
+    path = show_path(stem)
+    show.write(path)
+    log_info(f"🎛 Show compilado: {path.name} ({len(show.tracks)} tracks, "
+             f"{sum(len(s) for s in show.sections)} secciones, {(time.perf_counter() - started) * 1000:.1f} ms)",
+             module="Playback")
+    return path
+
+
+def load_compiled(stem: str, timestamp: Optional[str] = None) -> Optional[CompiledShow]:
+    """Show compilado de `stem`; None si no hay o si se compiló de otra versión (timestamp)"""
+    path = show_path(stem)
+    if not path.exists():
+        return None
+    try:
+        show = CompiledShow.read(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        log_warning(f"Show compilado ilegible, se ignora: {path.name} ({e})", module="Playback")
+        return None
+    if timestamp is not None and show.timestamp != timestamp:
+        log_info(f"Show compilado de '{stem}' desactualizado (setlist guardado después), se ignora", module="Playback")
+        return None
+    return show
+
+
+def activate(show: CompiledShow):
+    """Carga el show en AppState e instala sus datagramas: listo para tocar"""
+    state.locators = show.locators
+    state.tracks = show.tracks
+    state.current_index = 0 if show.tracks else -1
+    launches, jumps = show.armed_table(state.structure_version)
+    prearm.install(launches, jumps, show.fingerprint)
+    log_info(f"🎛 Show '{show.name}' activo: {len(launches)} lanzamientos y {len(jumps)} saltos pre-codificados",
+             module="Playback")
@@ -0,0 +1,555 @@
+# setlist/storage.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Almacenes de setlists detrás de SetlistManager
+DirectoryStore guarda un archivo .json/.lcs por setlist en SETLISTS_DIR (con
+catálogo, caché, historial e índice de búsqueda propios). SQLiteStore guarda
+todo en una base de datos: tablas setlists, locators, tracks, sections y
+versions, con índices por título, nombre de sección y fecha. Ambos reciben y
+devuelven lo mismo, así que el gestor y la UI no saben cuál hay debajo.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from core.constants import (
+    SETLISTS_DIR, SETLIST_DB_PATH, SETLIST_STORAGE, SETLIST_DEFAULT_FORMAT,
+    SETLIST_HISTORY_ENABLED, SETLIST_HISTORY_KEYFRAME_EVERY, SEARCH_MAX_RESULTS
+)
+from core.state import Track, Section, Locator
+from setlist import codec
+from setlist.catalog import SetlistCatalog, SETLIST_SUFFIXES, summarize
+from setlist.cache import SetlistCache
+from setlist.history import SetlistHistory, make_record, replay
+from setlist.search import SearchIndex, tokenize, SCORE_EXACT, SCORE_PREFIX
+from core.logger import log_info, log_error, log_warning, log_debug
+
+
+class SetlistStore:
+    """Interfaz común de los almacenes. Los datos de entrada van en forma JSON (dicts);
+    los de salida de load() con objetos Locator/Track, como los usa AppState"""
+
+    kind = ""
+
+    def save(self, stem: str, data: dict, locators: list, tracks: list = None, fmt: str = None) -> str:
+        """Guarda (o sustituye) un setlist y registra la versión; devuelve dónde quedó (para el log)"""
+        raise NotImplementedError
+
+    def load(self, stem: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def load_file(self, path: Path) -> dict:
+        """Setlist desde un archivo .json/.lcs suelto (importar, autoguardado...)"""
+        return codec.read_file(path)
+
+    def exists(self, stem: str) -> bool:
+        raise NotImplementedError
+
+    def entries(self) -> List[dict]:
+        """Metadatos de todos los setlists (stem, name, timestamp, tracks, sections...)"""
+        raise NotImplementedError
+
+    def get(self, stem: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def versions(self, stem: str) -> List[dict]:
+        raise NotImplementedError
+
+    def reconstruct(self, stem: str, version: Optional[int] = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS) -> List[dict]:
+        raise NotImplementedError
+
+
+# ===== DIRECTORIO =====
+
+class DirectoryStore(SetlistStore):
+    """Un archivo por setlist en un directorio (el almacén de siempre)"""
+
+    kind = "directory"
+
+    def __init__(self, directory: Path = SETLISTS_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.catalog = SetlistCatalog(self.directory)
+        self.cache = SetlistCache()
+        self.history = SetlistHistory(self.directory / ".history")
+        self.search_index = SearchIndex(self.directory)
+        log_debug(f"DirectoryStore inicializado ({self.directory})", module="Playback")
+
+    def resolve(self, stem: str) -> Optional[Path]:
+        """Archivo del setlist: .lcs/.json por preferencia"""
+        for suffix in SETLIST_SUFFIXES:
+            candidate = self.directory / f"{stem}{suffix}"
+            if candidate.exists():
+                return candidate
+        return None
+
+    def save(self, stem: str, data: dict, locators: list, tracks: list = None, fmt: str = None) -> str:
+        fmt = (fmt or SETLIST_DEFAULT_FORMAT).lower()
+        if f".{fmt}" not in SETLIST_SUFFIXES:
+            raise ValueError(f"Formato de setlist desconocido: '{fmt}'")
+        filepath = self.directory / f"{stem}.{fmt}"
+        log_debug(f"Ruta destino: {filepath}", module="Playback")
+
+        written = codec.write_file(filepath, data["name"], data["timestamp"], locators, tracks, data=data)
+
+        # Un stem, un archivo: la versión en el otro formato queda obsoleta
+        for suffix in SETLIST_SUFFIXES:
+            other = self.directory / f"{stem}{suffix}"
+            if other != filepath and other.exists():
+                other.unlink()
+                self.cache.invalidate(str(other))
+                log_debug(f"Eliminado {other.name} (sustituido por {filepath.name})", module="Playback")
+
+        self.catalog.record(filepath, written)
+        self.search_index.update(filepath, data)
+
+        # Guardar con el mismo nombre ya no pisa sin rastro: cada guardado es una versión
+        if SETLIST_HISTORY_ENABLED:
+            version = self.history.record(stem, data)
+            if version is not None:
+                log_debug(f"Versión {version} de '{stem}' registrada", module="Playback")
+
+        return f"{filepath.name} ({filepath.stat().st_size} bytes)"
+
+    def load(self, stem: str) -> Optional[dict]:
+        filepath = self.resolve(stem)
+        if filepath is None:
+            return None
+        return self.load_file(filepath)
+
+    def load_file(self, path: Path) -> dict:
+        # Recargar un setlist reciente es un intercambio de referencias
+        key = str(path)
+        signature = SetlistCache.signature(path.stat())
+        cached = self.cache.get(key, signature)
+        if cached is not None:
+            log_debug(f"Setlist desde caché: {path.name}", module="Playback")
+            return cached
+        log_debug(f"Leyendo archivo: {path}", module="Playback")
+        return self.cache.put(key, signature, codec.read_file(path))
+
+    def exists(self, stem: str) -> bool:
+        return self.resolve(stem) is not None
+
+    def entries(self) -> List[dict]:
+        return self.catalog.entries()
+
+    def get(self, stem: str) -> Optional[dict]:
+        return self.catalog.get(stem)
+
+    def versions(self, stem: str) -> List[dict]:
+        return self.history.versions(stem)
+
+    def reconstruct(self, stem: str, version: Optional[int] = None) -> Optional[dict]:
+        return self.history.reconstruct(stem, version)
+
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS) -> List[dict]:
+        return self.search_index.search(query, limit)
+
+
+# ===== SQLITE =====
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS setlists (
+    id             INTEGER PRIMARY KEY,
+    stem           TEXT NOT NULL UNIQUE,
+    name           TEXT NOT NULL,
+    timestamp      TEXT NOT NULL,
+    track_count    INTEGER NOT NULL DEFAULT 0,
+    section_count  INTEGER NOT NULL DEFAULT 0,
+    locator_count  INTEGER NOT NULL DEFAULT 0,
+    duration_beats REAL NOT NULL DEFAULT 0,
+    bytes          INTEGER NOT NULL DEFAULT 0,
+    updated        REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_setlists_timestamp ON setlists(timestamp);
+
+CREATE TABLE IF NOT EXISTS locators (
+    setlist_id  INTEGER NOT NULL REFERENCES setlists(id) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    locator_id  INTEGER,
+    original_id INTEGER,
+    name        TEXT NOT NULL,
+    beat        REAL NOT NULL,
+    PRIMARY KEY (setlist_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tracks (
+    setlist_id       INTEGER NOT NULL REFERENCES setlists(id) ON DELETE CASCADE,
+    position         INTEGER NOT NULL,
+    title            TEXT NOT NULL COLLATE NOCASE,
+    start_beat       REAL NOT NULL,
+    end_beat         REAL NOT NULL,
+    track_number     INTEGER NOT NULL,
+    start_locator_id INTEGER,
+    expanded         INTEGER NOT NULL DEFAULT 0,
+    keywords         TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (setlist_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tracks_title ON tracks(title);
+
+CREATE TABLE IF NOT EXISTS sections (
+    setlist_id     INTEGER NOT NULL,
+    track_position INTEGER NOT NULL,
+    position       INTEGER NOT NULL,
+    name           TEXT NOT NULL COLLATE NOCASE,
+    beat           REAL NOT NULL,
+    time           REAL,
+    relative_beat  REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (setlist_id, track_position, position),
+    FOREIGN KEY (setlist_id, track_position) REFERENCES tracks(setlist_id, position) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sections_name ON sections(name);
+
+CREATE TABLE IF NOT EXISTS versions (
+    setlist_id INTEGER NOT NULL REFERENCES setlists(id) ON DELETE CASCADE,
+    version    INTEGER NOT NULL,
+    kind       TEXT NOT NULL,
+    ts         REAL NOT NULL,
+    payload    TEXT NOT NULL,
+    PRIMARY KEY (setlist_id, version)
+) WITHOUT ROWID;
+"""
+
+
+def _keywords(title: str, sections: Iterable[str]) -> str:
+    """Texto normalizado (tokenize de search) de un track para las búsquedas con LIKE"""
+    parts = [" ".join(tokenize(title))] + [" ".join(tokenize(name)) for name in sections]
+    return " " + " | ".join(parts) + " "
+
+
+class SQLiteStore(SetlistStore):
+    """Setlists en una base SQLite (stdlib) - Thread-safe (una conexión protegida por lock)"""
+
+    kind = "sqlite"
+
+    def __init__(self, path: Path = SETLIST_DB_PATH, keyframe_every: int = SETLIST_HISTORY_KEYFRAME_EVERY):
+        self.path = Path(path)
+        self.keyframe_every = max(1, keyframe_every)
+        self.cache = SetlistCache()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last: Dict[str, Tuple[int, dict]] = {}  # stem → (versión, datos) del último guardado
+        log_debug(f"SQLiteStore inicializado ({self.path})", module="Playback")
+
+    # ===== CONEXIÓN =====
+
+    def _db(self) -> sqlite3.Connection:
+        """Conexión (se abre y se migra el esquema en el primer uso)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn = conn
+            log_info(f"🗄 Base de datos de setlists abierta: {self.path}", module="Playback")
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ===== ESCRITURA =====
+
+    def _write(self, db: sqlite3.Connection, stem: str, data: dict) -> int:
+        """Sustituye filas del setlist `stem` por `data` (forma JSON); devuelve su id"""
+        summary = summarize(data)
+        size = len(json.dumps(data, ensure_ascii=False))
+        db.execute(
+            """INSERT INTO setlists (stem, name, timestamp, track_count, section_count, locator_count,
+                                     duration_beats, bytes, updated)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(stem) DO UPDATE SET
+                   name = excluded.name, timestamp = excluded.timestamp,
+                   track_count = excluded.track_count, section_count = excluded.section_count,
+                   locator_count = excluded.locator_count, duration_beats = excluded.duration_beats,
+                   bytes = excluded.bytes, updated = excluded.updated""",
+            (stem, data.get("name") or stem, data.get("timestamp", ""), summary["tracks"], summary["sections"],
+             summary["locators"], summary["duration_beats"], size, time.time()),
+        )
+        setlist_id = db.execute("SELECT id FROM setlists WHERE stem = ?", (stem,)).fetchone()[0]
+
+        for table in ("sections", "tracks", "locators"):
+            db.execute(f"DELETE FROM {table} WHERE setlist_id = ?", (setlist_id,))
+
+        db.executemany(
+            "INSERT INTO locators VALUES (?, ?, ?, ?, ?, ?)",
+            [(setlist_id, i, loc.get("id"), loc.get("original_id", loc.get("id")), loc["name"], loc["beat"])
+             for i, loc in enumerate(data.get("locators", []))],
+        )
+        tracks = data.get("tracks") or []
+        db.executemany(
+            "INSERT INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(setlist_id, i, t["title"], t["start"], t["end"], t["track_number"], t.get("start_locator_id"),
+              int(bool(t.get("expanded", False))),
+              _keywords(t["title"], (s["name"] for s in t.get("sections", []))))
+             for i, t in enumerate(tracks)],
+        )
+        db.executemany(
+            "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(setlist_id, ti, si, s["name"], s["beat"], s.get("time", s["beat"]), s.get("relative_beat", 0))
+             for ti, t in enumerate(tracks) for si, s in enumerate(t.get("sections", []))],
+        )
+        return setlist_id
+
+    def _latest(self, db: sqlite3.Connection, setlist_id: int, stem: str) -> Optional[Tuple[int, dict]]:
+        previous = self._last.get(stem)
+        if previous is None:
+            row = db.execute("SELECT MAX(version) FROM versions WHERE setlist_id = ?", (setlist_id,)).fetchone()
+            if row[0] is not None:
+                previous = (row[0], self._replay(db, setlist_id, row[0]))
+        return previous
+
+    def _record_version(self, db: sqlite3.Connection, setlist_id: int, stem: str, data: dict) -> int:
+        record = make_record(self._latest(db, setlist_id, stem), data, self.keyframe_every)
+        payload = record["data"] if record["k"] == "full" else record["ops"]
+        db.execute("INSERT INTO versions VALUES (?, ?, ?, ?, ?)",
+                   (setlist_id, record["v"], record["k"], record["ts"], json.dumps(payload, ensure_ascii=False)))
+        self._last[stem] = (record["v"], data)
+        return record["v"]
+
+    def save(self, stem: str, data: dict, locators: list, tracks: list = None, fmt: str = None) -> str:
+        if fmt:
+            log_debug(f"Formato '{fmt}' ignorado: el almacén es SQLite", module="Playback")
+        with self._lock:
+            db = self._db()
+            try:
+                with db:
+                    setlist_id = self._write(db, stem, data)
+                    if SETLIST_HISTORY_ENABLED:
+                        version = self._record_version(db, setlist_id, stem, data)
+                        log_debug(f"Versión {version} de '{stem}' registrada", module="Playback")
+            except Exception:
+                self._last.pop(stem, None)
+                raise
+            self.cache.invalidate(stem)
+        return f"{stem} en {self.path.name}"
+
+    def import_many(self, items: Iterable[Tuple[str, dict, List[dict]]], replace: bool = False) -> List[str]:
+        """Migra (stem, datos JSON, registros de historial) en una sola transacción
+
+        Los registros del historial se copian tal cual; si no hay, la versión 1 es `data`.
+        Devuelve los stems escritos (sin `replace`, los que ya existían se omiten).
+        """
+        written = []
+        with self._lock:
+            db = self._db()
+            with db:
+                for stem, data, records in items:
+                    if not replace and db.execute("SELECT 1 FROM setlists WHERE stem = ?", (stem,)).fetchone():
+                        log_debug(f"'{stem}' ya está en la base de datos, se omite", module="Playback")
+                        continue
+                    setlist_id = self._write(db, stem, data)
+                    db.execute("DELETE FROM versions WHERE setlist_id = ?", (setlist_id,))
+                    self._last.pop(stem, None)
+                    if records:
+                        db.executemany("INSERT INTO versions VALUES (?, ?, ?, ?, ?)", [
+                            (setlist_id, r["v"], r["k"], r["ts"],
+                             json.dumps(r["data"] if r["k"] == "full" else r["ops"], ensure_ascii=False))
+                            for r in records
+                        ])
+                    elif SETLIST_HISTORY_ENABLED:
+                        self._record_version(db, setlist_id, stem, data)
+                    written.append(stem)
+            self.cache.invalidate()
+        return written
+
+    # ===== LECTURA =====
+
+    def _row(self, db: sqlite3.Connection, stem: str) -> Optional[sqlite3.Row]:
+        return db.execute("SELECT * FROM setlists WHERE stem = ?", (stem,)).fetchone()
+
+    def load(self, stem: str) -> Optional[dict]:
+        with self._lock:
+            db = self._db()
+            row = self._row(db, stem)
+            if row is None:
+                return None
+            signature = (int(row["updated"] * 1e9), row["bytes"])
+            cached = self.cache.get(stem, signature)
+            if cached is not None:
+                return cached
+
+            setlist_id = row["id"]
+            data = {"name": row["name"], "timestamp": row["timestamp"]}
+            data["locators"] = [
+                Locator(id=r["locator_id"], original_id=r["original_id"], name=r["name"], beat=r["beat"])
+                for r in db.execute("SELECT * FROM locators WHERE setlist_id = ? ORDER BY position", (setlist_id,))
+            ]
+            tracks = [
+                Track(title=r["title"], start=r["start_beat"], end=r["end_beat"], track_number=r["track_number"],
+                      start_locator_id=r["start_locator_id"], expanded=bool(r["expanded"]))
+                for r in db.execute("SELECT * FROM tracks WHERE setlist_id = ? ORDER BY position", (setlist_id,))
+            ]
+            for r in db.execute("SELECT * FROM sections WHERE setlist_id = ? ORDER BY track_position, position",
+                                (setlist_id,)):
+                tracks[r["track_position"]].sections.append(
+                    Section(name=r["name"], beat=r["beat"], time=r["time"], relative_beat=r["relative_beat"]))
+            if tracks:
+                data["tracks"] = tracks
+            return self.cache.put(stem, signature, data)
+
+    def load_json(self, stem: str) -> Optional[dict]:
+        """Setlist en forma JSON (para exportar a archivos)"""
+        data = self.load(stem)
+        if data is None:
+            return None
+        return codec.to_json(data["name"], data["timestamp"], data["locators"], data.get("tracks"))
+
+    def exists(self, stem: str) -> bool:
+        with self._lock:
+            return self._row(self._db(), stem) is not None
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> dict:
+        """Fila de setlists con la misma forma que una entrada del catálogo"""
+        return {
+            "stem": row["stem"],
+            "name": row["name"],
+            "timestamp": row["timestamp"],
+            "tracks": row["track_count"],
+            "sections": row["section_count"],
+            "locators": row["locator_count"],
+            "duration_beats": row["duration_beats"],
+            "format": "sqlite",
+            "mtime": row["updated"],
+            "size": row["bytes"],
+        }
+
+    def entries(self) -> List[dict]:
+        with self._lock:
+            return [self._entry(row) for row in self._db().execute("SELECT * FROM setlists ORDER BY stem")]
+
+    def get(self, stem: str) -> Optional[dict]:
+        with self._lock:
+            row = self._row(self._db(), stem)
+            return self._entry(row) if row else None
+
+    def stems(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db().execute("SELECT stem FROM setlists ORDER BY stem")]
+
+    # ===== VERSIONES =====
+
+    def versions(self, stem: str) -> List[dict]:
+        with self._lock:
+            return [
+                {"version": r["version"], "kind": r["kind"], "ts": r["ts"], "bytes": r["bytes"]}
+                for r in self._db().execute(
+                    """SELECT v.version, v.kind, v.ts, LENGTH(v.payload) AS bytes
+                       FROM versions v JOIN setlists s ON s.id = v.setlist_id
+                       WHERE s.stem = ? ORDER BY v.version""", (stem,))
+            ]
+
+    def _replay(self, db: sqlite3.Connection, setlist_id: int, version: int) -> Optional[dict]:
+        """Último fotograma completo <= version + los deltas hasta ella"""
+        start = db.execute(
+            "SELECT MAX(version) FROM versions WHERE setlist_id = ? AND kind = 'full' AND version <= ?",
+            (setlist_id, version)).fetchone()[0]
+        if start is None:
+            return None
+        rows = db.execute(
+            "SELECT kind, payload FROM versions WHERE setlist_id = ? AND version BETWEEN ? AND ? ORDER BY version",
+            (setlist_id, start, version))
+        return replay({"k": kind, ("data" if kind == "full" else "ops"): json.loads(payload)}
+                      for kind, payload in rows)
+
+    def reconstruct(self, stem: str, version: Optional[int] = None) -> Optional[dict]:
+        with self._lock:
+            db = self._db()
+            row = self._row(db, stem)
+            if row is None:
+                return None
+            if version is None:
+                version = db.execute("SELECT MAX(version) FROM versions WHERE setlist_id = ?", (row["id"],)).fetchone()[0]
+            elif not db.execute("SELECT 1 FROM versions WHERE setlist_id = ? AND version = ?",
+                                (row["id"], version)).fetchone():
+                return None
+            return self._replay(db, row["id"], version) if version is not None else None
+
+    # ===== BÚSQUEDA =====
+
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS) -> List[dict]:
+        """Tracks que contienen todos los términos (prefijo de palabra, sin acentos)
+
+        Sin corrección de erratas: cada término filtra con LIKE sobre la columna
+        `keywords`, ya normalizada al guardar.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        where = " AND ".join("t.keywords LIKE ?" for _ in terms)
+        with self._lock:
+            db = self._db()
+            rows = db.execute(
+                f"""SELECT s.id, s.stem, s.name AS setlist, t.position, t.title
+                    FROM tracks t JOIN setlists s ON s.id = t.setlist_id
+                    WHERE {where}""",
+                [f"% {term}%" for term in terms],
+            ).fetchall()
+            results = []
+            for row in rows:
+                sections = [r[0] for r in db.execute(
+                    "SELECT name FROM sections WHERE setlist_id = ? AND track_position = ? ORDER BY position",
+                    (row["id"], row["position"]))]
+                score, matched, title_match = 0.0, set(), False
+                for term in terms:
+                    best = 0.0
+                    for si, text in [(-1, row["title"])] + list(enumerate(sections)):
+                        tokens = tokenize(text)
+                        weight = SCORE_EXACT if term in tokens else SCORE_PREFIX if any(
+                            token.startswith(term) for token in tokens) else 0.0
+                        if not weight:
+                            continue
+                        if si < 0:
+                            title_match = True
+                            weight *= 1.2
+                        else:
+                            matched.add(si)
+                        best = max(best, weight)
+                    score += best
+                results.append({
+                    "stem": row["stem"],
+                    "setlist": row["setlist"] or row["stem"],
+                    "track_index": row["position"],
+                    "track": row["title"],
+                    "sections": sections,
+                    "matched_sections": [sections[si] for si in sorted(matched)],
+                    "title_match": title_match,
+                    "score": round(score, 3),
+                })
+        results.sort(key=lambda r: (-r["score"], r["stem"], r["track_index"]))
+        return results[:limit]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            db = self._db()
+            counts = {table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ("setlists", "tracks", "sections", "versions")}
+        return {**counts, "path": str(self.path)}
+
+
+def create_store(kind: str = SETLIST_STORAGE) -> SetlistStore:
+    """Almacén configurado en SETLIST_STORAGE ("directory" | "sqlite")"""
+    if kind == SQLiteStore.kind:
+        return SQLiteStore()
+    if kind != DirectoryStore.kind:
+        log_warning(f"Almacén de setlists desconocido '{kind}', se usa el directorio", module="Playback")
+    return DirectoryStore()
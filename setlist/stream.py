@@ -0,0 +1,265 @@
+# setlist/stream.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Carga por streaming de setlists .json grandes
+El archivo se lee por trozos y se decodifica elemento a elemento con
+JSONDecoder.raw_decode: los campos de cabecera (name, timestamp, locators)
+enteros y la lista "tracks" track a track, convirtiendo cada uno a Track en
+cuanto se lee. Nunca existen a la vez el dict completo del archivo y todos
+los objetos.
+
+StreamingLoad devuelve el control con la cabecera y los primeros tracks ya
+decodificados y sigue con el resto en un thread, entregándolos por lotes.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+from core.constants import SETLIST_STREAM_FIRST_TRACKS, SETLIST_STREAM_BATCH_INTERVAL, SETLIST_STREAM_CHUNK
+from core.state import Track
+from setlist import codec
+from core.logger import log_info, log_error, log_warning, log_debug
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _Scanner:
+    """Lectura incremental de JSON sobre un archivo de texto"""
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Añade al menos `size` caracteres al buffer; False si el archivo se acabó"""
+        if self._eof:
+            return False
+        if self._pos > self._chunk:
+            # Lo ya consumido se descarta: el buffer solo guarda el elemento en curso
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        data = self._f.read(max(size, self._chunk))
+        if not data:
+            self._eof = True
+            return False
+        self._buf += data
+        return True
+
+    def peek(self) -> str:
+        """Siguiente carácter significativo (sin consumirlo); "" al final del archivo"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill(self._chunk):
+                return self._buf[self._pos:self._pos + 1]
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Se esperaba {' o '.join(repr(c) for c in chars)}", self._buf, self._pos)
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decodifica el valor que empieza en la posición actual, leyendo más si está cortado"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Valor incompleto: se duplica lo leído para que reintentar salga lineal
+                if self._fill(len(self._buf) - self._pos):
+                    continue
+                raise
+            # Un número cortado por el trozo puede seguir en el siguiente: con "12", "12." o
+            # "12e+" al final del buffer raw_decode devuelve 12 y deja sin leer como mucho 2 caracteres
+            tail = self._buf[end:]
+            if isinstance(value, (int, float)) and not self._eof and len(tail) <= 2 and all(c in NUMBER_CHARS for c in tail):
+                if self._fill(self._chunk):
+                    continue
+            self._pos = end
+            return value
+
+
+def iter_setlist(f, chunk_size: int = SETLIST_STREAM_CHUNK) -> Iterator[Tuple[str, object]]:
+    """Recorre un setlist .json: ("field", (clave, valor)) por campo y ("track", dict) por track"""
+    scanner = _Scanner(f, chunk_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+    while True:
+        key = scanner.value()
+        scanner.expect(":")
+        if key == "tracks" and scanner.peek() == "[":
+            scanner.expect("[")
+            if scanner.peek() != "]":
+                while True:
+                    yield "track", scanner.value()
+                    if scanner.expect(",]") == "]":
+                        break
+            else:
+                scanner.expect("]")
+        else:
+            yield "field", (key, scanner.value())
+        if scanner.expect(",}") == "}":
+            return
+
+
+class StreamingLoad:
+    """Setlist que se va cargando: cabecera y primeros tracks ya, el resto por lotes - Thread-safe
+
+    on_batch(load, tracks) recibe cada lote nuevo y on_done(load) se llama al
+    terminar (con `load.error` si falló), ambos desde el thread de carga. Una
+    carga que ya vuelve completa de start() no llama a ninguno.
+    """
+
+    def __init__(self, path: Path, on_batch: Callable[["StreamingLoad", List[Track]], None] = None,
+                 on_done: Callable[["StreamingLoad"], None] = None,
+                 first_tracks: int = SETLIST_STREAM_FIRST_TRACKS,
+                 batch_interval: float = SETLIST_STREAM_BATCH_INTERVAL):
+        self.path = Path(path)
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.first_tracks = first_tracks
+        self.batch_interval = batch_interval
+        self.error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._fields = {}
+        self._tracks: List[Track] = []
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    @classmethod
+    def completed(cls, data: dict) -> "StreamingLoad":
+        """Envuelve un setlist ya cargado entero (archivo pequeño, .lcs, SQLite...)"""
+        load = cls(Path(data.get("name") or ""))
+        load._fields = {key: value for key, value in data.items() if key != "tracks"}
+        load._tracks = list(data.get("tracks") or [])
+        load._done.set()
+        return load
+
+    # ===== CARGA =====
+
+    def start(self) -> "StreamingLoad":
+        """Decodifica la cabecera y los primeros tracks y deja el resto en segundo plano
+
+        Errores de lectura o formato en esta fase se propagan al llamante.
+        """
+        self._started = time.perf_counter()
+        f = open(self.path, "r", encoding="utf-8")
+        try:
+            items = iter_setlist(f)
+            for kind, item in items:
+                self._take(kind, item)
+                # La cabecera manda: sin locators todavía no hay nada que mostrar
+                if len(self._tracks) >= self.first_tracks and "locators" in self._fields:
+                    break
+            else:
+                # Cabía entero en la primera fase: vuelve completo, sin callbacks
+                f.close()
+                self._finish(notify=False)
+                return self
+        except Exception:
+            f.close()
+            raise
+
+        log_debug(f"Streaming '{self.path.name}': cabecera y {len(self._tracks)} tracks en "
+                  f"{(time.perf_counter() - self._started) * 1000:.1f} ms", module="Playback")
+        self._thread = threading.Thread(target=self._run, args=(f, items), name="SetlistStream", daemon=True)
+        self._thread.start()
+        return self
+
+    def _take(self, kind: str, item):
+        if kind == "track":
+            track = codec.deserialize_track(item)
+            with self._lock:
+                self._tracks.append(track)
+        else:
+            key, value = item
+            if key == "locators":
+                value = [codec.deserialize_locator(loc) for loc in value]
+            with self._lock:
+                self._fields[key] = value
+
+    def _run(self, f, items):
+        pending = 0
+        last = time.monotonic()
+        try:
+            with f:
+                for kind, item in items:
+                    if self._cancelled.is_set():
+                        log_debug(f"Streaming '{self.path.name}' cancelado", module="Playback")
+                        break
+                    self._take(kind, item)
+                    pending += kind == "track"
+                    if pending and time.monotonic() - last >= self.batch_interval:
+                        self._emit(pending)
+                        pending, last = 0, time.monotonic()
+            if pending:
+                self._emit(pending)
+        except Exception as e:
+            self.error = e
+            log_error(f"Error en la carga por streaming de '{self.path.name}'", module="Playback", exc=e)
+        self._finish()
+
+    def _emit(self, count: int):
+        if self.on_batch is None or self._cancelled.is_set():
+            return
+        with self._lock:
+            batch = self._tracks[-count:]
+        try:
+            self.on_batch(self, batch)
+        except Exception as e:
+            log_error("Error en callback de lote de tracks", module="Playback", exc=e)
+
+    def _finish(self, notify: bool = True):
+        self._done.set()
+        if self.error is None and not self._cancelled.is_set():
+            with self._lock:
+                tracks = len(self._tracks)
+            log_info(f"✓ '{self.path.name}' cargado por streaming: {tracks} tracks en "
+                     f"{(time.perf_counter() - self._started) * 1000:.1f} ms", module="Playback")
+        if notify and self.on_done is not None and not self._cancelled.is_set():
+            try:
+                self.on_done(self)
+            except Exception as e:
+                log_error("Error en callback de fin de carga", module="Playback", exc=e)
+
+    def cancel(self):
+        """Deja de decodificar y de avisar (p.ej. al cargar otro setlist encima)"""
+        self._cancelled.set()
+
+    # ===== ESTADO =====
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def data(self) -> dict:
+        """Lo cargado hasta ahora, con la forma de SetlistManager.load"""
+        with self._lock:
+            data = dict(self._fields)
+            data.setdefault("locators", [])
+            data["tracks"] = list(self._tracks)
+        return data
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Setlist completo cuando termine; None si no terminó a tiempo, falló o se canceló"""
+        if not self._done.wait(timeout) or self.error is not None or self._cancelled.is_set():
+            return None
+        return self.data()
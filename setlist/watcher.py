@@ -0,0 +1,322 @@
+# setlist/watcher.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""
+Vigilancia de la carpeta de setlists
+Detecta setlists que aparecen, cambian o desaparecen en SETLISTS_DIR (copiados
+desde otra máquina, una carpeta sincronizada...) y actualiza catálogo, índice
+de búsqueda y caché solo para esos stems, sin volver a recorrer el directorio.
+
+En Linux usa inotify (vía ctypes, sin dependencias); en el resto de sistemas,
+o si inotify no está disponible, sondea el directorio cada
+SETLIST_WATCH_POLL_INTERVAL segundos comparando mtime/tamaño.
+
+Los cambios se publican como eventos numerados {seq, stem, change, ts}: los
+listeners los reciben al momento (UI) y wait_events() permite esperarlos
+desde otro thread (servidor web).
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from core.constants import SETLIST_WATCH_POLL_INTERVAL, SETLIST_WATCH_SETTLE
+from setlist.catalog import scan_setlists, SETLIST_SUFFIXES
+from setlist.manager import manager
+from setlist.storage import DirectoryStore
+from core.logger import log_info, log_error, log_warning, log_debug
+
+# Máscaras de inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ nombre de `len` bytes)
+
+EVENT_HISTORY = 256  # eventos que se conservan para wait_events()
+
+
+class _Inotify:
+    """inotify sobre un directorio vía ctypes"""
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch")
+
+    def read(self) -> Tuple[Set[str], bool]:
+        """Nombres afectados y si hay que revalidar todo (cola desbordada o directorio perdido)"""
+        names, rescan = set(), False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return names, rescan
+            offset = 0
+            while offset + EVENT.size <= len(buf):
+                _, mask, _, length = EVENT.unpack_from(buf, offset)
+                offset += EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    rescan = True
+                elif name:
+                    names.add(os.fsdecode(name))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SetlistWatcher:
+    """Vigila SETLISTS_DIR y aplica los cambios de forma incremental - Thread-safe"""
+
+    def __init__(self, store: DirectoryStore = None, poll_interval: float = SETLIST_WATCH_POLL_INTERVAL,
+                 settle: float = SETLIST_WATCH_SETTLE):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.backend: Optional[str] = None  # "inotify" | "polling"
+        self._cond = threading.Condition()
+        self._events: Deque[dict] = deque(maxlen=EVENT_HISTORY)
+        self._seq = 0
+        self._listeners: List[Callable[[List[dict]], None]] = []
+        self._known: Dict[str, Tuple[str, int, int]] = {}  # stem → (archivo, mtime_ns, size)
+        self._stop_event = threading.Event()
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        log_debug("SetlistWatcher inicializado", module="Playback")
+
+    # ===== CICLO DE VIDA =====
+
+    def start(self) -> bool:
+        """Arranca la vigilancia (solo con el almacén de directorio)"""
+        if self._thread and self._thread.is_alive():
+            return True
+        self.store = self.store or manager.store
+        if not isinstance(self.store, DirectoryStore):
+            log_info(f"Vigilancia de setlists no aplica al almacén '{self.store.kind}'", module="Playback")
+            return False
+
+        self._stop_event.clear()
+        inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                inotify = _Inotify(self.store.directory)
+            except (OSError, AttributeError) as e:
+                log_warning(f"inotify no disponible ({e}), se vigila por sondeo", module="Playback")
+        self.backend = "inotify" if inotify else "polling"
+
+        # Una única sincronización completa; a partir de aquí catálogo e índice solo se tocan por eventos
+        self._known = self._snapshot()
+        self.store.catalog.refresh()
+        self.store.catalog.watched = self.store.search_index.watched = True
+        self._wake_r, self._wake_w = os.pipe() if inotify else (None, None)
+        target = (lambda: self._inotify_loop(inotify)) if inotify else self._polling_loop
+        self._thread = threading.Thread(target=target, name="SetlistWatcher", daemon=True)
+        self._thread.start()
+        log_info(f"👁 Vigilando {self.store.directory} ({self.backend})", module="Playback")
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if isinstance(self.store, DirectoryStore):
+            self.store.catalog.watched = self.store.search_index.watched = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._wake_r = self._wake_w = None
+        with self._cond:
+            self._cond.notify_all()
+
+    # ===== BUCLES =====
+
+    def _inotify_loop(self, inotify: _Inotify):
+        pending: Set[str] = set()
+        rescan = False
+        try:
+            while not self._stop_event.is_set():
+                # Con eventos pendientes se espera a que la ráfaga se calme (copias por trozos, renombrados)
+                timeout = self.settle if (pending or rescan) else None
+                readable, _, _ = select.select([inotify.fd, self._wake_r], [], [], timeout)
+                if self._stop_event.is_set():
+                    return
+                if inotify.fd in readable:
+                    names, overflow = inotify.read()
+                    pending |= self._stems(names)
+                    rescan |= overflow
+                    continue
+                if rescan:
+                    log_warning("Cola de inotify desbordada o carpeta movida: revalidación completa", module="Playback")
+                    pending |= set(self._known) | set(scan_setlists(self.store.directory))
+                    rescan = False
+                if pending:
+                    self._apply(pending)
+                    pending = set()
+        except Exception as e:
+            log_error("Error vigilando la carpeta de setlists", module="Playback", exc=e)
+        finally:
+            inotify.close()
+
+    def _polling_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                current = self._snapshot()
+                changed = {stem for stem in set(current) | set(self._known)
+                           if current.get(stem) != self._known.get(stem)}
+                if changed:
+                    self._apply(changed)
+            except Exception as e:
+                log_error("Error sondeando la carpeta de setlists", module="Playback", exc=e)
+
+    # ===== CAMBIOS =====
+
+    @staticmethod
+    def _stems(names) -> Set[str]:
+        """Stems de los nombres de archivo que son setlists (fuera temporales y ocultos)"""
+        stems = set()
+        for name in names:
+            stem, suffix = os.path.splitext(name)
+            if not name.startswith(".") and suffix.lower() in SETLIST_SUFFIXES:
+                stems.add(stem)
+        return stems
+
+    def _snapshot(self) -> Dict[str, Tuple[str, int, int]]:
+        result = {}
+        for stem, entry in scan_setlists(self.store.directory).items():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            result[stem] = (entry.name, st.st_mtime_ns, st.st_size)
+        return result
+
+    def _file_state(self, stem: str) -> Optional[Tuple[str, int, int]]:
+        for suffix in SETLIST_SUFFIXES:
+            path = self.store.directory / f"{stem}{suffix}"
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            return (path.name, st.st_mtime_ns, st.st_size)
+        return None
+
+    def _apply(self, stems: Set[str]):
+        """Catálogo, índice y caché solo para `stems`; publica lo que cambió de verdad"""
+        started = time.perf_counter()
+        changes = []
+        for stem in sorted(stems):
+            before = self._known.get(stem)
+            after = self._file_state(stem)
+            if before == after:
+                continue
+            if after is None:
+                del self._known[stem]
+                changes.append((stem, "removed"))
+            else:
+                self._known[stem] = after
+                changes.append((stem, "modified" if before else "added"))
+            for suffix in SETLIST_SUFFIXES:
+                self.store.cache.invalidate(str(self.store.directory / f"{stem}{suffix}"))
+        if not changes:
+            return
+
+        touched = [stem for stem, _ in changes]
+        self.store.catalog.apply(touched)
+        self.store.search_index.apply(touched)
+        log_info(f"👁 Setlists: " + ", ".join(f"{stem} ({change})" for stem, change in changes)
+                 + f" · {(time.perf_counter() - started) * 1000:.1f} ms", module="Playback")
+        self._publish(changes)
+
+    # ===== EVENTOS =====
+
+    def add_listener(self, callback: Callable[[List[dict]], None]):
+        with self._cond:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[List[dict]], None]):
+        with self._cond:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _publish(self, changes: List[Tuple[str, str]]):
+        now = time.time()
+        with self._cond:
+            events = []
+            for stem, change in changes:
+                self._seq += 1
+                events.append({"seq": self._seq, "stem": stem, "change": change, "ts": now})
+            self._events.extend(events)
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        for callback in listeners:
+            try:
+                callback(events)
+            except Exception as e:
+                log_error("Error en listener de setlists", module="Playback", exc=e)
+
+    @property
+    def seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def events_since(self, seq: int) -> List[dict]:
+        with self._cond:
+            return [event for event in self._events if event["seq"] > seq]
+
+    def wait_events(self, seq: int, timeout: float) -> List[dict]:
+        """Eventos posteriores a `seq`; bloquea hasta `timeout` si aún no hay ninguno"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._seq <= seq and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [event for event in self._events if event["seq"] > seq]
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "backend": self.backend,
+                "running": bool(self._thread and self._thread.is_alive()),
+                "setlists": len(self._known),
+                "seq": self._seq,
+            }
+
+# Instancia global
+watcher = SetlistWatcher()
+log_info("✓ Instancia global de SetlistWatcher creada", module="Playback")
@@ -0,0 +1,40 @@
+# tests/test_stream.py
+# Copyright (c) 2025 Mario Collado Rodríguez - CC BY-NC-SA 4.0
+# NO uso comercial sin autorización - mcolladorguez@gmail.com
+
+"""Lectura por streaming de setlists: el resultado no depende del tamaño de trozo"""
+
+import io
+import json
+
+import pytest
+
+from setlist.stream import iter_setlist
+
+DOCUMENTS = [
+    '{"n":12.5,"tracks":[]}',
+    '{"name": "Gira \\u00e9 \\"2025\\"", "version": 3, "tempo": 1.25e+2, "offset": -0.5E-3,\n'
+    ' "tracks": [{"title": "Intro", "start": 0, "end": 32.75}, {"title": "Outro", "start": 32.75, "end": 64}],\n'
+    ' "locators": [], "flag": true, "none": null, "last": 100}',
+    '{}',
+]
+
+
+def _collect(text: str, chunk_size: int) -> dict:
+    data = {}
+    for kind, item in iter_setlist(io.StringIO(text), chunk_size=chunk_size):
+        if kind == "track":
+            data.setdefault("tracks", []).append(item)
+        else:
+            key, value = item
+            data[key] = value
+    return data
+
+
+@pytest.mark.parametrize("chunk_size", list(range(1, 17)) + [64, 4096])
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_chunk_size_sweep(text, chunk_size):
+    expected = json.loads(text)
+    if expected.get("tracks") == []:
+        expected.pop("tracks")  # una lista vacía no produce ningún track
+    assert _collect(text, chunk_size) == expected
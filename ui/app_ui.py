@@ -16,15 +16,21 @@ import time
 import threading
 import asyncio
 from core.state import state
-from core.playback import playback
+from core.playback import playback_async
 from setlist.manager import manager
+from setlist.autosave import autosave
+from setlist.show import load_compiled, activate as activate_show
+from setlist.watcher import watcher
 from ui.themes import ThemeManager
-from ui.components import BeatIndicator, TempoDisplay, StatusBar, MetronomeButton 
+from ui.components import BeatIndicator, TempoDisplay, StatusBar, MetronomeButton, ConnectionIndicator, AutoAdvanceButton, QuantizeButton, VampButton
+from osc.health import monitor
+from core.tracing import tracer
+from core.autoadvance import autoadvance
+from core.vamp import vamp
+from core.constants import SCAN_STARTUP_DELAY, SETLIST_DEFAULT_FORMAT
 from ui.header_component import create_header, SetTimer
 from version_info import APP_VERSION
 
-DEBOUNCE_NAV_MS = 300
-
 # ============================================
 # SAFE UI UPDATE - SYNC VERSION
 # ============================================
@@ -293,7 +299,9 @@ class TrackListView:
 
     def _create_sections(self, track_index, track):
         section_items = []
+        held = vamp.held
         for sec_idx, section in enumerate(track.sections):
+            is_held = held == (track_index, sec_idx)
             section_items.append(
                 ft.Container(
                     content=ft.Row(
@@ -301,7 +309,8 @@ class TrackListView:
                             ft.Container(width=48),
                             ft.Container(width=2, height=28, bgcolor=self.theme.get("accent"), opacity=0.4),
                             ft.Container(width=10),
-                            ft.Icon(ft.Icons.PLAY_CIRCLE_OUTLINE, size=16, color=self.theme.get("accent"), opacity=0.7),
+                            ft.Icon(ft.Icons.REPEAT if is_held else ft.Icons.PLAY_CIRCLE_OUTLINE, size=16,
+                                    color=self.theme.get("accent"), opacity=1.0 if is_held else 0.7),
                             ft.Container(width=8),
                             ft.Text(section.name, size=13, weight=ft.FontWeight.W_500, expand=True, color=self.theme.get("text_primary"))
                         ],
@@ -312,6 +321,7 @@ class TrackListView:
                     border_radius=8,
                     bgcolor=self.theme.get("bg_secondary"),
                     on_click=self._create_section_click_handler(track_index, sec_idx),  # CORREGIDO
+                    on_long_press=self._create_section_hold_handler(track_index, sec_idx),
                     ink=True,
                 )
             )
@@ -355,6 +365,12 @@ class TrackListView:
             self.page.run_task(self._on_section_click, track_index, section_index)
         return handler
 
+    def _create_section_hold_handler(self, track_index, section_index):
+        """Crea handler para pulsación larga en sección (vamp)"""
+        def handler(e):
+            self.page.run_task(self._on_section_hold, track_index, section_index)
+        return handler
+
     def _create_drag_start_handler(self, track_index):
         """Crea handler para drag start"""
         def handler(e):
@@ -479,7 +495,8 @@ class TrackListView:
     async def _on_section_click(self, track_index, section_index):
         """Click en sección - ASYNC"""
         try:
-            if playback.jump_to_section(track_index, section_index):
+            trace_id = tracer.begin("ui", track_index)
+            if await playback_async.jump_to_section(track_index, section_index, trace_id=trace_id):
                 section = state.tracks[track_index].sections[section_index]
                 StatusBar.instance.text.value = f"● ▶ {section.name}"
                 StatusBar.instance.text.color = self.theme.get("accent")
@@ -487,6 +504,20 @@ class TrackListView:
         except Exception as e:
             print(f"[ERROR] _on_section_click: {e}")
 
+    async def _on_section_hold(self, track_index, section_index):
+        """Pulsación larga en sección: retener/soltar vamp - ASYNC"""
+        try:
+            if vamp.held == (track_index, section_index):
+                vamp.release()
+                StatusBar.instance.text.value = "● 🔁 Vamp liberado"
+            elif vamp.hold(track_index, section_index):
+                section = state.tracks[track_index].sections[section_index]
+                StatusBar.instance.text.value = f"● 🔁 Vamp: {section.name}"
+            StatusBar.instance.text.color = self.theme.get("accent")
+            await self.update()
+        except Exception as e:
+            print(f"[ERROR] _on_section_hold: {e}")
+
 # ============================================
 # UPDATE DEBOUNCER
 # ============================================
@@ -532,17 +563,20 @@ class ControlPanel:
     def __init__(self, theme: ThemeManager, page: ft.Page):
         self.theme = theme
         self.page = page
-        self.last_nav_time = 0
 
         self.metronome_btn = MetronomeButton(theme.get, lambda e: page.run_task(self._on_metronome_click, e))
         self.tempo_display = TempoDisplay(theme.get, state.current_tempo, state.time_signature_num)
         self.beat_indicator = BeatIndicator(theme.get)
+        self.connection_indicator = ConnectionIndicator(theme.get)
         
         self.play_btn = self._create_button("PLAY", ft.Icons.PLAY_ARROW_ROUNDED, self._on_play, "button_play")
         self.stop_btn = self._create_button("STOP", ft.Icons.STOP_ROUNDED, self._on_stop, "button_stop")
         self.prev_btn = self._create_nav_btn(ft.Icons.SKIP_PREVIOUS_ROUNDED, self._on_prev)
         self.next_btn = self._create_nav_btn(ft.Icons.SKIP_NEXT_ROUNDED, self._on_next)
         self.scan_btn = self._create_button("SCAN", ft.Icons.SEARCH_ROUNDED, self._on_scan, "button_scan")
+        self.auto_btn = AutoAdvanceButton(theme.get, lambda e: page.run_task(self._on_auto_advance_click, e), autoadvance.mode)
+        self.quantize_btn = QuantizeButton(theme.get, lambda e: page.run_task(self._on_quantize_click, e), playback_async.quantize)
+        self.vamp_btn = VampButton(theme.get, lambda e: page.run_task(self._on_vamp_click, e))
 
         self.container = ft.Column(
             spacing=10,
@@ -552,6 +586,7 @@ class ControlPanel:
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                         spacing=10,
                         controls=[
+                            self.connection_indicator.container,
                             self.metronome_btn.button,
                             self.tempo_display.text,
                             self.beat_indicator.container,
@@ -570,6 +605,9 @@ class ControlPanel:
                             self.play_btn,
                             self.stop_btn,
                             ft.Row(alignment=ft.MainAxisAlignment.SPACE_BETWEEN, controls=[self.prev_btn, self.next_btn]),
+                            self.auto_btn.button,
+                            self.quantize_btn.button,
+                            self.vamp_btn.button,
                             self.scan_btn
                         ]
                     ),
@@ -612,7 +650,7 @@ class ControlPanel:
 
     async def _on_metronome_click(self, e):
         try:
-            is_on = playback.toggle_metronome()
+            is_on = await playback_async.toggle_metronome()
             self.metronome_btn.set_state(is_on)
             
             StatusBar.instance.text.value = f"● Metrónomo: {'ON' if is_on else 'OFF'}"
@@ -621,6 +659,45 @@ class ControlPanel:
         except Exception as ex:
             print(f"[ERROR] _on_metronome_click: {ex}")
 
+    async def _on_auto_advance_click(self, e):
+        try:
+            mode = autoadvance.cycle_mode()
+            self.auto_btn.set_mode(mode)
+            
+            StatusBar.instance.text.value = f"● Auto-advance: {mode.upper()}"
+            StatusBar.instance.text.color = self.theme.get("accent") if mode != "off" else self.theme.get("text_secondary")
+            self.page.update()
+        except Exception as ex:
+            print(f"[ERROR] _on_auto_advance_click: {ex}")
+
+    async def _on_vamp_click(self, e):
+        try:
+            held = vamp.toggle_current()
+            self.vamp_btn.set_mode("hold" if held is not None else "off")
+            
+            if held is not None:
+                section = state.tracks[held[0]].sections[held[1]]
+                StatusBar.instance.text.value = f"● 🔁 Vamp: {section.name}"
+                StatusBar.instance.text.color = self.theme.get("accent")
+            else:
+                StatusBar.instance.text.value = "● 🔁 Vamp liberado"
+                StatusBar.instance.text.color = self.theme.get("text_secondary")
+            self.page.update()
+            await TrackListView.instance.update()
+        except Exception as ex:
+            print(f"[ERROR] _on_vamp_click: {ex}")
+
+    async def _on_quantize_click(self, e):
+        try:
+            mode = playback_async.cycle_quantize()
+            self.quantize_btn.set_mode(mode)
+            
+            StatusBar.instance.text.value = f"● Cuantización: {QuantizeButton.LABELS[mode][3:]}"
+            StatusBar.instance.text.color = self.theme.get("accent") if mode != "immediate" else self.theme.get("text_secondary")
+            self.page.update()
+        except Exception as ex:
+            print(f"[ERROR] _on_quantize_click: {ex}")
+
     async def _on_play(self, e):
         try:
             current_idx = state.current_index
@@ -632,11 +709,9 @@ class ControlPanel:
                 self.page.update()
                 return
             
-            if state.is_playing:
-                playback.stop()
-                await asyncio.sleep(0.1)
-            
-            if playback.play_track(current_idx):
+            # play_track detiene y espera la confirmación de Ableton antes de saltar
+            trace_id = tracer.begin("ui", current_idx)
+            if await playback_async.play_track(current_idx, trace_id=trace_id):
                 track = state.tracks[current_idx]
                 StatusBar.instance.text.value = f"● ▶ Play: {track.title}"
                 StatusBar.instance.text.color = self.theme.get("button_play")
@@ -651,7 +726,7 @@ class ControlPanel:
 
     async def _on_stop(self, e):
         try:
-            playback.stop()
+            await playback_async.stop()
             StatusBar.instance.text.value = "● ▪ Stop"
             StatusBar.instance.text.color = self.theme.get("button_stop")
             self.page.update()
@@ -659,76 +734,52 @@ class ControlPanel:
             print(f"[ERROR] _on_stop: {ex}")
 
     async def _on_next(self, e):
-        try:
-            if not self._check_nav_debounce():
-                return
-            
-            if playback.next_track():
-                await asyncio.sleep(0.12)
-                await TrackListView.instance.update()
-                
-                track = state.get_current_track()
-                if track:
-                    StatusBar.instance.text.value = f"● ▶ Next: {track.title}"
-                    StatusBar.instance.text.color = self.theme.get("button_play")
-                    self.page.update()
-            else:
-                StatusBar.instance.text.value = "● ⊘ Último track"
-                StatusBar.instance.text.color = self.theme.get("text_secondary")
-                self.page.update()
-        except Exception as ex:
-            print(f"[ERROR] _on_next: {ex}")
+        await self._navigate(1, "Next", "● ⊘ Último track")
 
     async def _on_prev(self, e):
+        await self._navigate(-1, "Prev", "● ⊘ Primer track")
+
+    async def _navigate(self, delta: int, label: str, edge_text: str):
+        """Encola la navegación; las pulsaciones rápidas se colapsan en un solo lanzamiento"""
         try:
-            if not self._check_nav_debounce():
+            request = playback_async.request_navigation(delta=delta, trace_id=tracer.begin("ui"))
+            if request is None:
+                StatusBar.instance.text.value = edge_text
+                StatusBar.instance.text.color = self.theme.get("text_secondary")
+                self.page.update()
                 return
             
-            if playback.prev_track():
-                await asyncio.sleep(0.12)
+            # Feedback inmediato con el objetivo pendiente
+            track = state.tracks[request.target]
+            StatusBar.instance.text.value = f"● ▶ {label}: {track.title}"
+            StatusBar.instance.text.color = self.theme.get("button_play")
+            self.page.update()
+            
+            ok = await asyncio.wrap_future(request.done)
+            if ok is None:
+                return  # Reemplazada por una pulsación posterior
+            if ok:
                 await TrackListView.instance.update()
-                
-                track = state.get_current_track()
-                if track:
-                    StatusBar.instance.text.value = f"● ▶ Prev: {track.title}"
-                    StatusBar.instance.text.color = self.theme.get("button_play")
-                    self.page.update()
             else:
-                StatusBar.instance.text.value = "● ⊘ Primer track"
-                StatusBar.instance.text.color = self.theme.get("text_secondary")
+                StatusBar.instance.text.value = "● Error al reproducir"
+                StatusBar.instance.text.color = self.theme.get("button_stop")
                 self.page.update()
         except Exception as ex:
-            print(f"[ERROR] _on_prev: {ex}")
+            print(f"[ERROR] _navigate: {ex}")
 
     async def _on_scan(self, e):
         try:
-            StatusBar.instance.text.value = "● ⟳ Escaneando Ableton..."
-            StatusBar.instance.text.color = self.theme.get("button_scan")
-            self.page.update()
+            # SCAN durante un scan en curso: cancelarlo
+            if playback_async.cancel_scan():
+                return
 
-            if playback.scan_all():
-                await asyncio.sleep(0.6)
-                
+            # El progreso por etapas lo pinta update_scan_progress
+            if await playback_async.scan():
                 state.current_index = 0 if state.get_track_count() > 0 else -1
                 await TrackListView.instance.update()
-                
-                StatusBar.instance.text.value = f"● ✓ Scan completo: {state.get_track_count()} tracks"
-                StatusBar.instance.text.color = self.theme.get("button_play")
-                self.page.update()
-            else:
-                StatusBar.instance.text.value = "● ✗ Error en scan"
-                StatusBar.instance.text.color = self.theme.get("button_stop")
-                self.page.update()
         except Exception as ex:
             print(f"[ERROR] _on_scan: {ex}")
 
-    def _check_nav_debounce(self) -> bool:
-        now = time.time()
-        if now - self.last_nav_time < DEBOUNCE_NAV_MS / 1000:
-            return False
-        self.last_nav_time = now
-        return True
-
 
 # ============================================
 # DIALOG MANAGER
@@ -737,6 +788,7 @@ class DialogManager:
     def __init__(self, page: ft.Page, theme: ThemeManager):
         self.page = page
         self.theme = theme
+        self._load_seq = 0  # carga en curso; los lotes de cargas anteriores se ignoran
 
     async def show_save_setlist(self):
         if not state.locators:
@@ -754,6 +806,16 @@ class DialogManager:
             color=self.theme.get("text_primary"),
             border_color=self.theme.get("accent"),
         )
+        binary_check = ft.Checkbox(
+            label="Formato binario compacto (.lcs)",
+            value=SETLIST_DEFAULT_FORMAT == "lcs",
+            label_style=ft.TextStyle(size=12, color=self.theme.get("text_secondary")),
+        )
+        compile_check = ft.Checkbox(
+            label="Compilar show para directo (.lcshow)",
+            value=False,
+            label_style=ft.TextStyle(size=12, color=self.theme.get("text_secondary")),
+        )
         error_text = ft.Text("", size=12, color=ft.Colors.RED_400, visible=False)
 
         async def close_dlg(e=None):
@@ -768,10 +830,15 @@ class DialogManager:
                 self.page.update()
                 return
 
-            if manager.save(name, state.locators, state.tracks):
+            if manager.save(name, state.locators, state.tracks, fmt="lcs" if binary_check.value else "json"):
                 sections_count = sum(len(t.sections) for t in state.tracks)
                 StatusBar.instance.text.value = f"● ✓ '{name}' guardado ({len(state.locators)} locators, {len(state.tracks)} tracks, {sections_count} sections)"
                 StatusBar.instance.text.color = self.theme.get("button_play")
+                if compile_check.value:
+                    if manager.compile_show(name):
+                        StatusBar.instance.text.value += " · show compilado"
+                    else:
+                        StatusBar.instance.text.value += " · ✖ show sin compilar (ver log)"
                 await close_dlg()
                 await self._update_setlist_counter()
             else:
@@ -795,6 +862,8 @@ class DialogManager:
                         italic=True, 
                         color=self.theme.get("text_secondary")
                     ),
+                    binary_check,
+                    compile_check,
                     error_text
                 ]
             ),
@@ -807,18 +876,40 @@ class DialogManager:
         self.page.open(dlg)
 
     async def show_load_setlist(self):
-        saved = manager.list_all()
+        # Catálogo: lista y previsualización sin parsear ningún setlist
+        saved = manager.list_entries()
+        by_stem = {entry["stem"]: entry for entry in saved}
+        recoverable = autosave.generations_available()
 
         async def close_dlg(e=None):
             dlg.open = False
             self.page.update()
 
-        async def do_load(e=None):
-            if not dropdown.value:
+        async def do_load(e=None, recover=False):
+            if not recover and not dropdown.value:
                 return
 
             try:
-                data = manager.load(dropdown.value)
+                self._load_seq += 1
+                seq = self._load_seq
+                stream = None
+
+                # Show compilado del mismo guardado: setlist + datagramas listos, sin trabajo por pulsación
+                entry = None if recover else by_stem.get(dropdown.value)
+                compiled = load_compiled(dropdown.value, entry["timestamp"]) if entry else None
+                if compiled:
+                    data = {"name": compiled.name, "locators": compiled.locators}
+                elif recover:
+                    data = autosave.recover()
+                else:
+                    # Un .json grande llega por partes: cabecera y primeros tracks ya, el resto por lotes
+                    total = entry["tracks"] if entry else None
+                    stream = manager.load_streaming(
+                        dropdown.value,
+                        on_batch=lambda load, tracks: self._on_stream_progress(seq, load, total),
+                        on_done=lambda load: self._on_stream_progress(seq, load, total),
+                    )
+                    data = stream.data() if stream else None
                 if not data or "locators" not in data:
                     StatusBar.instance.text.value = "● ✖ Error al cargar"
                     StatusBar.instance.text.color = self.theme.get("button_stop")
@@ -826,41 +917,86 @@ class DialogManager:
                     return
 
                 if state.is_playing:
-                    playback.stop()
-                    await asyncio.sleep(0.2)
+                    await playback_async.stop()
 
-                state.locators = data["locators"]
-                if "tracks" in data:
-                    state.tracks = data["tracks"]
+                if compiled:
+                    activate_show(compiled)
+                else:
+                    state.locators = data["locators"]
+                    if "tracks" in data:
+                        state.tracks = data["tracks"]
 
-                state.current_index = 0 if state.tracks else -1
+                    state.current_index = 0 if state.tracks else -1
 
                 await TrackListView.instance.update()
 
-                total_sections = sum(len(t.sections) for t in state.tracks)
-                StatusBar.instance.text.value = f"● ✓ '{data['name']}' cargado ({len(state.locators)} locators, {len(state.tracks)} tracks, {total_sections} sections)"
-                StatusBar.instance.text.color = self.theme.get("button_play")
-                self.page.update()
+                if stream is not None and not stream.done:
+                    self._show_stream_progress(data, total)
+                else:
+                    self._show_loaded(data["name"], " · show compilado" if compiled else "")
                 await close_dlg()
             except Exception as ex:
                 print(f"[ERROR] do_load: {ex}")
                 import traceback
                 traceback.print_exc()
 
+        preview_text = ft.Text("", size=12, color=self.theme.get("text_primary"))
+
+        def on_select(e):
+            entry = by_stem.get(dropdown.value)
+            preview_text.value = self._format_setlist_preview(entry) if entry else ""
+            self.page.update()
+
+        def setlist_options(entries):
+            return [
+                ft.dropdown.Option(key=entry["stem"], text=f"{entry['name'] or entry['stem']} · {entry['tracks']} tracks")
+                for entry in entries
+            ]
+
+        def on_search(e):
+            # Índice invertido: filtra setlists por canción/sección y muestra dónde aparece
+            query = search_field.value.strip()
+            if not query:
+                dropdown.options = setlist_options(saved)
+                preview_text.value = ""
+            else:
+                results = manager.search(query, limit=20)
+                stems = list(dict.fromkeys(r["stem"] for r in results))
+                dropdown.options = setlist_options(by_stem[s] for s in stems if s in by_stem)
+                if dropdown.value not in stems:
+                    dropdown.value = stems[0] if stems else None
+                preview_text.value = "\n".join(
+                    f"🎵 {r['track']} · {r['setlist']}" + (f" — {', '.join(r['matched_sections'])}" if r["matched_sections"] else "")
+                    for r in results[:6]
+                ) or "Sin coincidencias"
+            self.page.update()
+
         if saved:
+            search_field = ft.TextField(
+                label="Buscar canción o sección",
+                width=350,
+                dense=True,
+                bgcolor=self.theme.get("bg_card"),
+                color=self.theme.get("text_primary"),
+                border_color=self.theme.get("accent"),
+                on_change=on_search,
+            )
             dropdown = ft.Dropdown(
                 label="Setlists guardados",
-                options=[ft.dropdown.Option(name) for name in saved],
+                options=setlist_options(saved),
                 width=350,
                 bgcolor=self.theme.get("bg_card"),
                 border_color=self.theme.get("accent"),
+                on_change=on_select,
             )
             content = ft.Column(
                 width=400,
                 tight=True,
                 spacing=10,
                 controls=[
+                    search_field,
                     dropdown,
+                    preview_text,
                     ft.Text(
                         f"📁 {len(saved)} setlist(s) disponible(s)", 
                         size=12, 
@@ -890,6 +1026,14 @@ class DialogManager:
             )
             actions = [ft.TextButton("Cerrar", on_click=lambda e: self.page.run_task(close_dlg, e))]
 
+        if recoverable:
+            # Último autoguardado (p.ej. tras un cierre inesperado)
+            actions.insert(0, ft.TextButton(
+                "♻ Recuperar autoguardado",
+                tooltip=f"{recoverable[0]['name']} · {time.strftime('%H:%M:%S', time.localtime(recoverable[0]['mtime']))}",
+                on_click=lambda e: self.page.run_task(do_load, e, True)
+            ))
+
         dlg = ft.AlertDialog(
             modal=True,
             title=ft.Text("📂 Cargar Setlist", color=self.theme.get("text_primary")),
@@ -900,6 +1044,52 @@ class DialogManager:
         )
         self.page.open(dlg)
 
+    @staticmethod
+    def _format_setlist_preview(entry: dict) -> str:
+        """Resumen de una entrada del catálogo para el diálogo de carga"""
+        seconds = entry["duration_beats"] * 60.0 / state.current_tempo if state.current_tempo > 0 else 0
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        return (
+            f"🎵 {entry['tracks']} tracks · {entry['sections']} secciones · {entry['locators']} locators\n"
+            f"⏱ {minutes}:{seconds:02d} a {state.current_tempo:.0f} BPM · {entry['size'] / 1024:.1f} KB ({entry.get('format', 'json')})\n"
+            f"🕒 Guardado: {entry['timestamp'] or 'desconocido'}"
+        )
+
+    def _show_loaded(self, name: str, suffix: str = ""):
+        total_sections = sum(len(t.sections) for t in state.tracks)
+        StatusBar.instance.text.value = f"● ✓ '{name}' cargado ({len(state.locators)} locators, {len(state.tracks)} tracks, {total_sections} sections){suffix}"
+        StatusBar.instance.text.color = self.theme.get("button_play")
+        self.page.update()
+
+    def _show_stream_progress(self, data: dict, total: int = None):
+        StatusBar.instance.text.value = f"● ⏳ '{data.get('name', '')}' cargando… {len(data['tracks'])}" + (f"/{total}" if total else "") + " tracks"
+        StatusBar.instance.text.color = self.theme.get("text_secondary")
+        self.page.update()
+
+    def _on_stream_progress(self, seq: int, load, total: int = None):
+        """Lote nuevo o fin de una carga por streaming (thread de carga)"""
+        if seq != self._load_seq or load.cancelled:
+            load.cancel()  # Ya se cargó otro setlist encima
+            return
+        # Siempre la lista completa hasta ahora: no importa el orden en que lleguen lotes y do_load
+        data = load.data()
+        state.tracks = data["tracks"]
+        if state.current_index < 0 and state.tracks:
+            state.current_index = 0
+
+        async def refresh():
+            await TrackListView.instance.update()
+            if not load.done:
+                self._show_stream_progress(data, total)
+            elif load.error is not None:
+                StatusBar.instance.text.value = f"● ✖ '{data.get('name', '')}' cargado a medias ({len(data['tracks'])} tracks, ver log)"
+                StatusBar.instance.text.color = self.theme.get("button_stop")
+                self.page.update()
+            else:
+                self._show_loaded(data.get("name", ""))
+
+        self.page.run_task(refresh)
+
     async def _update_setlist_counter(self):
             count = len(manager.list_all())
             if hasattr(self, 'save_counter'):
@@ -961,6 +1151,12 @@ def main(page: ft.Page):
     )
     dialog_manager.save_counter = save_counter
 
+    def on_setlists_changed(events):
+        """Setlists añadidos/cambiados/borrados en la carpeta (thread del watcher)"""
+        page.run_task(dialog_manager._update_setlist_counter)
+
+    watcher.add_listener(on_setlists_changed)
+
     save_btn = ft.IconButton(
         icon=ft.Icons.SAVE,
         on_click=lambda e: page.run_task(dialog_manager.show_save_setlist),
@@ -1108,11 +1304,32 @@ def main(page: ft.Page):
             if "__uid" not in str(e):
                 print(f"[ERROR] update_metronome_ui: {e}")
 
+    def update_connection_status_wrapper():
+        """Wrapper thread-safe para update_connection_status desde el monitor"""
+        try:
+            health = monitor.snapshot()
+            control_panel.connection_indicator.set_status(health["status"], health["srtt_ms"])
+            safe_ui_update_sync(page)
+        except Exception as e:
+            if "__uid" not in str(e):
+                print(f"[ERROR] update_connection_status: {e}")
+
+    def update_scan_progress_wrapper(scan: dict):
+        """Wrapper thread-safe para update_scan_progress desde ScanPipeline"""
+        try:
+            status_bar.set_scan_progress(scan, state.get_track_count())
+            safe_ui_update_sync(page)
+        except Exception as e:
+            if "__uid" not in str(e):
+                print(f"[ERROR] update_scan_progress: {e}")
+
     # Asignar wrappers a page para que OSC los llame
     page.trigger_pulse = trigger_pulse_wrapper
     page.update_tempo_display = update_tempo_display_wrapper
     page.update_listbox = update_listbox_wrapper
     page.update_metronome_ui = update_metronome_ui_wrapper
+    page.update_connection_status = update_connection_status_wrapper
+    page.update_scan_progress = update_scan_progress_wrapper
 
     # ============================================
     # SCAN INICIAL - VERSIÓN ROBUSTA
@@ -1120,45 +1337,27 @@ def main(page: ft.Page):
     async def run_initial_scan():
         """Ejecuta el scan después de que la UI esté completamente renderizada"""
         try:
-            print("[INIT] ⏳ UI renderizada, esperando estabilización...")
-            await asyncio.sleep(1.2)
+            # La etapa de conexión del scan sondea a Ableton: basta con ceder el primer frame
+            await asyncio.sleep(SCAN_STARTUP_DELAY)
             
             print("[INIT] ⟳ Ejecutando scan inicial...")
 
-            # Ejecutar scan en thread separado
-            scan_complete = threading.Event()
-            scan_success = [False]
-
-            def do_scan():
-                try:
-                    if playback.scan_all():
-                        time.sleep(0.6)
-                        if state.get_track_count() > 0:
-                            state.current_index = 0
-                            scan_success[0] = True
-                            print(f"[INIT] ✓ {state.get_track_count()} tracks detectados")
-                        else:
-                            print("[INIT] ⚠ No se detectaron tracks")
-                    else:
-                        print("[INIT] ✗ Error en scan inicial")
-                except Exception as e:
-                    print(f"[ERROR] do_scan: {e}")
-                finally:
-                    scan_complete.set()
-
-            scan_thread = threading.Thread(target=do_scan, daemon=True)
-            scan_thread.start()
-
-            # Esperar a que termine (timeout 10s)
-            await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: scan_complete.wait(timeout=10.0)
-            )
+            # El scan corre en el loop de reproducción y espera las respuestas OSC
+            scan_success = False
+            scanned = await playback_async.scan()
+            if scanned:
+                if state.get_track_count() > 0:
+                    state.current_index = 0
+                    scan_success = True
+                    print(f"[INIT] ✓ {state.get_track_count()} tracks detectados")
+                else:
+                    print("[INIT] ⚠ No se detectaron tracks")
+            else:
+                print("[INIT] ✗ Error en scan inicial")
 
             # Actualizar UI si hay tracks
-            if scan_success[0] and state.get_track_count() > 0:
+            if scan_success and state.get_track_count() > 0:
                 print("[INIT] Actualizando UI con tracks...")
-                await asyncio.sleep(0.3)
                 
                 if TrackListView.instance:
                     await TrackListView.instance.update()
@@ -1168,6 +1367,10 @@ def main(page: ft.Page):
             else:
                 print("[INIT] ⚠ No hay tracks para mostrar en UI")
 
+            # Con Ableton respondiendo: calibrar tiempos OSC si no hay perfil vigente para este equipo
+            if scanned:
+                await playback_async.calibrate()
+
         except Exception as e:
             print(f"[ERROR] run_initial_scan: {e}")
             import traceback
@@ -95,6 +95,132 @@ class StatusBar:
         self.text = ft.Text("● Esperando...",
                             size=12, weight=ft.FontWeight.W_500,
                             color=get_color_fn("text_secondary"))
+    
+    def set_scan_progress(self, scan: dict, track_count: int = 0):
+        """Pinta el progreso del scan por etapas (snapshot de ScanPipeline) - SÍNCRONO"""
+        try:
+            stages = {stage["name"]: stage for stage in scan["stages"]}
+            if scan["running"]:
+                stage = stages.get(scan["current"])
+                step = f" · {stage['label']}" if stage else ""
+                detail = f" {stage['detail']}" if stage and stage["detail"] else ""
+                self.text.value = f"● ⟳ Scan {scan['progress'] * 100:.0f}%{step}{detail}"
+                self.text.color = self.get_color("button_scan")
+            elif scan["result"] == "done":
+                self.text.value = f"● ✓ Scan completo: {track_count} tracks · {scan['elapsed_ms']:.0f} ms"
+                self.text.color = self.get_color("button_play")
+            elif scan["result"] == "cancelled":
+                self.text.value = "● ⊘ Scan cancelado"
+                self.text.color = self.get_color("text_secondary")
+            else:
+                failed = next((s for s in scan["stages"] if s["status"] == "failed"), None)
+                reason = f": {failed['label']} - {failed['detail']}" if failed else ""
+                self.text.value = f"● ✗ Error en scan{reason}"
+                self.text.color = self.get_color("button_stop")
+        except Exception as e:
+            print(f"[ERROR] StatusBar.set_scan_progress: {e}")
+
+
+class ConnectionIndicator:
+    """Indicador del estado de conexión con Ableton"""
+    
+    STYLES = {
+        "connected": (ft.Colors.GREEN_400, "LIVE ONLINE"),
+        "degraded": (ft.Colors.AMBER_400, "LIVE LENTO"),
+        "lost": (ft.Colors.RED_400, "LIVE OFFLINE"),
+        "unknown": (None, "CONECTANDO..."),
+    }
+    
+    def __init__(self, get_color_fn):
+        self.get_color = get_color_fn
+        self.dot = ft.Container(width=10, height=10, border_radius=5)
+        self.label = ft.Text("", size=11, weight=ft.FontWeight.W_600)
+        self.container = ft.Row(
+            spacing=6,
+            alignment=ft.MainAxisAlignment.CENTER,
+            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+            controls=[self.dot, self.label]
+        )
+        self.set_status("unknown")
+    
+    def set_status(self, status: str, rtt_ms: float = None):
+        """Actualiza color y texto - SÍNCRONO"""
+        try:
+            color, text = self.STYLES.get(status, self.STYLES["unknown"])
+            color = color or self.get_color("text_secondary")
+            self.dot.bgcolor = color
+            self.label.color = color
+            self.label.value = f"{text} · {rtt_ms:.0f} ms" if rtt_ms is not None and status != "lost" else text
+        except Exception as e:
+            print(f"[ERROR] ConnectionIndicator.set_status: {e}")
+
+
+class AutoAdvanceButton:
+    """Selector del modo de auto-advance (cicla off → segue → gap → stop)"""
+    
+    ICON = ft.Icons.QUEUE_PLAY_NEXT
+    INACTIVE = "off"
+    LABELS = {
+        "off": "AUTO OFF",
+        "segue": "AUTO SEGUE",
+        "gap": "AUTO GAP",
+        "stop": "AUTO STOP",
+    }
+    
+    def __init__(self, get_color_fn, on_click_fn, mode: str = "off"):
+        self.get_color = get_color_fn
+        self.mode = mode
+        self.button = ft.OutlinedButton(
+            icon=self.ICON,
+            text=self.LABELS.get(mode, mode.upper()),
+            on_click=on_click_fn,
+            width=220,
+            height=44
+        )
+        self._update_style()
+    
+    def set_mode(self, mode: str):
+        """Establece el modo - SÍNCRONO"""
+        try:
+            self.mode = mode
+            self._update_style()
+        except Exception as e:
+            print(f"[ERROR] AutoAdvanceButton.set_mode: {e}")
+    
+    def _update_style(self):
+        try:
+            active = self.mode != self.INACTIVE
+            self.button.text = self.LABELS.get(self.mode, self.mode.upper())
+            self.button.style = ft.ButtonStyle(
+                color=self.get_color("accent" if active else "text_secondary"),
+                side=ft.BorderSide(1, self.get_color("accent" if active else "text_secondary"))
+            )
+        except Exception as e:
+            print(f"[ERROR] AutoAdvanceButton._update_style: {e}")
+
+
+class QuantizeButton(AutoAdvanceButton):
+    """Selector de cuantización de lanzamientos (immediate → beat → bar → section)"""
+    
+    ICON = ft.Icons.STRAIGHTEN
+    INACTIVE = "immediate"
+    LABELS = {
+        "immediate": "Q: INMEDIATO",
+        "beat": "Q: BEAT",
+        "bar": "Q: COMPÁS",
+        "section": "Q: SECCIÓN",
+    }
+
+
+class VampButton(AutoAdvanceButton):
+    """Retener/soltar la sección que está sonando"""
+    
+    ICON = ft.Icons.REPEAT
+    INACTIVE = "off"
+    LABELS = {
+        "off": "VAMP",
+        "hold": "VAMP ON",
+    }
 
 
 class MetronomeButton:
@@ -64,6 +64,123 @@ CONTROLLER_HTML = """
       user-select: none;
     }
 
+    /* ESTADO DE CONEXIÓN */
+    .conn {
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      gap: 6px;
+      margin: -6px 0 12px;
+      font-size: 0.75em;
+      font-weight: 600;
+      letter-spacing: 1px;
+      color: #94a3b8;
+      user-select: none;
+    }
+
+    .conn-dot {
+      width: 9px;
+      height: 9px;
+      border-radius: 50%;
+      background: #94a3b8;
+    }
+
+    .conn.connected { color: #4ade80; }
+    .conn.connected .conn-dot { background: #4ade80; }
+    .conn.degraded { color: #fbbf24; }
+    .conn.degraded .conn-dot { background: #fbbf24; }
+    .conn.lost { color: #f87171; }
+    .conn.lost .conn-dot { background: #f87171; }
+
+    /* TRANSPORTE EN VIVO (eventos /events) */
+    .transport {
+      margin: -6px 0 12px;
+      font-size: 0.75em;
+      font-weight: 600;
+      letter-spacing: 1px;
+      text-align: center;
+      color: #94a3b8;
+      white-space: nowrap;
+      overflow: hidden;
+      text-overflow: ellipsis;
+    }
+
+    .transport.playing { color: #4ade80; }
+
+    /* PROGRESO DEL SCAN */
+    .scan {
+      display: none;
+      margin: -6px auto 12px;
+      width: 100%;
+      max-width: 500px;
+      font-size: 0.72em;
+      font-weight: 600;
+      letter-spacing: 1px;
+      text-align: center;
+      color: #38bdf8;
+      user-select: none;
+      cursor: pointer;
+    }
+
+    .scan.visible { display: block; }
+    .scan.failed { color: #f87171; }
+
+    .scan-bar {
+      height: 3px;
+      margin-top: 4px;
+      border-radius: 2px;
+      background: rgba(56, 189, 248, 0.2);
+      overflow: hidden;
+    }
+
+    .scan-fill {
+      height: 100%;
+      width: 0;
+      background: #38bdf8;
+      transition: width 0.2s ease;
+    }
+
+    /* BÚSQUEDA EN SETLISTS GUARDADOS */
+    .search {
+      width: 100%;
+      max-width: 500px;
+      margin: 0 auto 14px;
+    }
+
+    .search input {
+      width: 100%;
+      box-sizing: border-box;
+      padding: 10px 14px;
+      border-radius: 10px;
+      border: 1px solid rgba(56, 189, 248, 0.35);
+      background: rgba(15, 23, 42, 0.6);
+      color: #e2e8f0;
+      font-size: 0.95em;
+    }
+
+    .search-hit {
+      margin-top: 6px;
+      padding: 8px 12px;
+      border-radius: 8px;
+      background: rgba(30, 41, 59, 0.7);
+      font-size: 0.8em;
+      color: #94a3b8;
+      text-align: left;
+    }
+
+    .search-hit b { color: #e2e8f0; }
+    .search-hit .match { color: #38bdf8; font-weight: 600; }
+
+    .setlists-info {
+      margin-top: 4px;
+      font-size: 0.75em;
+      color: #64748b;
+      text-align: right;
+      transition: color 0.3s ease;
+    }
+
+    .setlists-info.changed { color: #38bdf8; }
+
     /* CONTROLES STICKY */
     .controls-row {
       display: flex;
@@ -100,6 +217,11 @@ CONTROLLER_HTML = """
       transition-duration: 0.05s;
     }
 
+    .control-btn.nav-btn {
+      flex: 0 0 auto;
+      min-width: 64px;
+    }
+
     #stop-btn {
       background: linear-gradient(135deg, #dc2626, #991b1b);
       border-color: rgba(239, 68, 68, 0.5);
@@ -208,6 +330,16 @@ CONTROLLER_HTML = """
       transition-duration: 0.05s;
     }
 
+    .track-btn.current {
+      border-color: #38bdf8;
+      background: rgba(56, 189, 248, 0.18);
+    }
+
+    .track-btn.current.playing {
+      border-color: #4ade80;
+      background: rgba(74, 222, 128, 0.18);
+    }
+
     form {
       width: 100%;
       margin: 0;
@@ -368,25 +500,38 @@ CONTROLLER_HTML = """
   <!-- HEADER STICKY -->
   <div class="header">
     <h1>Ableton Controller</h1>
+    <div id="conn" class="conn"><span class="conn-dot"></span><span id="conn-text">CONECTANDO...</span></div>
+    <div id="transport" class="transport"></div>
+    <div id="scan" class="scan" title="Tocar para cancelar">
+      <span id="scan-text"></span>
+      <div class="scan-bar"><div id="scan-fill" class="scan-fill"></div></div>
+    </div>
     
     <!-- CONTROLES STICKY -->
     <div class="controls-row">
+      <button id="prev-btn" class="control-btn nav-btn">⏮</button>
       <button id="stop-btn" class="control-btn">
         ⏹ STOP
       </button>
       <button id="metro-btn" class="control-btn">
         🎵 CLICK OFF
       </button>
+      <button id="next-btn" class="control-btn nav-btn">⏭</button>
     </div>
   </div>
 
   <!-- CONTENEDOR SCROLLABLE DE TRACKS -->
   <div class="tracks-container">
-    <div class="grid">
+    <div class="search">
+      <input id="search-input" type="search" placeholder="🔍 Buscar canción o sección en setlists guardados" autocomplete="off">
+      <div id="setlists-info" class="setlists-info"></div>
+      <div id="search-results"></div>
+    </div>
+    <div id="grid" class="grid">
       {% for i, t in tracks %}
         <form action="/play" method="post">
           <input type="hidden" name="index" value="{{ i }}">
-          <button class="track-btn">▶ {{ t.title }}</button>
+          <button class="track-btn" data-index="{{ i }}">▶ {{ t.title }}</button>
         </form>
       {% endfor %}
     </div>
@@ -399,9 +544,53 @@ CONTROLLER_HTML = """
     // Estado del metrónomo
     let metronomeOn = false;
 
+    // Canal de comandos por WebSocket: ack con id de correlación y "done" al terminar.
+    // Sin conexión abierta (o sin /ws en el servidor) los botones usan HTTP como siempre.
+    const commands = {socket: null, nextId: 1, pending: new Map(), failures: 0};
+
+    function connectCommands() {
+      const socket = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws');
+      socket.onopen = () => { commands.socket = socket; commands.failures = 0; };
+      socket.onmessage = event => {
+        const msg = JSON.parse(event.data);
+        const entry = commands.pending.get(msg.id);
+        if (!entry) return;
+        if (msg.type === 'ack' && msg.pending) return;
+        commands.pending.delete(msg.id);
+        if (msg.type === 'error' || msg.ok === false) entry.reject(new Error(msg.error));
+        else entry.resolve(msg);
+      };
+      socket.onclose = () => {
+        const wasOpen = commands.socket === socket;
+        commands.socket = null;
+        commands.pending.forEach(entry => entry.reject(new Error('WebSocket cerrado')));
+        commands.pending.clear();
+        // Servidor sin flask-sock: tras unos intentos fallidos se queda en HTTP
+        if (!wasOpen && ++commands.failures >= 3) return;
+        setTimeout(connectCommands, wasOpen ? 1000 : 5000);
+      };
+    }
+
+    // Promesa con el "done" del comando; null si no hay WebSocket (usar HTTP)
+    function sendCommand(cmd, args) {
+      if (!commands.socket || commands.socket.readyState !== WebSocket.OPEN) return null;
+      const id = commands.nextId++;
+      return new Promise((resolve, reject) => {
+        commands.pending.set(id, {resolve, reject});
+        commands.socket.send(JSON.stringify(Object.assign({id: id, cmd: cmd}, args || {})));
+      });
+    }
+
+    if (window.WebSocket) connectCommands();
+
     // Botón STOP
     document.getElementById('stop-btn').addEventListener('click', function(event) {
       event.preventDefault();
+      const sent = sendCommand('stop');
+      if (sent) {
+        sent.catch(err => console.error("Error STOP:", err));
+        return;
+      }
       fetch("/stop", {method: "POST"})
         .then(response => {
           if (!response.ok) {
@@ -411,12 +600,44 @@ CONTROLLER_HTML = """
         .catch(err => console.error("Error STOP:", err));
     });
 
+    // Botones PREV / NEXT (las pulsaciones rápidas se colapsan en el servidor)
+    function navigate(path) {
+      const sent = sendCommand(path.slice(1));
+      if (sent) {
+        sent.catch(err => console.error("Error " + path + ":", err.message));
+        return;
+      }
+      fetch(path, {method: "POST"})
+        .then(response => response.json())
+        .then(data => {
+          if (data.error) {
+            console.error("Error " + path + ":", data.error);
+          }
+        })
+        .catch(err => console.error("Error " + path + ":", err));
+    }
+    document.getElementById('prev-btn').addEventListener('click', function(event) {
+      event.preventDefault();
+      navigate("/prev");
+    });
+    document.getElementById('next-btn').addEventListener('click', function(event) {
+      event.preventDefault();
+      navigate("/next");
+    });
+
     // Botón METRÓNOMO
     const metroBtn = document.getElementById('metro-btn');
     
     metroBtn.addEventListener('click', function(event) {
       event.preventDefault();
-      
+
+      const sent = sendCommand('metronome');
+      if (sent) {
+        sent
+          .then(msg => { metronomeOn = msg.state; updateMetronomeButton(); })
+          .catch(err => console.error("Error METRONOME:", err));
+        return;
+      }
       fetch("/metronome", {method: "POST"})
         .then(response => response.json())
         .then(data => {
@@ -440,27 +661,246 @@ CONTROLLER_HTML = """
       }
     }
 
-    // Consultar estado inicial
-    fetch("/metronome/status")
-      .then(response => response.json())
-      .then(data => {
-        metronomeOn = data.state;
-        updateMetronomeButton();
-      })
-      .catch(err => console.error("Error obteniendo estado metrónomo:", err));
+    // Estado de conexión con Ableton
+    const connEl = document.getElementById('conn');
+    const connText = document.getElementById('conn-text');
+    const connLabels = {
+      connected: 'LIVE ONLINE',
+      degraded: 'LIVE LENTO',
+      lost: 'LIVE OFFLINE',
+      unknown: 'CONECTANDO...'
+    };
+
+    function updateConnection(data) {
+      const status = data.status || 'unknown';
+      connEl.className = 'conn ' + status;
+      let text = connLabels[status] || connLabels.unknown;
+      if (status !== 'lost' && data.srtt_ms !== null && data.srtt_ms !== undefined) {
+        text += ' · ' + Math.round(data.srtt_ms) + ' ms';
+      }
+      connText.textContent = text;
+    }
+
+    function pollHealth() {
+      fetch("/health")
+        .then(response => response.json())
+        .then(updateConnection)
+        .catch(() => updateConnection({status: 'lost'}));
+    }
+
+    // Progreso del scan (tocar la barra cancela el scan en curso)
+    const scanEl = document.getElementById('scan');
+    const scanText = document.getElementById('scan-text');
+    const scanFill = document.getElementById('scan-fill');
+    let scanRunning = false;
+    let scanTimer = null;
+
+    function updateScan(data) {
+      scanFill.style.width = Math.round((data.progress || 0) * 100) + '%';
+      scanEl.classList.toggle('failed', data.result === 'failed');
+
+      if (data.running) {
+        const stage = data.stages.find(s => s.name === data.current);
+        let text = 'SCAN ' + Math.round(data.progress * 100) + '%';
+        if (stage) {
+          text += ' · ' + stage.label.toUpperCase() + (stage.detail ? ' ' + stage.detail : '');
+        }
+        scanText.textContent = text;
+        scanEl.classList.add('visible');
+        scanRunning = true;
+      } else if (scanRunning) {
+        // Scan terminado (la lista nueva llega sola por el evento "tracks")
+        scanRunning = false;
+        scanText.textContent = {done: 'SCAN COMPLETO', cancelled: 'SCAN CANCELADO'}[data.result] || 'ERROR EN SCAN';
+        setTimeout(() => scanEl.classList.remove('visible'), 3000);
+      }
+    }
 
-    // Actualizar cada 2 segundos
-    setInterval(() => {
-      fetch("/metronome/status")
+    // Solo sin EventSource: consultar rápido mientras dura el scan, despacio en reposo
+    function pollScan() {
+      fetch("/scan")
         .then(response => response.json())
         .then(data => {
-          if (data.state !== metronomeOn) {
-            metronomeOn = data.state;
-            updateMetronomeButton();
-          }
+          const finished = scanRunning && !data.running && data.result === 'done';
+          updateScan(data);
+          if (finished) { location.reload(); return; }
+          scanTimer = setTimeout(pollScan, data.running ? 300 : 2000);
+        })
+        .catch(() => {
+          clearTimeout(scanTimer);
+          scanTimer = setTimeout(pollScan, 2000);
+        });
+    }
+
+    scanEl.addEventListener('click', function(event) {
+      event.preventDefault();
+      fetch("/scan", {method: "POST", body: new URLSearchParams({action: "cancel"})})
+        .catch(err => console.error("Error cancelando scan:", err));
+    });
+
+
+    // Búsqueda en setlists guardados (títulos de track y secciones)
+    const searchInput = document.getElementById('search-input');
+    const searchResults = document.getElementById('search-results');
+    let searchTimer = null;
+
+    function renderSearch(results) {
+      searchResults.replaceChildren(...results.map(hit => {
+        const row = document.createElement('div');
+        row.className = 'search-hit';
+        const title = document.createElement('b');
+        title.textContent = hit.track;
+        row.append(title, ' · ' + hit.setlist);
+        if (hit.sections.length) {
+          const sections = document.createElement('div');
+          hit.sections.forEach((name, i) => {
+            const span = document.createElement('span');
+            span.textContent = (i ? ' · ' : '') + name;
+            if (hit.matched_sections.includes(name)) span.className = 'match';
+            sections.append(span);
+          });
+          row.append(sections);
+        }
+        return row;
+      }));
+    }
+
+    function runSearch() {
+      const query = searchInput.value.trim();
+      if (!query) { searchResults.replaceChildren(); return; }
+      fetch("/search?" + new URLSearchParams({q: query, limit: 20}))
+        .then(response => response.json())
+        .then(data => { if (searchInput.value.trim() === query) renderSearch(data.results || []); })
+        .catch(err => console.error("Error buscando:", err));
+    }
+
+    searchInput.addEventListener('input', function() {
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(runSearch, 150);
+    });
+
+    // Setlists que aparecen o cambian en la carpeta
+    const setlistsInfo = document.getElementById('setlists-info');
+    let setlistsSeq = 0;
+
+    function updateSetlists(data) {
+      setlistsInfo.textContent = '💾 ' + data.count + ' setlists';
+      if (data.events.length) {
+        const last = data.events[data.events.length - 1];
+        setlistsInfo.textContent += ' · ' + last.stem + (last.change === 'removed' ? ' eliminado' : ' actualizado');
+        setlistsInfo.classList.add('changed');
+        setTimeout(() => setlistsInfo.classList.remove('changed'), 3000);
+        runSearch();
+      }
+      setlistsSeq = data.seq;
+    }
+
+    // Solo sin EventSource (long-poll: el servidor responde al haber cambios)
+    function watchSetlists(wait) {
+      fetch("/setlists?" + new URLSearchParams({since: setlistsSeq, wait: wait}))
+        .then(response => response.json())
+        .then(data => {
+          updateSetlists(data);
+          watchSetlists(25);
         })
-        .catch(err => console.error("Error actualizando estado:", err));
-    }, 2000);
+        .catch(() => setTimeout(() => watchSetlists(25), 5000));
+    }
+
+    // Track actual, transporte y lista de tracks
+    const grid = document.getElementById('grid');
+    const transportEl = document.getElementById('transport');
+    const live = {index: -1, title: null, playing: false, bpm: null, beat: null, num: 4};
+
+    // Tocar un track: por WebSocket si está abierto; si no, el formulario va por HTTP
+    grid.addEventListener('submit', function(event) {
+      const index = Number(event.target.elements.index.value);
+      const sent = sendCommand('play', {index: index});
+      if (!sent) return;
+      event.preventDefault();
+      sent.catch(err => console.error("Error PLAY:", err.message));
+    });
+
+    function renderTransport() {
+      transportEl.classList.toggle('playing', live.playing);
+      let text = live.playing ? '▶ ' : '⏸ ';
+      text += live.title || 'SIN TRACK';
+      if (live.bpm !== null) text += ' · ' + live.bpm.toFixed(1) + ' BPM';
+      if (live.playing && live.beat !== null) text += ' · ' + live.beat + '/' + live.num;
+      transportEl.textContent = text;
+      grid.querySelectorAll('.track-btn').forEach(btn => {
+        const current = Number(btn.dataset.index) === live.index;
+        btn.classList.toggle('current', current);
+        btn.classList.toggle('playing', current && live.playing);
+      });
+    }
+
+    function renderTracks(tracks) {
+      grid.replaceChildren(...tracks.map(track => {
+        const form = document.createElement('form');
+        form.action = '/play';
+        form.method = 'post';
+        const input = document.createElement('input');
+        input.type = 'hidden';
+        input.name = 'index';
+        input.value = track.index;
+        const button = document.createElement('button');
+        button.className = 'track-btn';
+        button.dataset.index = track.index;
+        button.textContent = '▶ ' + track.title;
+        form.append(input, button);
+        return form;
+      }));
+      renderTransport();
+    }
+
+    // Eventos en vivo (SSE): el servidor empuja cada cambio, sin consultas periódicas
+    function connectEvents() {
+      const source = new EventSource('/events');
+      const on = (name, fn) => source.addEventListener(name, event => fn(JSON.parse(event.data)));
+
+      on('tracks', data => renderTracks(data.tracks));
+      on('track', data => { live.index = data.index; live.title = data.title; renderTransport(); });
+      on('playing', data => { live.playing = data.state; renderTransport(); });
+      on('tempo', data => { live.bpm = data.bpm; renderTransport(); });
+      on('beat', data => { live.beat = data.beat; live.num = data.num; renderTransport(); });
+      on('metronome', data => { metronomeOn = data.state; updateMetronomeButton(); });
+      on('connection', updateConnection);
+      on('scan', updateScan);
+      on('setlists', updateSetlists);
+
+      // El navegador reconecta solo; mientras tanto, Live se marca como desconocido
+      source.onerror = () => updateConnection({status: 'unknown'});
+    }
+
+    // Navegadores sin EventSource: consultas periódicas como antes
+    function startPolling() {
+      pollScan();
+      watchSetlists(0);
+
+      function pollStatus() {
+        pollHealth();
+
+        fetch("/metronome/status")
+          .then(response => response.json())
+          .then(data => {
+            if (data.state !== metronomeOn) {
+              metronomeOn = data.state;
+              updateMetronomeButton();
+            }
+          })
+          .catch(err => console.error("Error actualizando estado:", err));
+      }
+
+      // Actualizar cada 2 segundos
+      pollStatus();
+      setInterval(pollStatus, 2000);
+    }
+
+    if (window.EventSource) {
+      connectEvents();
+    } else {
+      startPolling();
+    }
   </script>
 </body>
 </html>